@@ -0,0 +1,202 @@
+"""
+release / gate-replay 경로: 원본 dict vs CompiledPolicy.
+
+  stages   cmd_release가 (후보, current) 한 쌍에 하는 validate -> diff -> gate.
+           compiled 쪽은 매 반복 두 정책을 새로 컴파일한다 (one-shot).
+           budget 열은 inputs.data.warmup_budget이 있는 정책.
+  release  cmd_release --dry-run 전체와 그중 YAML 로드(후보 + current.yaml) 시간.
+  replay   gate-replay의 쌍별 flag 집계: 릴리즈 재구성 + dict diff (이전 방식)
+           vs pair_counts (기록된 위험 값 / 컴파일된 모델, 구조 diff 없음).
+
+  python benchmarks/bench_model.py --iters 2000 --indicators 2 50 200 --releases 50
+"""
+from __future__ import annotations
+import argparse
+import contextlib
+import copy
+import io
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from strategy_validator import cli  # noqa: E402
+from strategy_validator.archive import clear_cache, load_release  # noqa: E402
+from strategy_validator.diff import diff_policies  # noqa: E402
+from strategy_validator.gate import apply_gate, level_counts  # noqa: E402
+from strategy_validator.loader import dump_policy, load_composed, load_policy  # noqa: E402
+from strategy_validator.model import compile_policy  # noqa: E402
+from strategy_validator.paths import list_versions  # noqa: E402
+from strategy_validator.replay import pair_counts  # noqa: E402
+from strategy_validator.validator import validate_report  # noqa: E402
+
+
+def _pair(n_indicators: int, budget: bool = False):
+    old = load_policy(str(ROOT / "policy.yaml"))
+    names = ("ema", "sma", "rsi", "atr")
+    old["inputs"]["indicators"] = [
+        {"name": names[i % len(names)], "params": {"period": 10 + i}}
+        for i in range(n_indicators)
+    ]
+    if budget:
+        old["inputs"]["data"]["warmup_budget"] = {
+            "max_bars": 100_000,
+            "max_duration": "30d",
+        }
+    new = copy.deepcopy(old)
+    new["meta"]["policy_version"] = "0.2.0"
+    new["risk"]["per_trade_loss_pct"] = 2.5
+    return old, new
+
+
+def _run_dict(old, new, iters: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(iters):
+        validate_report(new)
+        diff = diff_policies(old, new)
+        apply_gate(diff, (new.get("release") or {}).get("gate"))
+    return time.perf_counter() - t0
+
+
+def _run_compiled(old, new, iters: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(iters):
+        c_old, c_new = compile_policy(old), compile_policy(new)
+        validate_report(c_new)
+        diff = diff_policies(c_old, c_new)
+        apply_gate(diff, c_new)
+    return time.perf_counter() - t0
+
+
+def _best_pair(run_a, run_b, repeat: int):
+    # 단일 코어에서도 비교가 공정하도록 두 경로를 번갈아 돌리고 각자 최솟값
+    a = b = float("inf")
+    for _ in range(repeat):
+        a = min(a, run_a())
+        b = min(b, run_b())
+    return a, b
+
+
+def bench_stages(args) -> None:
+    print("stages (us/release)")
+    print(f"{'indicators':>10}  {'budget':>6}  {'dict':>8}  {'compiled':>8}  {'ratio':>6}")
+    for n in args.indicators:
+        for budget in (False, True):
+            old, new = _pair(n, budget)
+            c_old, c_new = compile_policy(old), compile_policy(new)
+            assert validate_report(c_new) == validate_report(new)
+            assert diff_policies(c_old, c_new) == diff_policies(old, new)
+            d, c = _best_pair(
+                lambda: _run_dict(old, new, args.iters),
+                lambda: _run_compiled(old, new, args.iters),
+                args.repeat,
+            )
+            d, c = d / args.iters * 1e6, c / args.iters * 1e6
+            print(f"{n:>10}  {str(budget):>6}  {d:>8.1f}  {c:>8.1f}  {d / c:>5.2f}x")
+
+
+def _quiet(fn, *a, **kw):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*a, **kw)
+
+
+def _write(policy, version: str, ptl: float) -> str:
+    p = copy.deepcopy(policy)
+    p["meta"]["policy_version"] = version
+    p["risk"]["per_trade_loss_pct"] = ptl
+    path = f"cand_{version}.yaml"
+    Path(path).write_text(dump_policy(p), encoding="utf-8")
+    return path
+
+
+def bench_release(args) -> None:
+    print("\nrelease (ms/release, cmd_release --dry-run)")
+    print(f"{'indicators':>10}  {'total':>8}  {'yaml load':>9}  {'rest':>8}")
+    for n in args.indicators:
+        base, _ = _pair(n)
+        with tempfile.TemporaryDirectory() as tmp, contextlib.chdir(tmp):
+            assert _quiet(cli.cmd_release, _write(base, "0.1.0", 1.0), False, False, None) == 0
+            cand = _write(base, "0.2.0", 1.0)
+            k = max(1, args.iters // 100)
+
+            def run_release() -> float:
+                t0 = time.perf_counter()
+                for _ in range(k):
+                    _quiet(cli.cmd_release, cand, False, False, None, dry_run=True)
+                return time.perf_counter() - t0
+
+            def run_load() -> float:
+                t0 = time.perf_counter()
+                for _ in range(k):
+                    load_composed(cand)
+                    load_policy(cli.CURRENT_FILE)
+                return time.perf_counter() - t0
+
+            total, load = _best_pair(run_release, run_load, args.repeat)
+            total, load = total / k * 1e3, load / k * 1e3
+            print(f"{n:>10}  {total:>8.2f}  {load:>9.2f}  {total - load:>8.2f}")
+
+
+def _replay_full_diff(releases_dir: str, versions) -> list:
+    prev = load_release(releases_dir, versions[0])
+    out = []
+    for new_ver in versions[1:]:
+        new = load_release(releases_dir, new_ver)
+        out.append(level_counts(diff_policies(prev, new)["risk_flags"]))
+        prev = new
+    return out
+
+
+def bench_replay(args) -> None:
+    print(f"\nreplay (ms per {args.releases} releases, cold release cache)")
+    print(f"{'indicators':>10}  {'full diff':>9}  {'pair_counts':>11}  {'ratio':>6}")
+    for n in args.indicators:
+        base, _ = _pair(n)
+        with tempfile.TemporaryDirectory() as tmp, contextlib.chdir(tmp):
+            for i in range(args.releases):
+                path = _write(base, f"0.{i + 1}.0", 1.0 + (i % 3) * 0.5)
+                assert _quiet(cli.cmd_release, path, False, False, None) == 0
+            rdir = cli.RELEASES_DIR
+            versions = list_versions(rdir)
+            assert [p["counts"] for p in pair_counts(rdir, versions)] == (
+                _replay_full_diff(rdir, versions)
+            )
+
+            def timed(fn):
+                def run() -> float:
+                    clear_cache()
+                    t0 = time.perf_counter()
+                    fn(rdir, versions)
+                    return time.perf_counter() - t0
+
+                return run
+
+            f, p = _best_pair(timed(_replay_full_diff), timed(pair_counts), args.repeat)
+            print(f"{n:>10}  {f * 1e3:>9.1f}  {p * 1e3:>11.1f}  {f / p:>5.1f}x")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--iters", type=int, default=2000)
+    ap.add_argument("--indicators", type=int, nargs="+", default=[2, 50, 200])
+    ap.add_argument("--releases", type=int, default=50)
+    ap.add_argument("--repeat", type=int, default=5, help="best of N runs")
+    ap.add_argument(
+        "--only", choices=("stages", "release", "replay"), help="run one section"
+    )
+    args = ap.parse_args()
+
+    for name, fn in (
+        ("stages", bench_stages),
+        ("release", bench_release),
+        ("replay", bench_replay),
+    ):
+        if args.only in (None, name):
+            fn(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+release 지연 측정: 순차 경로 vs --pipelined.
+
+느린 파일시스템(NFS 등)은 파일 작업마다 고정 지연을 넣어 흉내낸다.
+  python benchmarks/bench_release.py --runs 20 --delay-ms 0 5 20
+"""
+from __future__ import annotations
+import argparse
+import builtins
+import contextlib
+import io
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from strategy_validator.cli import cmd_release  # noqa: E402
+
+
+@contextlib.contextmanager
+def injected_delay(delay_s: float):
+    """open/stat/rename/replace/fsync 호출마다 delay_s만큼 지연."""
+    if delay_s <= 0:
+        yield
+        return
+
+    targets = [
+        (builtins, "open"),
+        (io, "open"),
+        (os, "open"),
+        (os, "stat"),
+        (os, "rename"),
+        (os, "replace"),
+        (os, "fsync"),
+    ]
+    saved = [(mod, name, getattr(mod, name)) for mod, name in targets]
+
+    def slow(fn):
+        def wrapper(*a, **kw):
+            time.sleep(delay_s)
+            return fn(*a, **kw)
+
+        return wrapper
+
+    for mod, name, fn in saved:
+        setattr(mod, name, slow(fn))
+    try:
+        yield
+    finally:
+        for mod, name, fn in saved:
+            setattr(mod, name, fn)
+
+
+def _one_run(policy_src: Path, pipelined: bool, delay_s: float) -> float:
+    work = Path(tempfile.mkdtemp(prefix="sv-bench-"))
+    cwd = os.getcwd()
+    try:
+        os.chdir(work)
+        for v in ("0.1.0", "0.2.0"):
+            text = policy_src.read_text(encoding="utf-8").replace(
+                'policy_version: "0.1.1"', f'policy_version: "{v}"'
+            )
+            (work / f"p_{v}.yaml").write_text(text, encoding="utf-8")
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            cmd_release(str(work / "p_0.1.0.yaml"), False, False, None)
+            with injected_delay(delay_s):
+                t0 = time.perf_counter()
+                rc = cmd_release(
+                    str(work / "p_0.2.0.yaml"), False, False, None, pipelined=pipelined
+                )
+                elapsed = time.perf_counter() - t0
+        assert rc == 0
+        return elapsed
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(work, ignore_errors=True)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=20)
+    ap.add_argument("--delay-ms", type=float, nargs="+", default=[0.0, 5.0, 20.0])
+    ap.add_argument("--policy", default=str(ROOT / "policy.yaml"))
+    args = ap.parse_args()
+
+    print(f"{'delay_ms':>8} {'sequential_ms':>14} {'pipelined_ms':>13}")
+    for d in args.delay_ms:
+        row = []
+        for pipelined in (False, True):
+            xs = [
+                _one_run(Path(args.policy), pipelined, d / 1000.0)
+                for _ in range(args.runs)
+            ]
+            row.append(statistics.median(xs) * 1000.0)
+        print(f"{d:>8.1f} {row[0]:>14.2f} {row[1]:>13.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
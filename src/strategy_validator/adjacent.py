@@ -0,0 +1,242 @@
+"""
+인접 릴리즈 diff 저장과 롤백 미리보기.
+
+릴리즈 시점에 releases/<ver>/adjacent.json에 직전 live 버전(base) 대비
+forward/reverse delta와 위험 검사 값(risk_values), release.gate를 남긴다.
+delta 아카이브의 policy.delta.json이 같은 base의 같은 ops면 forward는
+복사하지 않고 forward_ref로 그 파일을 가리킨다.
+롤백 미리보기는 YAML을 다시 읽거나 diff하지 않고, base 링크를 따라
+저장된 delta를 합성해 변경 내용과 gate 결과를 계산한다. gate-replay도
+기록된 위험 검사 값과 gate만 읽는다 (recorded_risk).
+"""
+from __future__ import annotations
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from .archive import (
+    ADJACENT_FILE,
+    DELTA_FILE,
+    apply_delta,
+    load_release,
+    make_delta,
+)
+from .diff import (
+    diff_policies,
+    risk_flags_from_values,
+    risk_score_from_flags,
+    risk_values,
+)
+from .gate import apply_gate
+from .model import CompiledPolicy
+
+ADJACENT_FORMAT = "adjacent/1"
+
+
+def build_adjacent(
+    base_version: str | None,
+    base: CompiledPolicy | None,
+    policy: CompiledPolicy,
+) -> Dict[str, Any]:
+    adj: Dict[str, Any] = {
+        "format": ADJACENT_FORMAT,
+        "version": policy.version,
+        "base": base_version if base is not None else None,
+        "risk": list(risk_values(policy)),
+        "gate": policy.gate,
+    }
+    if base is not None:
+        adj["forward"] = make_delta(base.raw, policy.raw)
+        adj["reverse"] = make_delta(policy.raw, base.raw)
+    return adj
+
+
+def adjacent_json(adj: Dict[str, Any]) -> str:
+    return json.dumps(adj, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def _read_delta_file(d: Path) -> Dict[str, Any] | None:
+    try:
+        return json.loads((d / DELTA_FILE).read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def link_archive_delta(dest_dir: Path, adj: Dict[str, Any]) -> Dict[str, Any]:
+    """dest_dir의 policy.delta.json이 forward와 같으면 forward 대신 참조를 남긴다."""
+    if "forward" not in adj:
+        return adj
+    delta = _read_delta_file(Path(dest_dir))
+    if (
+        delta is None
+        or delta.get("base") != adj["base"]
+        or adjacent_json(delta.get("ops")) != adjacent_json(adj["forward"])
+    ):
+        return adj
+    out = {k: v for k, v in adj.items() if k != "forward"}
+    out["forward_ref"] = DELTA_FILE
+    return out
+
+
+def write_adjacent(dest_dir: Path, adj: Dict[str, Any]) -> Path:
+    """릴리즈 정책 파일을 쓴 뒤에 호출한다 (delta 참조 여부를 그 파일로 판단)."""
+    p = Path(dest_dir) / ADJACENT_FILE
+    p.write_text(adjacent_json(link_archive_delta(dest_dir, adj)), encoding="utf-8")
+    return p
+
+
+def read_adjacent(releases_dir: str | Path, version: str) -> Dict[str, Any] | None:
+    """forward_ref는 policy.delta.json의 ops로 풀어 준다 (base가 다르면 forward 없음)."""
+    d = Path(releases_dir) / version
+    try:
+        adj = json.loads((d / ADJACENT_FILE).read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return None
+    if adj.pop("forward_ref", None) == DELTA_FILE:
+        delta = _read_delta_file(d)
+        if delta is not None and delta.get("base") == adj.get("base"):
+            adj["forward"] = delta["ops"]
+    return adj
+
+
+def recorded_risk(
+    releases_dir: str | Path, version: str
+) -> Tuple[Tuple[Any, ...], Any] | None:
+    """릴리즈 시 기록한 (risk_values, release.gate). 기록이 없으면 None."""
+    try:
+        text = (Path(releases_dir) / version / ADJACENT_FILE).read_text(encoding="utf-8")
+        adj = json.loads(text)
+    except (FileNotFoundError, ValueError):
+        return None
+    risk = adj.get("risk")
+    if adj.get("version") != version or not isinstance(risk, list) or "gate" not in adj:
+        return None
+    return tuple(risk), adj["gate"]
+
+
+def compose_ops(steps: List[List[list]]) -> List[list]:
+    """
+    delta 목록을 순서대로 적용한 것과 같은 순(net) delta 하나로 합성.
+    결과 op끼리는 경로가 서로의 접두사가 되지 않으므로 순서와 무관하다.
+    """
+    net: Dict[Tuple[Any, ...], list] = {}
+    for ops in steps:
+        for op in ops:
+            path = tuple(op[1])
+            # 같은 경로와 하위 경로의 이전 op는 이 op가 덮어씀
+            for p in [p for p in net if p[: len(path)] == path]:
+                del net[p]
+            anc = next(
+                (path[:i] for i in range(len(path) - 1, -1, -1) if path[:i] in net),
+                None,
+            )
+            if anc is None:
+                net[path] = [op[0], list(path)] + op[2:]
+                continue
+            # 상위 경로를 통째로 set한 op가 있으면 그 값 안에 적용
+            prev = net[anc]
+            value = prev[2] if prev[0] == "set" and isinstance(prev[2], dict) else {}
+            rel = [op[0], list(path[len(anc) :])] + op[2:]
+            net[anc] = ["set", list(anc), apply_delta(value, [rel])]
+    return list(net.values())
+
+
+def _chain(releases_dir: str | Path, version: str) -> List[Dict[str, Any]] | None:
+    """version에서 base 링크를 따라 올라간 adjacent 목록 (version 자신 포함)."""
+    out: List[Dict[str, Any]] = []
+    seen = set()
+    v: str | None = version
+    while v is not None and v not in seen:
+        seen.add(v)
+        adj = read_adjacent(releases_dir, v)
+        if adj is None:
+            return out or None
+        out.append(adj)
+        v = adj.get("base")
+    return out
+
+
+def compose_path(
+    releases_dir: str | Path, current: str, target: str
+) -> Tuple[List[str], List[list], Dict[str, Any], Dict[str, Any]] | None:
+    """
+    current -> target 경로와 합성 delta, 양 끝의 adjacent.
+    공통 조상까지 reverse로 올라간 뒤 forward로 내려간다. 경로가 없으면 None.
+    """
+    up = _chain(releases_dir, current)
+    down = _chain(releases_dir, target)
+    if not up or not down:
+        return None
+    down_idx = {a["version"]: i for i, a in enumerate(down)}
+    for i, a in enumerate(up):
+        if a["version"] in down_idx:
+            j = down_idx[a["version"]]
+            break
+    else:
+        return None
+    if any("forward" not in adj for adj in down[:j]):
+        return None  # 참조하던 delta가 사라짐 (compact/gc 이전 형식)
+    steps = [adj["reverse"] for adj in up[:i]] + [
+        adj["forward"] for adj in reversed(down[:j])
+    ]
+    path = [a["version"] for a in up[: i + 1]] + [
+        a["version"] for a in reversed(down[:j])
+    ]
+    return path, compose_ops(steps), up[0], down[0]
+
+
+def _fmt_path(path: List[Any]) -> str:
+    return "$" + "".join(f".{k}" for k in path)
+
+
+def preview_rollback(
+    releases_dir: str | Path,
+    current: str | None,
+    target: str,
+    current_policy: Dict[str, Any] | None = None,
+) -> Dict[str, Any]:
+    """
+    롤백 미리보기: 저장된 delta 합성으로 변경 내용, 위험 플래그, target의
+    release.gate 판정을 계산한다. adjacent가 없는 예전 릴리즈는 재구성 + diff.
+    current_policy를 주면 (current.yaml이 알려진 릴리즈가 아닐 때) 그 정책과
+    target을 재구성 + diff 한다.
+    """
+    composed = None
+    if current_policy is None:
+        composed = compose_path(releases_dir, str(current), target)
+    if composed is not None:
+        path, ops, cur_adj, tgt_adj = composed
+        flags = risk_flags_from_values(tuple(cur_adj["risk"]), tuple(tgt_adj["risk"]))
+        changes = [
+            {"op": op[0], "path": _fmt_path(op[1]), "value": op[2]}
+            if op[0] == "set"
+            else {"op": op[0], "path": _fmt_path(op[1])}
+            for op in ops
+        ]
+        policy_gate = tgt_adj.get("gate")
+        method = "adjacent"
+    else:
+        old = current_policy
+        if old is None:
+            old = load_release(releases_dir, str(current))
+        new = load_release(releases_dir, target)
+        diff = diff_policies(old, new)
+        flags = diff["risk_flags"]
+        changes = [{"op": "set", "path": p, "value": v} for p, v in diff["added"]]
+        changes += [{"op": "del", "path": p} for p, _ in diff["removed"]]
+        changes += [{"op": "set", "path": p, "value": n} for p, _, n in diff["changed"]]
+        policy_gate = (new.get("release") or {}).get("gate")
+        path = [str(current), target]
+        method = "rediff"
+
+    gate_result = apply_gate({"risk_flags": flags}, policy_gate)
+    return {
+        "from": current,
+        "to": target,
+        "method": method,
+        "path": path,
+        "changes": changes,
+        "risk_flags": flags,
+        "risk_score": risk_score_from_flags(flags),
+        "gate": gate_result,
+    }
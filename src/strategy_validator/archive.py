@@ -0,0 +1,403 @@
+from __future__ import annotations
+import copy
+import json
+import os
+import shutil
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List
+
+import yaml
+
+from .hashing import has_non_str_keys
+from .loader import load_policy
+
+# releases/<ver>/ 안의 파일 이름
+SNAPSHOT_FILE = "policy.yaml"
+DELTA_FILE = "policy.delta.json"
+REPORT_FILE = "report.json"
+ALIAS_FILE = "alias.json"
+HASH_FILE = "content.sha256"
+ADJACENT_FILE = "adjacent.json"
+
+DELTA_FORMAT = "delta/1"
+
+# delta 체인이 이 길이에 도달하면 전체 스냅샷을 저장
+SNAPSHOT_EVERY = 8
+
+# 재구성된 정책 LRU 캐시 크기 (rollback / history 조회용)
+RELEASE_CACHE_SIZE = 64
+
+
+def make_delta(old: Any, new: Any, path: List[Any] | None = None) -> List[list]:
+    """
+    old -> new 구조적 delta.
+      ["set", [k1, k2, ...], value]  # 키 추가 또는 값 교체 (리스트는 통째로 교체)
+      ["del", [k1, k2, ...]]         # 키 삭제
+    """
+    path = path or []
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops: List[list] = []
+        for k, v in old.items():
+            if k not in new:
+                ops.append(["del", path + [k]])
+        for k, v in new.items():
+            if k not in old:
+                ops.append(["set", path + [k], v])
+            else:
+                ops.extend(make_delta(old[k], v, path + [k]))
+        return ops
+    if old != new or type(old) is not type(new):
+        return [["set", path, new]]
+    return []
+
+
+def delta_json_safe(ops: List[list]) -> bool:
+    """
+    JSON으로 저장해도 그대로 복원되는 delta인지. 경로의 int 키는 JSON 리스트에서
+    유지되지만, 값 안의 mapping 키는 str로 바뀌므로 그런 값이 있으면 False.
+    """
+    return not any(op[0] == "set" and has_non_str_keys(op[2]) for op in ops)
+
+
+def apply_delta(base: Dict[str, Any], ops: List[list]) -> Dict[str, Any]:
+    """base를 변경하지 않고 delta를 적용한 새 dict를 돌려준다."""
+    out = copy.deepcopy(base)
+    for op in ops:
+        kind, path = op[0], op[1]
+        if not path:
+            out = copy.deepcopy(op[2])
+            continue
+        parent = out
+        for k in path[:-1]:
+            parent = parent.setdefault(k, {})
+        if kind == "set":
+            parent[path[-1]] = copy.deepcopy(op[2])
+        elif kind == "del":
+            parent.pop(path[-1], None)
+        else:
+            raise ValueError(f"Unknown delta op: {kind}")
+    return out
+
+
+def _dump_json(obj: Dict[str, Any], compact: bool) -> str:
+    if compact:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+    return json.dumps(obj, ensure_ascii=False, indent=2)
+
+
+def _compact_report(rep: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    추가만 있는 diff(첫 릴리즈 등)는 added 항목을 개수와 참조로 줄인다.
+    추가된 값은 모두 같은 릴리즈의 정책 본문에 그대로 있으므로 복원 가능하다.
+    """
+    diff = rep.get("diff")
+    if (
+        not isinstance(diff, dict)
+        or not isinstance(diff.get("added"), list)
+        or not diff["added"]
+        or diff.get("removed")
+        or diff.get("changed")
+    ):
+        return rep
+    out = dict(rep)
+    out["diff"] = dict(diff, added={"count": len(diff["added"]), "ref": "policy"})
+    return out
+
+
+def report_json(rep: Dict[str, Any], compact: bool = False) -> str:
+    if compact:
+        rep = _compact_report(rep)
+    return _dump_json(rep, compact)
+
+
+def write_report(dest_dir: Path, rep: Dict[str, Any], compact: bool = False) -> Path:
+    report_file = dest_dir / REPORT_FILE
+    report_file.write_text(report_json(rep, compact), encoding="utf-8")
+    return report_file
+
+
+def write_hash(dest_dir: Path, content_hash: str) -> None:
+    (dest_dir / HASH_FILE).write_text(content_hash + "\n", encoding="utf-8")
+
+
+def read_hash(releases_dir: str | Path, version: str) -> str | None:
+    p = Path(releases_dir) / version / HASH_FILE
+    try:
+        return p.read_text(encoding="utf-8").strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def release_exists(releases_dir: str | Path, version: str) -> bool:
+    d = Path(releases_dir) / version
+    return any((d / name).exists() for name in (SNAPSHOT_FILE, DELTA_FILE, ALIAS_FILE))
+
+
+def is_delta(releases_dir: str | Path, version: str) -> bool:
+    d = Path(releases_dir) / version
+    return not (d / SNAPSHOT_FILE).exists() and (d / DELTA_FILE).exists()
+
+
+def is_alias(releases_dir: str | Path, version: str) -> bool:
+    d = Path(releases_dir) / version
+    return not (d / SNAPSHOT_FILE).exists() and (d / ALIAS_FILE).exists()
+
+
+def _read_alias(releases_dir: str | Path, version: str) -> Dict[str, Any]:
+    p = Path(releases_dir) / version / ALIAS_FILE
+    return json.loads(p.read_text(encoding="utf-8"))
+
+
+def write_alias(
+    releases_dir: str | Path,
+    version: str,
+    target: str,
+    content_hash: str,
+    dest_dir: Path | None = None,
+) -> Path:
+    """내용이 같은 기존 릴리즈를 가리키는 별칭 릴리즈 (정책 사본 없음)."""
+    dest_dir = dest_dir or Path(releases_dir) / version
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    dest = dest_dir / ALIAS_FILE
+    dest.write_text(
+        _dump_json({"alias_of": target, "content_hash": content_hash}, compact=True),
+        encoding="utf-8",
+    )
+    return dest
+
+
+def _read_delta(releases_dir: str | Path, version: str) -> Dict[str, Any]:
+    p = Path(releases_dir) / version / DELTA_FILE
+    return json.loads(p.read_text(encoding="utf-8"))
+
+
+def release_base(releases_dir: str | Path, version: str) -> str | None:
+    """재구성에 필요한 다른 릴리즈 (delta의 base, alias의 대상; 스냅샷이면 None)."""
+    if is_delta(releases_dir, version):
+        return _read_delta(releases_dir, version)["base"]
+    if is_alias(releases_dir, version):
+        return _read_alias(releases_dir, version)["alias_of"]
+    return None
+
+
+def _depth(releases_dir: str | Path, version: str) -> int:
+    if is_alias(releases_dir, version):
+        return _depth(releases_dir, _read_alias(releases_dir, version)["alias_of"])
+    if not is_delta(releases_dir, version):
+        return 0
+    return int(_read_delta(releases_dir, version).get("depth", 1))
+
+
+def _stamp(d: Path) -> tuple:
+    # 파일이 바뀌면 캐시 키도 바뀌도록 (mtime, size)를 키에 포함
+    for name in (SNAPSHOT_FILE, DELTA_FILE, ALIAS_FILE):
+        p = d / name
+        try:
+            st = p.stat()
+        except FileNotFoundError:
+            continue
+        return (name, st.st_mtime_ns, st.st_size)
+    raise FileNotFoundError(f"Release not found: {d}")
+
+
+@lru_cache(maxsize=RELEASE_CACHE_SIZE)
+def _reconstruct(releases_dir: str, version: str, stamp: tuple) -> Dict[str, Any]:
+    d = Path(releases_dir) / version
+    if stamp[0] == SNAPSHOT_FILE:
+        return load_policy(str(d / SNAPSHOT_FILE))
+
+    if stamp[0] == ALIAS_FILE:
+        target = _read_alias(releases_dir, version)["alias_of"]
+        base = _reconstruct(releases_dir, target, _stamp(Path(releases_dir) / target))
+        out = dict(base)
+        out["meta"] = {**(base.get("meta") or {}), "policy_version": version}
+        return out
+
+    delta = _read_delta(releases_dir, version)
+    base_ver = delta["base"]
+    base = _reconstruct(releases_dir, base_ver, _stamp(Path(releases_dir) / base_ver))
+    return apply_delta(base, delta["ops"])
+
+
+def load_release(releases_dir: str | Path, version: str) -> Dict[str, Any]:
+    """
+    releases/<ver>의 정책을 돌려준다 (스냅샷이면 그대로, delta면 base 체인 재구성).
+    재구성 결과는 LRU 캐시에 보관되며, 호출자는 복사본을 받는다.
+    """
+    root = os.path.abspath(releases_dir)
+    d = Path(root) / version
+    return copy.deepcopy(_reconstruct(root, version, _stamp(d)))
+
+
+def clear_cache() -> None:
+    _reconstruct.cache_clear()
+
+
+def materialize_release(releases_dir: str | Path, version: str, dest: Path) -> None:
+    """릴리즈 정책을 dest 파일로 복원 (스냅샷이면 원본 그대로 복사)."""
+    src = Path(releases_dir) / version / SNAPSHOT_FILE
+    if src.exists():
+        shutil.copy2(src, dest)
+        return
+    policy = load_release(releases_dir, version)
+    dest.write_text(
+        yaml.safe_dump(policy, sort_keys=False, allow_unicode=True), encoding="utf-8"
+    )
+
+
+def inline_adjacent_forward(d: Path) -> None:
+    """
+    adjacent.json이 forward delta 대신 policy.delta.json을 참조하면, delta를
+    바꾸거나 지우기 전에 ops를 adjacent.json 안으로 옮긴다.
+    """
+    p = d / ADJACENT_FILE
+    try:
+        adj = json.loads(p.read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return
+    if adj.pop("forward_ref", None) != DELTA_FILE:
+        return
+    try:
+        delta = json.loads((d / DELTA_FILE).read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        delta = None
+    # base가 다르면 forward 없이 둔다 (미리보기는 재구성 + diff로 대체)
+    if delta is not None and delta.get("base") == adj.get("base"):
+        adj["forward"] = delta["ops"]
+    tmp = p.with_name(p.name + ".tmp")
+    tmp.write_text(_dump_json(adj, compact=True), encoding="utf-8")
+    os.replace(tmp, p)
+
+
+def snapshot_release(releases_dir: str | Path, version: str) -> None:
+    """delta/alias 릴리즈를 전체 스냅샷으로 바꾼다 (base 삭제 전에 사용)."""
+    if release_base(releases_dir, version) is None:
+        return
+    d = Path(releases_dir) / version
+    inline_adjacent_forward(d)
+    policy = load_release(releases_dir, version)
+    tmp = d / (SNAPSHOT_FILE + ".tmp")
+    tmp.write_text(
+        yaml.safe_dump(policy, sort_keys=False, allow_unicode=True), encoding="utf-8"
+    )
+    os.replace(tmp, d / SNAPSHOT_FILE)
+    (d / DELTA_FILE).unlink(missing_ok=True)
+    (d / ALIAS_FILE).unlink(missing_ok=True)
+
+
+def write_release(
+    releases_dir: str | Path,
+    version: str,
+    policy: Dict[str, Any],
+    source_path: str,
+    base: str | None,
+    snapshot_every: int = SNAPSHOT_EVERY,
+    dest_dir: Path | None = None,
+) -> Path:
+    """
+    delta 모드 저장: base가 있고 체인이 snapshot_every 미만이면
+    policy.delta.json, 아니면(또는 delta를 JSON으로 보존할 수 없으면)
+    원본 파일을 policy.yaml 스냅샷으로 복사.
+    dest_dir를 주면 releases/<ver> 대신 그 디렉터리에 쓴다 (staging 용).
+    """
+    dest_dir = dest_dir or Path(releases_dir) / version
+    dest_dir.mkdir(parents=True, exist_ok=True)
+
+    depth = _depth(releases_dir, base) + 1 if base else 0
+    ops = None
+    if base is not None and depth < snapshot_every:
+        ops = make_delta(load_release(releases_dir, base), policy)
+    # str이 아닌 키가 든 값은 JSON delta로 보존되지 않으므로 스냅샷으로 저장
+    if ops is None or not delta_json_safe(ops):
+        dest = dest_dir / SNAPSHOT_FILE
+        shutil.copy2(source_path, dest)
+        return dest
+
+    dest = dest_dir / DELTA_FILE
+    dest.write_text(
+        _dump_json(
+            {"format": DELTA_FORMAT, "base": base, "depth": depth, "ops": ops},
+            compact=True,
+        ),
+        encoding="utf-8",
+    )
+    return dest
+
+
+def _dir_size(d: Path) -> int:
+    return sum(p.stat().st_size for p in d.iterdir() if p.is_file())
+
+
+def compact_archive(
+    releases_dir: str | Path,
+    versions: List[str],
+    snapshot_every: int = SNAPSHOT_EVERY,
+) -> Dict[str, Any]:
+    """
+    기존 아카이브를 delta 형식으로 변환한다.
+    versions 순서대로 직전 릴리즈를 base로 삼고, snapshot_every마다 스냅샷을 남긴다.
+    JSON으로 보존되지 않는 delta(str이 아닌 키가 든 값)도 스냅샷으로 남긴다.
+    report.json은 공백 없는 JSON으로 다시 쓰고, 추가만 있는 diff는 요약한다.
+    """
+    base_dir = Path(releases_dir)
+    before = sum(_dir_size(base_dir / v) for v in versions)
+
+    # 변환 전에 모든 정책을 먼저 재구성 (변환 중 base가 바뀌어도 안전하도록)
+    policies = {v: load_release(releases_dir, v) for v in versions}
+
+    converted = 0
+    prev: str | None = None
+    depth = 0
+    for v in versions:
+        d = base_dir / v
+        inline_adjacent_forward(d)
+        ops = None
+        if prev is not None and depth + 1 < snapshot_every:
+            ops = make_delta(policies[prev], policies[v])
+            if not delta_json_safe(ops):
+                ops = None
+        if ops is None:
+            depth = 0
+            if not (d / SNAPSHOT_FILE).exists():
+                tmp = d / (SNAPSHOT_FILE + ".tmp")
+                tmp.write_text(
+                    yaml.safe_dump(policies[v], sort_keys=False, allow_unicode=True),
+                    encoding="utf-8",
+                )
+                os.replace(tmp, d / SNAPSHOT_FILE)
+                (d / DELTA_FILE).unlink(missing_ok=True)
+                (d / ALIAS_FILE).unlink(missing_ok=True)
+                converted += 1
+        else:
+            depth += 1
+            tmp = d / (DELTA_FILE + ".tmp")
+            tmp.write_text(
+                _dump_json(
+                    {"format": DELTA_FORMAT, "base": prev, "depth": depth, "ops": ops},
+                    compact=True,
+                ),
+                encoding="utf-8",
+            )
+            os.replace(tmp, d / DELTA_FILE)
+            (d / SNAPSHOT_FILE).unlink(missing_ok=True)
+            (d / ALIAS_FILE).unlink(missing_ok=True)
+            converted += 1
+
+        report = d / REPORT_FILE
+        if report.exists():
+            rep = json.loads(report.read_text(encoding="utf-8"))
+            tmp = d / (REPORT_FILE + ".tmp")
+            tmp.write_text(report_json(rep, compact=True), encoding="utf-8")
+            os.replace(tmp, report)
+        prev = v
+
+    clear_cache()
+    after = sum(_dir_size(base_dir / v) for v in versions)
+    return {
+        "releases": len(versions),
+        "converted": converted,
+        "bytes_before": before,
+        "bytes_after": after,
+        "bytes_saved": before - after,
+    }
@@ -2,20 +2,48 @@ from __future__ import annotations
 from .diff import diff_policies
 
 import argparse
+import contextlib
 import json
+import os
 import shutil
 from pathlib import Path
 from datetime import datetime
-
-from .loader import load_policy
+from typing import Iterator
+
+from . import metrics
+from .archive import (
+    SNAPSHOT_EVERY,
+    compact_archive,
+    load_release,
+    materialize_release,
+    read_hash,
+    release_base,
+    release_exists,
+    snapshot_release,
+    write_alias,
+    write_hash,
+    write_release,
+    write_report,
+)
+from .hashing import canonical_hash
+from .loader import dump_policy, load_composed, load_policy
+from .model import CompiledPolicy, compile_policy
+from .paths import (
+    CURRENT_FILE,
+    HISTORY_FILE,
+    POLICIES_DIR,
+    RELEASES_DIR,
+    ROLLBACK_REPORT,
+    TAGS_FILE,
+)
+from .paths import list_versions as _list_versions
 from .validator import validate_report
 
 
 DEFAULT_POLICY = "policy.yaml"
-POLICIES_DIR = "policies"
-RELEASES_DIR = "policies/releases"
-CURRENT_FILE = "policies/current.yaml"
-HISTORY_FILE = "policies/history.log"
+
+# gc 1회 실행에서 삭제할 릴리즈 수 상한 (큰 아카이브에서도 실행 시간 제한)
+GC_DEFAULT_LIMIT = 1000
 
 
 def _emit_json(obj: dict, json_out: bool, out_path: str | None) -> None:
@@ -45,26 +73,12 @@ def _read_current_version() -> str | None:
     return (policy.get("meta") or {}).get("policy_version")
 
 
-def _list_versions() -> list[str]:
-    base = Path(RELEASES_DIR)
-    if not base.exists():
-        return []
-    versions = [p.name for p in base.iterdir() if p.is_dir()]
-
-    def key(v: str):
-        parts = v.split(".")
-        return (
-            tuple(int(x) for x in parts)
-            if len(parts) == 3 and all(x.isdigit() for x in parts)
-            else (999, 999, 999)
-        )
-
-    return sorted(versions, key=key)
-
-
 def cmd_validate(policy_path: str, json_out: bool, out_path: str | None) -> int:
-    policy = load_policy(policy_path)
-    rep = validate_report(policy)
+    with metrics.timed("load"):
+        policy = load_policy(policy_path)
+    with metrics.timed("validate"):
+        rep = validate_report(policy)
+    metrics.record_findings(rep)
 
     # JSON 출력 또는 파일 저장
     _emit_json(rep, json_out=json_out, out_path=out_path)
@@ -80,18 +94,83 @@ def cmd_validate(policy_path: str, json_out: bool, out_path: str | None) -> int:
     return 0 if rep["ok"] else 2
 
 
+def cmd_validate_batch(
+    policy_paths: list[str], columnar: bool, json_out: bool, out_path: str | None
+) -> int:
+    from .validator import FindingTable, build_report, validate_findings
+
+    table = FindingTable() if columnar else None
+    reports = []
+    for path in policy_paths:
+        with metrics.timed("load"):
+            policy = load_policy(path)
+        with metrics.timed("validate"):
+            findings = validate_findings(policy)
+        for f in findings:
+            metrics.inc("policyv_findings_total", {"code": f.code, "severity": f.severity})
+        if table is not None:
+            table.add(path, policy, findings)
+        else:
+            rep = build_report(policy, findings)
+            rep["source"] = path
+            reports.append(rep)
+
+    if table is not None:
+        out = table.to_columnar()
+        summaries = out["policies"]
+    else:
+        out = {"reports": reports}
+        summaries = reports
+
+    _emit_json(out, json_out=json_out, out_path=out_path)
+
+    failed = [s["source"] for s in summaries if not s["ok"]]
+    if not json_out:
+        print(f"validated: {len(summaries)}, failed: {len(failed)}")
+        for src in failed:
+            print(f"  FAIL: {src}")
+    return 0 if not failed else 2
+
+
 def cmd_release(
     policy_path: str,
     strict: bool,
     json_out: bool,
     out_path: str | None,
     dry_run: bool = False,  # ✅ 추가
+    archive: str = "full",
+    if_identical: str = "release",
+    pipelined: bool = False,
+    # 이미 풀어낸 큐 후보: 제출 시 기록한 extends/include 조각 목록 (report용)
+    source_fragments: list | None = None,
+    # 큐 배치에서 이미 컴파일·검증한 모델 (다시 읽거나 검증하지 않음)
+    model: CompiledPolicy | None = None,
 ) -> int:
 
     _ensure_dirs()
 
-    policy = load_policy(policy_path)
-    rep = validate_report(policy)
+    prefetch = pipelined and model is None
+    if model is not None:
+        compiled, policy, fragments = model, model.raw, []
+    else:
+        with metrics.timed("load"):
+            if prefetch:
+                # 후보와 current.yaml을 동시에 읽는다 (current는 아래 Diff 단계에서 사용)
+                from .pipeline import load_pair
+
+                policy, fragments, prefetched_prev = load_pair(
+                    policy_path, CURRENT_FILE
+                )
+            else:
+                policy, fragments = load_composed(policy_path)
+        # 한 번 컴파일해 validate/diff/gate가 같은 모델을 공유
+        compiled = compile_policy(policy)
+    with metrics.timed("validate"):
+        rep = validate_report(compiled)
+    metrics.record_findings(rep)
+    if fragments or source_fragments:
+        # extends/include로 합성된 정책: 사용한 조각과 내용 해시를 기록 (재현용)
+        rep["fragments"] = fragments or source_fragments
 
     # 0) validator ERROR 있으면 차단 (rep 저장 가능)
     if not rep["ok"]:
@@ -114,18 +193,47 @@ def cmd_release(
 
     # 2) Diff & Gate (항상 실행: 이후 모든 차단/성공에서 rep_with_diff 사용)
     prev = None
-    if Path(CURRENT_FILE).exists():
-        prev = load_policy(CURRENT_FILE)
+    if prefetch:
+        prev = prefetched_prev
+    elif Path(CURRENT_FILE).exists():
+        with metrics.timed("load"):
+            prev = load_policy(CURRENT_FILE)
+
+    # 내용 동일(no-op) 릴리즈 감지: 실제 live 내용(current.yaml)과 비교.
+    # current.yaml이 수동으로 바뀌었을 수 있으므로 릴리즈에 저장된 해시는
+    # 별칭 대상이 같은 내용인지 확인하는 데만 쓴다
+    content_hash = canonical_hash(policy)
+    identical_to = None
+    prev_compiled = compile_policy(prev) if prev is not None else None
+    if prev_compiled is not None and canonical_hash(prev) == content_hash:
+        cur_ver = prev_compiled.version
+        cur_hash = read_hash(RELEASES_DIR, cur_ver) if cur_ver else None
+        if cur_hash in (None, content_hash):
+            identical_to = cur_ver
+
+    if identical_to is not None and if_identical == "skip":
+        rep_skip = dict(rep)
+        rep_skip["content_hash"] = content_hash
+        rep_skip["identical_to"] = identical_to
+        _emit_json(rep_skip, json_out=json_out, out_path=out_path)
+        print(f"RELEASE SKIPPED: content identical to {identical_to}")
+        return 0
 
-    diff = diff_policies(prev, policy)
+    with metrics.timed("diff"):
+        diff = diff_policies(prev_compiled, compiled)
+    metrics.record_risk_flags(diff)
 
-    policy_gate = (policy.get("release") or {}).get("gate")
-    gate_result = apply_gate(diff, policy_gate)
+    with metrics.timed("gate"):
+        gate_result = apply_gate(diff, compiled)
+    metrics.record_gate(gate_result)
 
     # report에 diff/gate 결과 포함
     rep_with_diff = dict(rep)
     rep_with_diff["diff"] = diff
     rep_with_diff["gate"] = gate_result
+    rep_with_diff["content_hash"] = content_hash
+    if identical_to is not None:
+        rep_with_diff["identical_to"] = identical_to
 
     # Gate 차단
     if not gate_result["allowed"]:
@@ -173,8 +281,7 @@ def cmd_release(
             return 2
 
     # 4) version 확인
-    meta = policy.get("meta") or {}
-    version = meta.get("policy_version")
+    version = compiled.version
     if not version:
         _emit_json(rep_with_diff, json_out=json_out, out_path=out_path)
         print("RELEASE BLOCKED: meta.policy_version missing")
@@ -182,44 +289,122 @@ def cmd_release(
 
     # 5) 버전 중복 차단
     dest_dir = Path(RELEASES_DIR) / version
-    dest_file = dest_dir / "policy.yaml"
 
-    if dest_file.exists():
+    if release_exists(RELEASES_DIR, version):
         _emit_json(rep_with_diff, json_out=json_out, out_path=out_path)
         print(f"RELEASE BLOCKED: version already exists: {version}")
         return 2
 
     # 6) 파일 복사(릴리즈 확정)
-    dest_dir.mkdir(parents=True, exist_ok=True)
-    shutil.copy2(policy_path, dest_file)
-    # ✅ releases/<ver>/report.json (항상 저장: 릴리즈 아카이빙 증빙)
-    import json
-
-    report_file = dest_dir / "report.json"
-    report_file.write_text(
-        json.dumps(rep_with_diff, ensure_ascii=False, indent=2),
-        encoding="utf-8",
+    compact = archive == "delta"
+    alias_of = identical_to if if_identical == "alias" else None
+    if alias_of is not None and not release_exists(RELEASES_DIR, alias_of):
+        alias_of = None
+    base = None
+    if compact and alias_of is None:
+        # delta 모드: 직전 릴리즈 대비 구조적 delta (주기적으로 전체 스냅샷)
+        versions = _list_versions()
+        base = versions[-1] if versions else None
+
+    # 직전 live 버전 대비 forward/reverse delta (롤백 미리보기용)
+    from .adjacent import build_adjacent, write_adjacent
+
+    adj_base = None
+    if prev_compiled is not None and prev_compiled.version:
+        if release_exists(RELEASES_DIR, prev_compiled.version):
+            adj_base = prev_compiled
+    adjacent = build_adjacent(
+        adj_base.version if adj_base is not None else None, adj_base, compiled
     )
 
-    Path(POLICIES_DIR).mkdir(parents=True, exist_ok=True)
-    shutil.copy2(dest_file, Path(CURRENT_FILE))
-
     ts = datetime.now().isoformat(timespec="seconds")
-    with open(HISTORY_FILE, "a", encoding="utf-8") as f:
-        f.write(f"{ts}\trelease\t{version}\tfrom={policy_path}\n")
-
-    print(f"RELEASED: {version}")
+    if alias_of is not None:
+        history_line = f"{ts}\talias\t{version}\tof={alias_of}\tfrom={policy_path}\n"
+    else:
+        history_line = f"{ts}\trelease\t{version}\tfrom={policy_path}\n"
+
+    with _release_source(policy_path, policy, fragments) as source_path:
+        if pipelined:
+            from .pipeline import commit_staged
+
+            with metrics.timed("commit"):
+                commit_staged(
+                    POLICIES_DIR,
+                    RELEASES_DIR,
+                    CURRENT_FILE,
+                    HISTORY_FILE,
+                    version,
+                    source_path,
+                    policy,
+                    rep_with_diff,
+                    content_hash,
+                    history_line,
+                    alias_of=alias_of,
+                    compact=compact,
+                    base=base,
+                    adjacent=adjacent,
+                )
+            metrics.record_live_version(version)
+            _report_released(version, alias_of)
+            _emit_json(rep_with_diff, json_out=json_out, out_path=out_path)
+            return 0
+
+        with metrics.timed("commit"):
+            if alias_of is not None:
+                # 내용 동일: 정책 사본 없이 기존 릴리즈를 가리키는 별칭으로 기록
+                write_alias(RELEASES_DIR, version, alias_of, content_hash)
+            elif compact:
+                write_release(RELEASES_DIR, version, policy, source_path, base)
+            else:
+                dest_dir.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(source_path, dest_dir / "policy.yaml")
+            write_hash(dest_dir, content_hash)
+            write_adjacent(dest_dir, adjacent)
+            # ✅ releases/<ver>/report.json (항상 저장: 릴리즈 아카이빙 증빙)
+            write_report(dest_dir, rep_with_diff, compact=compact)
+
+            Path(POLICIES_DIR).mkdir(parents=True, exist_ok=True)
+            shutil.copy2(source_path, Path(CURRENT_FILE))
+
+            with open(HISTORY_FILE, "a", encoding="utf-8") as f:
+                f.write(history_line)
+    metrics.record_live_version(version)
+
+    _report_released(version, alias_of)
     # --- 버전별 report.json 저장
-    report_file = dest_dir / "report.json"
-    report_file.write_text(
-        json.dumps(rep_with_diff, ensure_ascii=False, indent=2), encoding="utf-8"
-    )
+    write_report(dest_dir, rep_with_diff, compact=compact)
 
     # --- 최신 실행 report (handoff)
     _emit_json(rep_with_diff, json_out=json_out, out_path=out_path)
     return 0
 
 
+@contextlib.contextmanager
+def _release_source(
+    policy_path: str, policy: dict, fragments: list
+) -> Iterator[str]:
+    """
+    릴리즈/current.yaml에 복사할 원본 파일 경로.
+    합성된 정책은 원본 대신 풀어낸 YAML을 policies/ 아래 임시 파일로 써서 넘긴다.
+    """
+    if not fragments:
+        yield policy_path
+        return
+    tmp = Path(POLICIES_DIR) / f".resolved.{os.getpid()}.yaml"
+    tmp.write_text(dump_policy(policy), encoding="utf-8")
+    try:
+        yield str(tmp)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def _report_released(version: str, alias_of: str | None) -> None:
+    if alias_of is not None:
+        print(f"RELEASED: {version} (alias of {alias_of})")
+    else:
+        print(f"RELEASED: {version}")
+
+
 def write_policy(base_dir: Path, version: str) -> Path:
     content = f"""\
 meta:
@@ -275,7 +460,31 @@ def _emit_json(obj: dict, json_out: bool, out_path: str | None) -> None:
         p.write_text(s, encoding="utf-8")
 
 
-def cmd_rollback(target_version: str | None) -> int:
+def _print_rollback_preview(pv: dict) -> None:
+    via = " -> ".join(pv["path"])
+    print(f"ROLLBACK PREVIEW: {pv['from']} -> {pv['to']} (via {via})")
+    print(f"CHANGES: {len(pv['changes'])}")
+    for ch in pv["changes"]:
+        if ch["op"] == "set":
+            print(f"  set {ch['path']} = {json.dumps(ch['value'], ensure_ascii=False)}")
+        else:
+            print(f"  del {ch['path']}")
+    if pv["risk_flags"]:
+        print("RISK FLAGS:")
+        for rf in pv["risk_flags"]:
+            print(f"  [{rf['level']}] {rf['path']} - {rf['reason']}")
+    gate = pv["gate"]
+    print(f"GATE: {gate['decision']} (score {gate['risk_score']})")
+    for r in gate["reasons"]:
+        print(f"  - {r}")
+
+
+def cmd_rollback(
+    target_version: str | None,
+    preview: bool = False,
+    gate: bool = False,
+    json_out: bool = False,
+) -> int:
     _ensure_dirs()
 
     versions = _list_versions()
@@ -303,24 +512,62 @@ def cmd_rollback(target_version: str | None) -> int:
             print(f"ROLLBACK FAILED: target version not found: {target}")
             return 2
 
+    # 미리보기 / gate: 릴리즈 시 저장한 인접 delta를 합성. current.yaml이
+    # 알려진 릴리즈가 아니면(수동 수정 등) 그 파일과 target을 재구성 + diff
+    pv = None
+    if preview or gate:
+        from .adjacent import preview_rollback
+
+        if current_ver in versions:
+            pv = preview_rollback(RELEASES_DIR, current_ver, target)
+        elif Path(CURRENT_FILE).exists():
+            pv = preview_rollback(
+                RELEASES_DIR,
+                current_ver,
+                target,
+                current_policy=load_policy(CURRENT_FILE),
+            )
+    if preview:
+        if pv is None:
+            print("ROLLBACK PREVIEW FAILED: no current.yaml to compare against")
+            return 2
+        if json_out:
+            _emit_json(pv, json_out=True, out_path=None)
+        else:
+            _print_rollback_preview(pv)
+        return 0
+
+    # gate를 판정할 수 없으면(current.yaml 없음) 통과시키지 않는다
+    blocked = gate and (pv is None or not pv["gate"]["allowed"])
+
     # 실제 롤백 수행
     try:
-        src_policy = Path(RELEASES_DIR) / target / "policy.yaml"
-        if not src_policy.exists():
+        if blocked:
+            success = False
+            reasons = (
+                pv["gate"]["reasons"]
+                if pv is not None
+                else ["no current.yaml to compare against"]
+            )
+            msg = "ROLLBACK BLOCKED BY GATE: " + "; ".join(reasons)
+            print(msg)
+            rc = 2
+        elif not release_exists(RELEASES_DIR, target):
             print(f"ROLLBACK FAILED: release policy not found for {target}")
             return 2
+        else:
+            Path(POLICIES_DIR).mkdir(parents=True, exist_ok=True)
+            materialize_release(RELEASES_DIR, target, Path(CURRENT_FILE))
 
-        Path(POLICIES_DIR).mkdir(parents=True, exist_ok=True)
-        shutil.copy2(src_policy, Path(CURRENT_FILE))
+            ts = datetime.now().isoformat(timespec="seconds")
+            with open(HISTORY_FILE, "a", encoding="utf-8") as f:
+                f.write(f"{ts}\trollback\t{target}\n")
 
-        ts = datetime.now().isoformat(timespec="seconds")
-        with open(HISTORY_FILE, "a", encoding="utf-8") as f:
-            f.write(f"{ts}\trollback\t{target}\n")
-
-        success = True
-        msg = f"ROLLED BACK: {target}"
-        print(msg)
-        rc = 0
+            success = True
+            metrics.record_live_version(target)
+            msg = f"ROLLED BACK: {target}"
+            print(msg)
+            rc = 0
 
     except Exception as e:
         success = False
@@ -338,20 +585,300 @@ def cmd_rollback(target_version: str | None) -> int:
         "message": msg,
         "timestamp": datetime.now().isoformat(timespec="seconds"),
     }
-    _emit_json(rep, json_out=False, out_path="artifacts/last_rollback.json")
+    if pv is not None:
+        rep["gate"] = pv["gate"]
+    _emit_json(rep, json_out=False, out_path=ROLLBACK_REPORT)
+    result = "ok" if success else ("blocked" if blocked else "failed")
+    metrics.inc("policyv_rollbacks_total", {"result": result})
 
     return rc
 
 
-def cmd_status() -> int:
+def _identical_groups(versions: list[str]) -> list[list[str]]:
+    by_hash: dict[str, list[str]] = {}
+    for v in versions:
+        h = read_hash(RELEASES_DIR, v)
+        if h is None:
+            # 해시가 없는 예전 릴리즈는 재구성해서 계산
+            h = canonical_hash(load_release(RELEASES_DIR, v))
+        by_hash.setdefault(h, []).append(v)
+    return [g for g in by_hash.values() if len(g) > 1]
+
+
+def cmd_status(identical: bool = False) -> int:
     _ensure_dirs()
     versions = _list_versions()
     cur = _read_current_version()
+    metrics.record_live_version(cur)
     print(f"current: {cur}")
     print(f"releases: {versions if versions else '[]'}")
+    if identical:
+        groups = _identical_groups(versions)
+        if not groups:
+            print("identical: none")
+        for g in groups:
+            print(f"identical: {' = '.join(g)}")
+    return 0
+
+
+def cmd_compact(snapshot_every: int, json_out: bool) -> int:
+    _ensure_dirs()
+    versions = _list_versions()
+    if not versions:
+        print("COMPACT: no releases found")
+        return 0
+
+    stats = compact_archive(RELEASES_DIR, versions, snapshot_every=snapshot_every)
+    if json_out:
+        _emit_json(stats, json_out=True, out_path=None)
+    else:
+        print(
+            f"COMPACTED: {stats['converted']}/{stats['releases']} releases, "
+            f"{stats['bytes_before']} -> {stats['bytes_after']} bytes "
+            f"(saved {stats['bytes_saved']})"
+        )
+    return 0
+
+
+def cmd_tag(version: str | None, name: str, delete: bool) -> int:
+    _ensure_dirs()
+    from .retention import load_tags
+
+    tags = load_tags(TAGS_FILE)
+    if delete:
+        if tags.pop(name, None) is None:
+            print(f"TAG FAILED: tag not found: {name}")
+            return 2
+    else:
+        if not version or not release_exists(RELEASES_DIR, version):
+            print(f"TAG FAILED: version not found: {version}")
+            return 2
+        tags[name] = version
+
+    Path(TAGS_FILE).write_text(
+        json.dumps(tags, ensure_ascii=False, indent=2), encoding="utf-8"
+    )
+    if delete:
+        print(f"TAG DELETED: {name}")
+    else:
+        print(f"TAG SET: {name} -> {version}")
+    return 0
+
+
+def cmd_gc(
+    keep_last: int | None,
+    keep_days: float | None,
+    keep_tagged: bool,
+    dry_run: bool,
+    limit: int = GC_DEFAULT_LIMIT,
+    json_out: bool = False,
+) -> int:
+    from .retention import load_tags, parse_history, select_prunable
+
+    if not keep_last and keep_days is None and not keep_tagged:
+        print("GC FAILED: no retention rule given (--keep-last/--keep-days/--keep-tagged)")
+        return 2
+
+    _ensure_dirs()
+    versions = _list_versions()
+    current = _read_current_version()
+    tags = load_tags(TAGS_FILE)
+
+    prunable = select_prunable(
+        versions,
+        current,
+        parse_history(HISTORY_FILE),
+        tags,
+        keep_last=keep_last,
+        keep_days=keep_days,
+        keep_tagged=keep_tagged,
+    )
+    pruned = prunable[:limit] if limit else prunable
+    pruned_set = set(pruned)
+
+    # 남는 delta 릴리즈 중 base가 삭제되는 것은 먼저 스냅샷으로 전환
+    rebased = []
+    for v in versions:
+        if v in pruned_set:
+            continue
+        base = release_base(RELEASES_DIR, v)
+        if base is not None and base in pruned_set:
+            rebased.append(v)
+
+    rep = {
+        "action": "gc",
+        "dry_run": dry_run,
+        "releases": len(versions),
+        "current": current,
+        "pruned": pruned,
+        "rebased": rebased,
+        "remaining_prunable": len(prunable) - len(pruned),
+    }
+
+    if not dry_run:
+        for v in rebased:
+            snapshot_release(RELEASES_DIR, v)
+        ts = datetime.now().isoformat(timespec="seconds")
+        with open(HISTORY_FILE, "a", encoding="utf-8") as f:
+            for v in pruned:
+                shutil.rmtree(Path(RELEASES_DIR) / v)
+                f.write(f"{ts}\tgc\t{v}\n")
+
+        # 삭제된 버전을 가리키는 롤백 리포트는 정리
+        rb = Path(ROLLBACK_REPORT)
+        if rb.exists():
+            try:
+                to_ver = json.loads(rb.read_text(encoding="utf-8")).get("to_version")
+            except ValueError:
+                to_ver = None
+            if to_ver is None or to_ver in pruned_set:
+                rb.unlink()
+
+    if json_out:
+        _emit_json(rep, json_out=True, out_path=None)
+    else:
+        verb = "WOULD PRUNE" if dry_run else "PRUNED"
+        print(f"GC {verb}: {len(pruned)} of {len(versions)} releases")
+        if rep["remaining_prunable"]:
+            print(f"  remaining prunable (limit reached): {rep['remaining_prunable']}")
+        if rebased:
+            print(f"  rebased to snapshot: {len(rebased)}")
+    return 0
+
+
+def cmd_gate_replay(configs_path: str, json_out: bool, out_path: str | None) -> int:
+    from .replay import format_matrix, load_gate_configs, pair_counts, replay
+
+    _ensure_dirs()
+    versions = _list_versions()
+    if len(versions) < 2:
+        print("GATE REPLAY: need at least two releases")
+        return 2
+
+    configs = load_gate_configs(configs_path)
+    result = replay(pair_counts(RELEASES_DIR, versions), configs)
+
+    _emit_json(result, json_out=json_out, out_path=out_path)
+    if not json_out:
+        print(format_matrix(result))
     return 0
 
 
+def cmd_fleet_status(
+    roots: list[str],
+    roots_file: str | None,
+    workers: int,
+    timeout: float,
+    json_out: bool,
+    out_path: str | None,
+) -> int:
+    from .fleet import fleet_status, format_table
+
+    roots = list(roots)
+    if roots_file:
+        lines = Path(roots_file).read_text(encoding="utf-8").splitlines()
+        roots += [ln.strip() for ln in lines if ln.strip() and not ln.startswith("#")]
+    if not roots:
+        print("FLEET STATUS FAILED: no repository roots given")
+        return 2
+
+    rows = fleet_status(roots, workers=workers, timeout=timeout)
+    _emit_json({"repositories": rows}, json_out=json_out, out_path=out_path)
+    if not json_out:
+        print(format_table(rows))
+    return 0 if all(r["status"] == "ok" for r in rows) else 2
+
+
+def cmd_verify(incremental: bool, workers: int, json_out: bool) -> int:
+    from .verify import verify_archive
+
+    result = verify_archive(".", workers=workers, incremental=incremental)
+    if json_out:
+        _emit_json(result, json_out=True, out_path=None)
+    else:
+        print(
+            f"releases: {result['releases']}, checked: {len(result['checked'])}, "
+            f"files hashed: {result['files_hashed']}"
+        )
+        for p in result["problems"]:
+            print(f"  [{p['check']}] {p['version']}: {p['detail']}")
+        print("VERIFY OK" if result["ok"] else "VERIFY FAILED")
+    return 0 if result["ok"] else 2
+
+
+def cmd_queue_submit(policy_path: str, target: str) -> int:
+    from .release_queue import submit
+
+    entry_id = submit(policy_path, target=target)
+    print(f"QUEUED: {entry_id} target={os.path.abspath(target)}")
+    return 0
+
+
+def cmd_queue_status(json_out: bool) -> int:
+    from .release_queue import queue_stats
+
+    stats = queue_stats()
+    metrics.set_gauge("policyv_queue_depth", stats["depth"])
+    if json_out:
+        _emit_json(stats, json_out=True, out_path=None)
+    else:
+        print(f"depth: {stats['depth']}")
+        print(f"oldest wait: {stats['oldest_wait_seconds']}s")
+        for t, n in stats["targets"].items():
+            print(f"  {t}: {n}")
+    return 0
+
+
+def cmd_queue_work(
+    once: bool,
+    poll: float,
+    max_batch: int | None,
+    strict: bool,
+    archive: str,
+    pipelined: bool,
+) -> int:
+    import time
+
+    from .release_queue import acquire_worker_lock, drain
+
+    lock = acquire_worker_lock()
+    if lock is None:
+        print("QUEUE WORKER FAILED: another worker is running")
+        return 2
+
+    def release(path: str, fragments: list, model: CompiledPolicy) -> int:
+        return cmd_release(
+            path,
+            strict=strict,
+            json_out=False,
+            out_path=None,
+            archive=archive,
+            pipelined=pipelined,
+            source_fragments=fragments,
+            model=model,
+        )
+
+    rc = 0
+    try:
+        while True:
+            for res in drain(release, max_batch=max_batch):
+                line = f"{res['state'].upper()}: {res['id']} target={res['target']}"
+                if res["state"] == "superseded":
+                    line += f" by={res['superseded_by']}"
+                print(line)
+                if res["state"] == "failed":
+                    rc = 2
+            metrics.maybe_flush()
+            if once:
+                break
+            time.sleep(poll)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        lock.close()
+    return rc
+
+
 def main_entry() -> None:
     raise SystemExit(main())
 
@@ -360,6 +887,11 @@ def main() -> int:
     p = argparse.ArgumentParser(
         prog="sv", description="Strategy policy validator (MVP Week1)"
     )
+    p.add_argument(
+        "--metrics-file",
+        default=None,
+        help=f"Write Prometheus textfile metrics here (or set {metrics.ENV_VAR})",
+    )
     sub = p.add_subparsers(dest="cmd", required=True)
 
     v = sub.add_parser("validate", help="Validate a policy file")
@@ -367,6 +899,16 @@ def main() -> int:
     v.add_argument("--json", action="store_true", help="Print JSON report")
     v.add_argument("--out", default=None, help="Write JSON report to a file")
 
+    vb = sub.add_parser("validate-batch", help="Validate many policy files at once")
+    vb.add_argument("policies", nargs="+", help="Policy files")
+    vb.add_argument(
+        "--columnar",
+        action="store_true",
+        help="Columnar report: rule messages, codes and paths stored once",
+    )
+    vb.add_argument("--json", action="store_true", help="Print JSON report")
+    vb.add_argument("--out", default=None, help="Write JSON report to a file")
+
     r = sub.add_parser(
         "release",
         help="Validate and release policy into versioned archive + current.yaml",
@@ -384,6 +926,23 @@ def main() -> int:
     r.add_argument(
         "--dry-run", action="store_true", help="simulate release without writing files"
     )
+    r.add_argument(
+        "--archive",
+        choices=["full", "delta"],
+        default="full",
+        help="Store release as full copy or as delta against the previous release",
+    )
+    r.add_argument(
+        "--if-identical",
+        choices=["release", "skip", "alias"],
+        default="release",
+        help="What to do when content matches current.yaml (ignoring meta bookkeeping)",
+    )
+    r.add_argument(
+        "--pipelined",
+        action="store_true",
+        help="Load concurrently, stage outputs and commit with minimal fsync/rename",
+    )
 
     rb = sub.add_parser(
         "rollback", help="Rollback current.yaml to previous or target version"
@@ -393,14 +952,141 @@ def main() -> int:
         default=None,
         help="Target version (e.g., 0.1.0). If omitted, rollback to previous.",
     )
+    rb.add_argument(
+        "--preview",
+        action="store_true",
+        help="Show changes and gate outcome without rolling back",
+    )
+    rb.add_argument(
+        "--gate",
+        action="store_true",
+        help="Apply the target's release gate and block the rollback if it fails",
+    )
+    rb.add_argument("--json", action="store_true", help="Print preview as JSON")
+
+    st = sub.add_parser("status", help="Show current version and available releases")
+    st.add_argument(
+        "--identical",
+        action="store_true",
+        help="Show groups of content-identical versions",
+    )
+
+    c = sub.add_parser(
+        "compact", help="Convert release archive to deltas and report space saved"
+    )
+    c.add_argument(
+        "--snapshot-every",
+        type=int,
+        default=SNAPSHOT_EVERY,
+        help="Store a full snapshot every N releases",
+    )
+    c.add_argument("--json", action="store_true", help="Print JSON stats")
+
+    t = sub.add_parser("tag", help="Tag a release (tagged releases survive gc)")
+    t.add_argument("name", help="Tag name")
+    t.add_argument("--version", default=None, help="Release version to tag")
+    t.add_argument("--delete", action="store_true", help="Delete the tag")
+
+    g = sub.add_parser("gc", help="Prune old releases by retention policy")
+    g.add_argument("--keep-last", type=int, default=None, help="Keep last N releases")
+    g.add_argument(
+        "--keep-days",
+        type=float,
+        default=None,
+        help="Keep any version live in the past N days (from history.log)",
+    )
+    g.add_argument("--keep-tagged", action="store_true", help="Keep tagged releases")
+    g.add_argument(
+        "--limit",
+        type=int,
+        default=GC_DEFAULT_LIMIT,
+        help="Max releases to prune in one run (0 = unlimited)",
+    )
+    g.add_argument("--dry-run", action="store_true", help="Only show what would be pruned")
+    g.add_argument("--json", action="store_true", help="Print JSON report")
+
+    q = sub.add_parser("queue", help="Local release queue with coalescing")
+    qsub = q.add_subparsers(dest="queue_cmd", required=True)
+    qs = qsub.add_parser("submit", help="Submit a candidate policy")
+    qs.add_argument("--policy", default=DEFAULT_POLICY)
+    qs.add_argument(
+        "--target", default=".", help="Repository root to release into (default: .)"
+    )
+    qw = qsub.add_parser("work", help="Drain the queue (newest candidate per target)")
+    qw.add_argument("--once", action="store_true", help="Drain once and exit")
+    qw.add_argument("--poll", type=float, default=5.0, help="Poll interval in seconds")
+    qw.add_argument("--max-batch", type=int, default=None, help="Max releases per drain")
+    qw.add_argument("--strict", action="store_true", help="Release with --strict")
+    qw.add_argument("--archive", choices=["full", "delta"], default="full")
+    qw.add_argument("--pipelined", action="store_true", help="Use pipelined release")
+    qst = qsub.add_parser("status", help="Show queue depth and wait time")
+    qst.add_argument("--json", action="store_true", help="Print JSON stats")
+
+    vf = sub.add_parser(
+        "verify", help="Check releases, current.yaml and history.log agree"
+    )
+    vf.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Re-check only releases whose files changed since the last verify",
+    )
+    vf.add_argument("--workers", type=int, default=8, help="Parallel hash workers")
+    vf.add_argument("--json", action="store_true", help="Print JSON result")
+
+    fs = sub.add_parser(
+        "fleet-status", help="Show status of many policy repositories concurrently"
+    )
+    fs.add_argument("roots", nargs="*", help="Repository root directories")
+    fs.add_argument("--roots-file", default=None, help="File with one root per line")
+    fs.add_argument("--workers", type=int, default=8, help="Max concurrent repositories")
+    fs.add_argument(
+        "--timeout",
+        type=float,
+        default=10.0,
+        help="Per-repository timeout in seconds",
+    )
+    fs.add_argument("--json", action="store_true", help="Print JSON document")
+    fs.add_argument("--out", default=None, help="Write JSON document to a file")
 
-    sub.add_parser("status", help="Show current version and available releases")
+    gr = sub.add_parser(
+        "gate-replay",
+        help="Evaluate candidate gate configs against every past release pair",
+    )
+    gr.add_argument(
+        "--configs",
+        required=True,
+        help="YAML/JSON file with a list or mapping of release.gate configs",
+    )
+    gr.add_argument("--json", action="store_true", help="Print JSON matrix")
+    gr.add_argument("--out", default=None, help="Write JSON matrix to a file")
 
     args = p.parse_args()
 
+    metrics.configure(args.metrics_file or os.environ.get(metrics.ENV_VAR))
+    try:
+        rc = _dispatch(args)
+    finally:
+        if metrics.enabled():
+            metrics.flush()
+    return rc
+
+
+def _dispatch(args: argparse.Namespace) -> int:
+    rc = _run_command(args)
+    metrics.inc(
+        "policyv_command_runs_total",
+        {"command": args.cmd, "result": "ok" if rc == 0 else "failed"},
+    )
+    return rc
+
+
+def _run_command(args: argparse.Namespace) -> int:
     if args.cmd == "validate":
         return cmd_validate(args.policy, args.json, args.out)
 
+    if args.cmd == "validate-batch":
+        return cmd_validate_batch(args.policies, args.columnar, args.json, args.out)
+
     if args.cmd == "release":
         return cmd_release(
             policy_path=args.policy,
@@ -408,13 +1094,64 @@ def main() -> int:
             json_out=args.json,
             out_path=args.out,
             dry_run=args.dry_run,
+            archive=args.archive,
+            if_identical=args.if_identical,
+            pipelined=args.pipelined,
         )
 
     if args.cmd == "rollback":
-        return cmd_rollback(args.to)
+        return cmd_rollback(
+            args.to, preview=args.preview, gate=args.gate, json_out=args.json
+        )
 
     if args.cmd == "status":
-        return cmd_status()
+        return cmd_status(identical=args.identical)
+
+    if args.cmd == "compact":
+        return cmd_compact(args.snapshot_every, args.json)
+
+    if args.cmd == "tag":
+        return cmd_tag(args.version, args.name, args.delete)
+
+    if args.cmd == "queue":
+        if args.queue_cmd == "submit":
+            return cmd_queue_submit(args.policy, args.target)
+        if args.queue_cmd == "status":
+            return cmd_queue_status(args.json)
+        return cmd_queue_work(
+            once=args.once,
+            poll=args.poll,
+            max_batch=args.max_batch,
+            strict=args.strict,
+            archive=args.archive,
+            pipelined=args.pipelined,
+        )
+
+    if args.cmd == "verify":
+        return cmd_verify(args.incremental, args.workers, args.json)
+
+    if args.cmd == "fleet-status":
+        return cmd_fleet_status(
+            args.roots,
+            args.roots_file,
+            workers=args.workers,
+            timeout=args.timeout,
+            json_out=args.json,
+            out_path=args.out,
+        )
+
+    if args.cmd == "gate-replay":
+        return cmd_gate_replay(args.configs, args.json, args.out)
+
+    if args.cmd == "gc":
+        return cmd_gc(
+            keep_last=args.keep_last,
+            keep_days=args.keep_days,
+            keep_tagged=args.keep_tagged,
+            dry_run=args.dry_run,
+            limit=args.limit,
+            json_out=args.json,
+        )
 
     return 2
 
@@ -1,18 +1,326 @@
 from __future__ import annotations
-from typing import Any, Dict, List
+from collections import deque
+from bisect import bisect_left
+from typing import Any, Dict, List, Tuple
 
+from .hashing import canonical_json
+from .model import CompiledPolicy, raw_policy
 
-def _flatten(d: Dict[str, Any], prefix: str = "$") -> Dict[str, Any]:
+# 리스트 원소를 키로 매칭할 때 사용할 필드(앞에서부터 우선)
+LIST_KEYS = ("name", "id", "key")
+
+# 비키 리스트 LCS: 구간당 Myers 탐색 편집 거리 상한(넘으면 patience 분할),
+# 그리고 diff 한 번에 쓸 수 있는 Myers 총 작업량(대각선 탐색 횟수)
+LCS_MAX_EDITS = 256
+LCS_WORK_BUDGET = 1_000_000
+
+
+def _flatten(d: Any, prefix: str = "$") -> Dict[str, Any]:
     out: Dict[str, Any] = {}
-    for k, v in d.items():
-        p = f"{prefix}.{k}"
-        if isinstance(v, dict):
-            out.update(_flatten(v, p))
-        else:
-            out[p] = v
+    if isinstance(d, dict):
+        for k, v in d.items():
+            p = f"{prefix}.{k}"
+            if isinstance(v, (dict, list)) and v:
+                out.update(_flatten(v, p))
+            elif isinstance(v, dict):
+                continue
+            else:
+                out[p] = v
+    elif isinstance(d, list) and d:
+        for i, v in enumerate(d):
+            p = f"{prefix}[{i}]"
+            if isinstance(v, (dict, list)) and v:
+                out.update(_flatten(v, p))
+            else:
+                out[p] = v
+    else:
+        out[prefix] = d
     return out
 
 
+def _token(v: Any) -> Any:
+    # 원소 비교용 해시 가능 토큰 (컨테이너는 키 순서 무관 직렬화)
+    if isinstance(v, (dict, list)):
+        return ("c", canonical_json(v))
+    try:
+        hash(v)
+    except TypeError:
+        return ("r", repr(v))
+    return ("s", v)
+
+
+def _list_key(a: List[Any], b: List[Any]) -> str | None:
+    if not a and not b:
+        return None
+    for k in LIST_KEYS:
+        if all(isinstance(x, dict) and k in x for x in a) and all(
+            isinstance(x, dict) and k in x for x in b
+        ):
+            return k
+    return None
+
+
+def _diff_keyed(
+    a: List[Dict[str, Any]], b: List[Dict[str, Any]], key: str, path: str, out
+) -> None:
+    """
+    키 기반 매칭 (순서 무관):
+      1) key + 전체 내용이 같은 원소끼리 먼저 짝지음 (변경 없음)
+      2) 남은 원소는 같은 key 값끼리 등장 순서대로 짝지어 재귀 비교
+      3) 나머지는 added / removed
+    같은 위치에서 이미 같은 원소는 토큰화 없이 건너뛴다.
+    """
+    used_a = [False] * len(a)
+    rest_b: List[int] = []
+    for j in range(len(b)):
+        if j < len(a) and a[j] == b[j]:
+            used_a[j] = True
+        else:
+            rest_b.append(j)
+
+    exact: Dict[Any, deque] = {}
+    for i in range(len(a)):
+        if not used_a[i]:
+            exact.setdefault(_token(a[i]), deque()).append(i)
+
+    left_b: List[int] = []
+    for j in rest_b:
+        bucket = exact.get(_token(b[j]))
+        if bucket:
+            used_a[bucket.popleft()] = True
+        else:
+            left_b.append(j)
+
+    by_key: Dict[Any, deque] = {}
+    for i in range(len(a)):
+        if not used_a[i]:
+            by_key.setdefault(_token(a[i][key]), deque()).append(i)
+
+    for j in left_b:
+        bucket = by_key.get(_token(b[j][key]))
+        if bucket:
+            i = bucket.popleft()
+            used_a[i] = True
+            _diff_into(a[i], b[j], f"{path}[{j}]", out)
+        else:
+            out[0].extend(_flatten(b[j], f"{path}[{j}]").items())
+
+    for i in range(len(a)):
+        if not used_a[i]:
+            out[1].extend(_flatten(a[i], f"{path}[{i}]").items())
+
+
+def _lcs_pairs(ta: List[Any], tb: List[Any]) -> List[Tuple[int, int]]:
+    """
+    비키(unkeyed) 리스트의 LCS 매칭 인덱스 쌍 (오름차순).
+
+    - 공통 prefix/suffix를 먼저 잘라낸다.
+    - 가운데는 Myers O((N+M)D); 편집 거리가 LCS_MAX_EDITS를 넘으면
+      양쪽에 한 번씩만 나오는 원소를 앵커로 하는 patience 방식으로 분할한다.
+    - Myers 총 작업량이 LCS_WORK_BUDGET을 넘으면 남은 구간은 앵커 분할만 한다.
+    수만 개 원소라도 변경이 적으면 선형에 가깝게 동작하고,
+    완전히 섞인 리스트도 최소 diff 대신 유효한 diff를 제한된 시간에 돌려준다.
+    """
+    pairs: List[Tuple[int, int]] = []
+    _match(ta, tb, 0, len(ta), 0, len(tb), pairs, [LCS_WORK_BUDGET])
+    return pairs
+
+
+def _match(
+    ta: List[Any],
+    tb: List[Any],
+    a0: int,
+    a1: int,
+    b0: int,
+    b1: int,
+    out: List[Tuple[int, int]],
+    budget: List[int],
+) -> None:
+    while a0 < a1 and b0 < b1 and ta[a0] == tb[b0]:
+        out.append((a0, b0))
+        a0 += 1
+        b0 += 1
+    tail: List[Tuple[int, int]] = []
+    while a1 > a0 and b1 > b0 and ta[a1 - 1] == tb[b1 - 1]:
+        a1 -= 1
+        b1 -= 1
+        tail.append((a1, b1))
+
+    if a0 < a1 and b0 < b1:
+        mid = _myers(ta[a0:a1], tb[b0:b1], LCS_MAX_EDITS, budget)
+        if mid is not None:
+            out.extend((i + a0, j + b0) for i, j in mid)
+        else:
+            anchors = _unique_anchors(ta, tb, a0, a1, b0, b1)
+            pi, pj = a0, b0
+            for i, j in anchors:
+                _match(ta, tb, pi, i, pj, j, out, budget)
+                out.append((i, j))
+                pi, pj = i + 1, j + 1
+            if anchors:
+                _match(ta, tb, pi, a1, pj, b1, out, budget)
+            # 앵커가 없으면 가운데는 위치 기준 치환으로 취급
+
+    out.extend(reversed(tail))
+
+
+def _unique_anchors(
+    ta: List[Any], tb: List[Any], a0: int, a1: int, b0: int, b1: int
+) -> List[Tuple[int, int]]:
+    count: Dict[Any, List[int]] = {}
+    for i in range(a0, a1):
+        c = count.setdefault(ta[i], [0, -1, 0])
+        c[0] += 1
+        c[1] = i
+    for j in range(b0, b1):
+        c = count.get(tb[j])
+        if c is not None:
+            c[2] += 1
+            c.append(j)
+    cand = sorted(
+        (c[1], c[3]) for c in count.values() if c[0] == 1 and c[2] == 1
+    )
+    # b 인덱스 기준 LIS (patience sorting)
+    tails: List[int] = []
+    tails_idx: List[int] = []
+    prev: List[int] = [-1] * len(cand)
+    for n, (_, j) in enumerate(cand):
+        pos = bisect_left(tails, j)
+        if pos == len(tails):
+            tails.append(j)
+            tails_idx.append(n)
+        else:
+            tails[pos] = j
+            tails_idx[pos] = n
+        prev[n] = tails_idx[pos - 1] if pos > 0 else -1
+    seq: List[Tuple[int, int]] = []
+    n = tails_idx[-1] if tails_idx else -1
+    while n >= 0:
+        seq.append(cand[n])
+        n = prev[n]
+    seq.reverse()
+    return seq
+
+
+def _myers(
+    a: List[Any], b: List[Any], max_edits: int, budget: List[int]
+) -> List[Tuple[int, int]] | None:
+    n, m = len(a), len(b)
+    max_d = min(n + m, max_edits)
+    offset = max_d + 1
+    v = [0] * (2 * max_d + 3)
+    trace: List[List[int]] = []
+    for d in range(max_d + 1):
+        budget[0] -= d + 1
+        if budget[0] < 0:
+            return None
+        # 이번 라운드에서 참조하는 대각선 [-d-1, d+1] 구간만 보관
+        trace.append(v[offset - d - 1 : offset + d + 2])
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[offset + k - 1] < v[offset + k + 1]):
+                x = v[offset + k + 1]
+            else:
+                x = v[offset + k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[x] == b[y]:
+                x += 1
+                y += 1
+            v[offset + k] = x
+            if x >= n and y >= m:
+                return _myers_backtrack(trace, n, m)
+    return None
+
+
+def _myers_backtrack(trace: List[List[int]], n: int, m: int) -> List[Tuple[int, int]]:
+    pairs: List[Tuple[int, int]] = []
+    x, y = n, m
+    for d in range(len(trace) - 1, 0, -1):
+        v = trace[d]
+        k = x - y
+        if k == -d or (k != d and v[k - 1 + d + 1] < v[k + 1 + d + 1]):
+            prev_k = k + 1
+        else:
+            prev_k = k - 1
+        prev_x = v[prev_k + d + 1]
+        prev_y = prev_x - prev_k
+        while x > prev_x and y > prev_y:
+            x -= 1
+            y -= 1
+            pairs.append((x, y))
+        x, y = prev_x, prev_y
+    while x > 0 and y > 0:
+        x -= 1
+        y -= 1
+        pairs.append((x, y))
+    pairs.reverse()
+    return pairs
+
+
+def _diff_unkeyed(a: List[Any], b: List[Any], path: str, out) -> None:
+    # 공통 prefix/suffix는 토큰화 전에 원소 비교로 잘라낸다
+    n, m = len(a), len(b)
+    lo = 0
+    while lo < n and lo < m and a[lo] == b[lo]:
+        lo += 1
+    trim = 0
+    while trim < n - lo and trim < m - lo and a[n - 1 - trim] == b[m - 1 - trim]:
+        trim += 1
+
+    ta = [_token(x) for x in a[lo : n - trim]]
+    tb = [_token(x) for x in b[lo : m - trim]]
+    pairs = [(i + lo, j + lo) for i, j in _lcs_pairs(ta, tb)]
+    pairs.append((n - trim, m - trim))
+
+    pi, pj = lo, lo
+    for i, j in pairs:
+        # 매칭되지 않은 구간: 위치 기준으로 짝지어 재귀 비교, 남는 쪽은 added/removed
+        gap = min(i - pi, j - pj)
+        for k in range(gap):
+            _diff_into(a[pi + k], b[pj + k], f"{path}[{pj + k}]", out)
+        for ii in range(pi + gap, i):
+            out[1].extend(_flatten(a[ii], f"{path}[{ii}]").items())
+        for jj in range(pj + gap, j):
+            out[0].extend(_flatten(b[jj], f"{path}[{jj}]").items())
+        pi, pj = i + 1, j + 1
+
+
+def _diff_into(a: Any, b: Any, path: str, out) -> None:
+    added, removed, changed = out
+    if isinstance(a, dict) and isinstance(b, dict):
+        if a == b:
+            return
+        for k, v in b.items():
+            if k not in a:
+                added.extend(_flatten(v, f"{path}.{k}").items())
+        for k, v in a.items():
+            if k not in b:
+                removed.extend(_flatten(v, f"{path}.{k}").items())
+            else:
+                _diff_into(v, b[k], f"{path}.{k}", out)
+    elif isinstance(a, list) and isinstance(b, list):
+        if a == b:
+            return
+        key = _list_key(a, b)
+        if key is not None:
+            _diff_keyed(a, b, key, path, out)
+        else:
+            _diff_unkeyed(a, b, path, out)
+    elif isinstance(a, (dict, list)) or isinstance(b, (dict, list)):
+        removed.extend(_flatten(a, path).items())
+        added.extend(_flatten(b, path).items())
+    elif a != b:
+        changed.append((path, a, b))
+
+
+def _get(d: Dict[str, Any], path: str) -> Any:
+    cur: Any = d
+    for k in path[2:].split("."):
+        if not isinstance(cur, dict):
+            return None
+        cur = cur.get(k)
+    return cur
+
+
 def risk_score_from_flags(risk_flags: List[Dict[str, str]]) -> int:
     score = 0
     for rf in risk_flags:
@@ -23,7 +331,10 @@ def risk_score_from_flags(risk_flags: List[Dict[str, str]]) -> int:
     return score
 
 
-def diff_policies(old: Dict[str, Any] | None, new: Dict[str, Any]) -> Dict[str, Any]:
+def diff_policies(
+    old: Dict[str, Any] | CompiledPolicy | None,
+    new: Dict[str, Any] | CompiledPolicy,
+) -> Dict[str, Any]:
     """
     Returns:
       {
@@ -33,10 +344,17 @@ def diff_policies(old: Dict[str, Any] | None, new: Dict[str, Any]) -> Dict[str,
         "risk_flags": [{"level": "WARN|ERROR", "path": "...", "reason": "..."}],
         "risk_score": int
       }
+
+    리스트는 원소 단위로 비교한다:
+      - 모든 원소가 LIST_KEYS 필드를 가진 dict면 키 기반 매칭
+        (예: $.inputs.indicators[1].params.period)
+      - 그 외에는 LCS 매칭 후 남은 원소를 위치 기준으로 비교
+
+    CompiledPolicy는 위험 검사 값을 미리 풀어 둔 뷰에서 읽는다.
     """
     # --- Case 1) no previous policy (first release)
     if old is None:
-        flat_new = _flatten(new)
+        flat_new = _flatten(raw_policy(new))
         return {
             "added": [(p, v) for p, v in flat_new.items()],
             "removed": [],
@@ -46,57 +364,81 @@ def diff_policies(old: Dict[str, Any] | None, new: Dict[str, Any]) -> Dict[str,
         }
 
     # --- Case 2) compare old vs new
-    a = _flatten(old)
-    b = _flatten(new)
+    added: List[Tuple[str, Any]] = []
+    removed: List[Tuple[str, Any]] = []
+    changed: List[Tuple[str, Any, Any]] = []
+    _diff_into(raw_policy(old), raw_policy(new), "$", (added, removed, changed))
+
+    risk_flags = risk_flags_from_values(risk_values(old), risk_values(new))
+    score = risk_score_from_flags(risk_flags)
+
+    return {
+        "added": added,
+        "removed": removed,
+        "changed": changed,
+        "risk_flags": risk_flags,
+        "risk_score": score,
+    }
+
 
-    added = [(p, b[p]) for p in (b.keys() - a.keys())]
-    removed = [(p, a[p]) for p in (a.keys() - b.keys())]
-    changed = [(p, a[p], b[p]) for p in (a.keys() & b.keys()) if a[p] != b[p]]
+# 위험 검사 대상 값 (risk_values 튜플 순서)
+RISK_PATHS = (
+    "$.risk.per_trade_loss_pct",
+    "$.risk.daily_loss_limit_pct",
+    "$.exit.stop_loss_pct",
+    "$.execution.costs.fee_pct",
+    "$.execution.costs.slippage_pct",
+    "$.inputs.data.timeframe.primary",
+)
 
+
+def risk_values(policy: Dict[str, Any] | CompiledPolicy | None) -> Tuple[Any, ...]:
+    if policy is None:
+        return (None,) * len(RISK_PATHS)
+    if isinstance(policy, CompiledPolicy):
+        return (
+            policy.risk.per_trade_loss_pct,
+            policy.risk.daily_loss_limit_pct,
+            policy.exit.stop_loss_pct,
+            policy.costs.fee_pct,
+            policy.costs.slippage_pct,
+            policy.timeframe.primary,
+        )
+    return tuple(_get(policy, p) for p in RISK_PATHS)
+
+
+def risk_flags_from_values(
+    old: Tuple[Any, ...], new: Tuple[Any, ...]
+) -> List[Dict[str, str]]:
+    """RISK_PATHS 순서의 (이전, 새) 값만으로 위험 플래그 계산."""
     risk_flags: List[Dict[str, str]] = []
 
     def flag(level: str, path: str, reason: str):
         risk_flags.append({"level": level, "path": path, "reason": reason})
 
-    def get(path: str):
-        # returns (new_value, old_value)
-        return b.get(path), a.get(path)
+    o_ptl, o_dll, o_sl, _, _, o_tf = old
+    n_ptl, n_dll, n_sl, n_fee, n_slip, n_tf = new
 
     # 1) per_trade_loss 상승
-    nv, ov = get("$.risk.per_trade_loss_pct")
-    if ov is not None and nv is not None and nv > ov:
-        flag("WARN", "$.risk.per_trade_loss_pct", f"increased {ov} -> {nv}")
+    if o_ptl is not None and n_ptl is not None and n_ptl > o_ptl:
+        flag("WARN", "$.risk.per_trade_loss_pct", f"increased {o_ptl} -> {n_ptl}")
 
     # 2) daily_loss_limit 상승
-    nv, ov = get("$.risk.daily_loss_limit_pct")
-    if ov is not None and nv is not None and nv > ov:
-        flag("WARN", "$.risk.daily_loss_limit_pct", f"increased {ov} -> {nv}")
+    if o_dll is not None and n_dll is not None and n_dll > o_dll:
+        flag("WARN", "$.risk.daily_loss_limit_pct", f"increased {o_dll} -> {n_dll}")
 
     # 3) stop_loss 완화(확대)
-    nv, ov = get("$.exit.stop_loss_pct")
-    if ov is not None and nv is not None and nv > ov:
-        flag("WARN", "$.exit.stop_loss_pct", f"widened {ov} -> {nv}")
+    if o_sl is not None and n_sl is not None and n_sl > o_sl:
+        flag("WARN", "$.exit.stop_loss_pct", f"widened {o_sl} -> {n_sl}")
 
     # 4) 비용/슬리피지 0 설정(현실성 훼손)
-    nv, _ = get("$.execution.costs.fee_pct")
-    if nv == 0:
+    if n_fee == 0:
         flag("ERROR", "$.execution.costs.fee_pct", "fee set to 0")
-
-    nv, _ = get("$.execution.costs.slippage_pct")
-    if nv == 0:
+    if n_slip == 0:
         flag("ERROR", "$.execution.costs.slippage_pct", "slippage set to 0")
 
     # 5) timeframe 변경(전략 성격 급변)
-    nv, ov = get("$.inputs.data.timeframe.primary")
-    if ov is not None and nv is not None and nv != ov:
-        flag("WARN", "$.inputs.data.timeframe.primary", f"changed {ov} -> {nv}")
+    if o_tf is not None and n_tf is not None and n_tf != o_tf:
+        flag("WARN", "$.inputs.data.timeframe.primary", f"changed {o_tf} -> {n_tf}")
 
-    score = risk_score_from_flags(risk_flags)
-
-    return {
-        "added": added,
-        "removed": removed,
-        "changed": changed,
-        "risk_flags": risk_flags,
-        "risk_score": score,
-    }
+    return risk_flags
@@ -8,4 +8,12 @@ RULES = {
     "V004": {"severity": "ERROR", "message": "Timeframe inconsistency detected"},
     "V005": {"severity": "WARN", "message": "Execution realism may be insufficient"},
     "V006": {"severity": "ERROR", "message": "Exit or failsafe rule missing"},
+    "V007": {
+        "severity": "ERROR",
+        "message": "Indicator warm-up exceeds data budget",
+    },
+    "V008": {
+        "severity": "ERROR",
+        "message": "Malformed indicator or warm-up budget parameter",
+    },
 }
@@ -0,0 +1,156 @@
+from __future__ import annotations
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from .archive import load_release, read_hash, release_exists
+from .hashing import canonical_hash
+from .loader import load_policy
+from .paths import CURRENT_FILE, HISTORY_FILE, RELEASES_DIR, list_versions
+
+# history.log 마지막 줄을 찾을 때 끝에서 읽는 크기
+TAIL_CHUNK = 4096
+
+
+def _last_line(path: Path) -> str | None:
+    """파일 끝부분만 읽어 마지막 비어있지 않은 줄을 돌려준다."""
+    try:
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            f.seek(max(0, size - TAIL_CHUNK))
+            chunk = f.read()
+    except FileNotFoundError:
+        return None
+    lines = [ln for ln in chunk.decode("utf-8", errors="replace").splitlines() if ln]
+    return lines[-1] if lines else None
+
+
+def repo_status(root: str | Path) -> Dict[str, Any]:
+    """저장소 하나의 current / 최신 릴리즈 / 마지막 history / drift 상태."""
+    root = Path(root)
+    if not root.is_dir():
+        raise FileNotFoundError(f"Repository root not found: {root}")
+
+    releases_dir = root / RELEASES_DIR
+    versions = list_versions(releases_dir)
+    row: Dict[str, Any] = {
+        "root": str(root),
+        "status": "ok",
+        "current": None,
+        "latest": versions[-1] if versions else None,
+        "releases": len(versions),
+        "last_event": _last_line(root / HISTORY_FILE),
+        "drift": "no-current",
+    }
+
+    cur_file = root / CURRENT_FILE
+    if not cur_file.exists():
+        return row
+
+    cur = load_policy(str(cur_file))
+    version = (cur.get("meta") or {}).get("policy_version")
+    row["current"] = version
+
+    if not version or not release_exists(releases_dir, version):
+        row["drift"] = "unreleased"
+        return row
+
+    released = read_hash(releases_dir, version)
+    if released is None:
+        released = canonical_hash(load_release(releases_dir, version))
+    row["drift"] = "none" if canonical_hash(cur) == released else "modified"
+    return row
+
+
+def fleet_status(
+    roots: List[str], workers: int = 8, timeout: float = 10.0
+) -> List[Dict[str, Any]]:
+    """
+    여러 저장소를 제한된 워커 수로 동시에 조회한다.
+    저장소별로 timeout초가 지나면 'timeout'으로 표시하고 기다리지 않는다.
+    멈춘 워커(느린 마운트)는 데몬 스레드로 버려두고 대체 워커를 띄운다.
+    """
+    n = len(roots)
+    tasks: "queue.Queue[int]" = queue.Queue()
+    for i in range(n):
+        tasks.put(i)
+    results: "queue.Queue[tuple]" = queue.Queue()
+    started: Dict[int, float] = {}
+    lock = threading.Lock()
+
+    def worker() -> None:
+        while True:
+            try:
+                i = tasks.get_nowait()
+            except queue.Empty:
+                return
+            t0 = time.monotonic()
+            with lock:
+                started[i] = t0
+            try:
+                row = repo_status(roots[i])
+            except Exception as e:
+                row = {"root": roots[i], "status": "error", "error": str(e)}
+            row["elapsed_ms"] = round((time.monotonic() - t0) * 1000, 1)
+            results.put((i, row))
+
+    def spawn() -> None:
+        threading.Thread(target=worker, daemon=True, name="fleet-status").start()
+
+    for _ in range(max(1, min(workers, n))):
+        spawn()
+
+    out: List[Dict[str, Any] | None] = [None] * n
+    done = 0
+    while done < n:
+        now = time.monotonic()
+        with lock:
+            running = {i: t for i, t in started.items() if out[i] is None}
+        for i, t in running.items():
+            if now - t >= timeout:
+                out[i] = {
+                    "root": roots[i],
+                    "status": "timeout",
+                    "error": f"no response within {timeout}s",
+                }
+                done += 1
+                if not tasks.empty():
+                    spawn()
+        if done >= n:
+            break
+
+        pending = [t + timeout - now for i, t in running.items() if out[i] is None]
+        wait = max(0.0, min(pending)) if pending else 0.05
+        try:
+            i, row = results.get(timeout=wait)
+        except queue.Empty:
+            continue
+        if out[i] is None:
+            out[i] = row
+            done += 1
+
+    return [r for r in out if r is not None]
+
+
+def format_table(rows: List[Dict[str, Any]]) -> str:
+    headers = ["root", "status", "current", "latest", "drift", "last_event"]
+    table = [
+        [
+            str(r.get("root")),
+            str(r.get("status")),
+            str(r.get("current") or "-"),
+            str(r.get("latest") or "-"),
+            str(r.get("drift") or "-"),
+            str(r.get("last_event") or r.get("error") or "-").replace("\t", " "),
+        ]
+        for r in rows
+    ]
+    widths = [max(len(h), *(len(row[c]) for row in table)) for c, h in enumerate(headers)]
+    lines = ["  ".join(h.ljust(w) for h, w in zip(headers, widths))]
+    for row in table:
+        lines.append("  ".join(v.ljust(w) for v, w in zip(row, widths)))
+    return "\n".join(lines)
@@ -1,5 +1,7 @@
 # src/gate.py
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
+
+from .model import CompiledPolicy
 
 DEFAULT_GATE = {
     "mode": "soft",
@@ -27,14 +29,23 @@ def risk_score(flags: List[Dict[str, str]], weights: Dict[str, int]) -> int:
     return score
 
 
-def apply_gate(
-    diff: Dict[str, Any], policy_gate: Dict[str, Any] | None
-) -> Dict[str, Any]:
-    gate = _merge_gate_config(policy_gate)
-    flags = diff.get("risk_flags", [])
+def level_counts(flags: List[Dict[str, str]]) -> Dict[str, int]:
+    counts: Dict[str, int] = {}
+    for rf in flags:
+        counts[rf["level"]] = counts.get(rf["level"], 0) + 1
+    return counts
+
 
-    score = risk_score(flags, gate["weights"])
-    has_error = any(rf["level"] == "ERROR" for rf in flags)
+def gate_decision(
+    counts: Dict[str, int], gate: Dict[str, Any]
+) -> Tuple[bool, int, List[str]]:
+    """
+    레벨별 flag 개수와 병합된 gate 설정으로 (allowed, score, reasons) 계산.
+    apply_gate와 gate-replay가 같은 판정 로직을 공유한다.
+    """
+    weights = gate["weights"]
+    score = sum(weights.get(level, 0) * n for level, n in counts.items())
+    has_error = counts.get("ERROR", 0) > 0
 
     allowed = True
     reasons = []
@@ -53,6 +64,21 @@ def apply_gate(
             f"soft mode: score {score} >= threshold {gate['warn_score_block']}"
         )
 
+    return allowed, score, reasons
+
+
+def apply_gate(
+    diff: Dict[str, Any], policy_gate: Dict[str, Any] | CompiledPolicy | None
+) -> Dict[str, Any]:
+    # CompiledPolicy를 넘기면 release.gate 병합 결과를 모델에 캐시해 재사용
+    if isinstance(policy_gate, CompiledPolicy):
+        cp = policy_gate
+        gate = cp.cached("gate", lambda: _merge_gate_config(cp.gate))
+    else:
+        gate = _merge_gate_config(policy_gate)
+    flags = diff.get("risk_flags", [])
+
+    allowed, score, reasons = gate_decision(level_counts(flags), gate)
     decision = "ALLOW" if allowed else "BLOCK"
 
     return {
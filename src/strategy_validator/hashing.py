@@ -0,0 +1,66 @@
+from __future__ import annotations
+import hashlib
+import json
+from typing import Any, Dict
+
+# 내용 비교에서 제외할 meta 관리용 필드
+BOOKKEEPING_META = ("policy_version", "author")
+
+_CANON = json.JSONEncoder(
+    sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str
+)
+# str이 아닌 키가 있는 값용: _sorted_keys로 미리 정렬한 뒤 순서 그대로 직렬화
+_CANON_ORDERED = json.JSONEncoder(
+    ensure_ascii=False, separators=(",", ":"), default=str
+)
+
+
+def has_non_str_keys(v: Any) -> bool:
+    """문자열이 아닌 mapping 키가 어딘가에 있는지 (JSON으로 저장하면 str로 바뀐다)."""
+    if isinstance(v, dict):
+        return any(
+            not isinstance(k, str) or has_non_str_keys(x) for k, x in v.items()
+        )
+    if isinstance(v, (list, tuple)):
+        return any(has_non_str_keys(x) for x in v)
+    return False
+
+
+def _sorted_keys(v: Any) -> Any:
+    if isinstance(v, dict):
+        keyed = {f"{type(k).__name__}:{k}": x for k, x in v.items()}
+        return {k: _sorted_keys(keyed[k]) for k in sorted(keyed)}
+    if isinstance(v, (list, tuple)):
+        return [_sorted_keys(x) for x in v]
+    return v
+
+
+def canonical_json(obj: Any) -> str:
+    """
+    키 순서와 무관한 JSON 직렬화. json은 str이 아닌 키를 str로 바꾸고(1과 "1"이
+    같아짐) 타입이 섞이면 정렬하지 못하므로, str이 아닌 키가 하나라도 있으면
+    모든 키를 "타입이름:키" 문자열로 바꿔 정렬한다. 문자열 키만 있는 정책의
+    결과(와 해시)는 그대로다.
+    """
+    if has_non_str_keys(obj):
+        return _CANON_ORDERED.encode(_sorted_keys(obj))
+    return _CANON.encode(obj)
+
+
+def canonical_policy(policy: Dict[str, Any]) -> Dict[str, Any]:
+    """meta 관리용 필드를 뺀 얕은 복사본 (원본은 변경하지 않음)."""
+    out = dict(policy)
+    meta = out.get("meta")
+    if isinstance(meta, dict):
+        meta = {k: v for k, v in meta.items() if k not in BOOKKEEPING_META}
+        if meta:
+            out["meta"] = meta
+        else:
+            out.pop("meta")
+    return out
+
+
+def canonical_hash(policy: Dict[str, Any]) -> str:
+    """키 순서와 무관한 정책 내용 해시 (sha256 hex)."""
+    data = canonical_json(canonical_policy(policy)).encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
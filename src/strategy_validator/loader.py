@@ -1,9 +1,120 @@
+from __future__ import annotations
+import copy
+import hashlib
+import os
+import threading
 import yaml
+from collections import OrderedDict
 from pathlib import Path
+from typing import Any, Dict, List, Tuple
 
-def load_policy(path: str) -> dict:
+# 정책 합성 키: 값은 경로 하나 또는 경로 리스트 (포함하는 파일 기준 상대 경로)
+# extends -> include -> 문서 자신 순서로 deep-merge 한다.
+COMPOSE_KEYS = ("extends", "include")
+
+# extends/include로 읽은 조각의 파싱 결과 LRU 크기 (내용 sha256 기준: 공통 조각은
+# 배치 전체에서 한 번만 파싱). 최상위 정책 파일은 캐시하지 않는다
+FRAGMENT_CACHE_SIZE = 256
+
+_parsed: OrderedDict[str, Any] = OrderedDict()
+# load_pair, fleet 스레드, validate-batch가 동시에 부른다
+_parsed_lock = threading.Lock()
+_MISSING = object()
+
+
+class PolicyCompositionError(ValueError):
+    """extends/include 순환, 또는 mapping이 아닌 조각."""
+
+
+def _parse_fragment(data: bytes) -> Tuple[Any, str]:
+    digest = hashlib.sha256(data).hexdigest()
+    with _parsed_lock:
+        doc = _parsed.get(digest, _MISSING)
+        if doc is not _MISSING:
+            _parsed.move_to_end(digest)
+    if doc is _MISSING:
+        # 파싱은 잠금 밖에서 (같은 조각을 두 스레드가 동시에 파싱해도 결과는 같다)
+        doc = yaml.safe_load(data.decode("utf-8"))
+        with _parsed_lock:
+            _parsed[digest] = doc
+            _parsed.move_to_end(digest)
+            while len(_parsed) > FRAGMENT_CACHE_SIZE:
+                _parsed.popitem(last=False)
+    # 캐시된 객체는 공유되므로 호출자에게는 복사본을 준다
+    return copy.deepcopy(doc), digest
+
+
+def clear_fragment_cache() -> None:
+    with _parsed_lock:
+        _parsed.clear()
+
+
+def deep_merge(base: Any, overlay: Any) -> Any:
+    """
+    dict는 키별로 재귀 병합 (base 키 순서 유지, 새 키는 overlay 순서로 뒤에),
+    그 외(리스트, 스칼라, None)는 overlay가 통째로 대체.
+    """
+    if not isinstance(base, dict) or not isinstance(overlay, dict):
+        return overlay
+    out = dict(base)
+    for k, v in overlay.items():
+        out[k] = deep_merge(out[k], v) if k in out else v
+    return out
+
+
+def _refs(doc: Dict[str, Any], key: str, path: Path) -> List[str]:
+    refs = doc.pop(key, None)
+    if refs is None:
+        return []
+    if isinstance(refs, str):
+        return [refs]
+    if isinstance(refs, list) and all(isinstance(r, str) for r in refs):
+        return refs
+    raise PolicyCompositionError(f"{path}: '{key}' must be a path or list of paths")
+
+
+def _resolve(
+    path: Path, stack: Tuple[Path, ...], fragments: List[Dict[str, str]]
+) -> Any:
+    if path in stack:
+        chain = " -> ".join(str(p) for p in stack + (path,))
+        raise PolicyCompositionError(f"composition cycle: {chain}")
+    if not path.exists():
+        raise FileNotFoundError(f"Policy not found: {path}")
+    if stack:
+        doc, digest = _parse_fragment(path.read_bytes())
+        fragments.append({"path": os.path.relpath(path), "sha256": digest})
+    else:
+        doc = yaml.safe_load(path.read_text(encoding="utf-8"))
+    if not isinstance(doc, dict) or not any(k in doc for k in COMPOSE_KEYS):
+        return doc
+
+    merged: Any = {}
+    for key in COMPOSE_KEYS:
+        for ref in _refs(doc, key, path):
+            frag = _resolve((path.parent / ref).resolve(), stack + (path,), fragments)
+            if not isinstance(frag, dict):
+                raise PolicyCompositionError(f"{ref}: fragment must be a mapping")
+            merged = deep_merge(merged, frag)
+    return deep_merge(merged, doc)
+
+
+def load_composed(path: str) -> Tuple[dict, List[Dict[str, str]]]:
+    """
+    extends/include를 모두 풀어 합성한 정책과, 사용된 조각 목록
+    [{"path", "sha256"}] (합성 순서, 합성이 없으면 빈 리스트)을 돌려준다.
+    """
     p = Path(path)
     if not p.exists():
         raise FileNotFoundError(f"Policy not found: {path}")
-    with open(p, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f)
+    fragments: List[Dict[str, str]] = []
+    return _resolve(p.resolve(), (), fragments), fragments
+
+
+def load_policy(path: str) -> dict:
+    return load_composed(path)[0]
+
+
+def dump_policy(policy: Dict[str, Any]) -> str:
+    """합성된 정책을 릴리즈/큐에 저장할 YAML 텍스트로."""
+    return yaml.safe_dump(policy, sort_keys=False, allow_unicode=True)
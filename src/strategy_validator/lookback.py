@@ -0,0 +1,222 @@
+"""
+지표 lookback / warm-up 데이터량 추정.
+
+timeframe 문자열("30s", "5m", "1h", "1d")을 초로 바꾸고, inputs.indicators의
+파라미터에서 timeframe별 최대 lookback(bar 수)을 구해 미리 받아야 할
+bar 수·바이트·기간을 추정한다. inputs.data.warmup_budget이 있으면 초과 여부를 본다.
+"""
+from __future__ import annotations
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
+
+_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+_TF = re.compile(r"^\s*(\d+)\s*([smhdw])\s*$", re.IGNORECASE)
+
+# bar 하나의 저장 크기: ts + OHLCV (8바이트 x 6)
+BAR_BYTES = 48
+
+# 지표별 lookback 표: (기본 파라미터, 파라미터 계수, 상수)
+#   lookback = sum(coef[k] * params[k]) + const
+# ema/macd는 초기값 영향이 충분히 줄어드는 3배 구간을 warm-up으로 본다.
+LOOKBACK_TABLE: Dict[str, Tuple[Dict[str, int], Dict[str, int], int]] = {
+    "sma": ({"period": 20}, {"period": 1}, 0),
+    "ema": ({"period": 20}, {"period": 3}, 0),
+    "rsi": ({"period": 14}, {"period": 3}, 1),
+    "macd": ({"fast": 12, "slow": 26, "signal": 9}, {"slow": 3, "signal": 1}, 0),
+    "atr": ({"period": 14}, {"period": 3}, 1),
+    "bbands": ({"period": 20}, {"period": 1}, 0),
+}
+
+
+def parse_timeframe(tf: Any) -> int:
+    """'5m' -> 300. 형식이 틀리면 ValueError."""
+    m = _TF.match(str(tf))
+    if not m or int(m.group(1)) == 0:
+        raise ValueError(f"invalid timeframe: {tf!r}")
+    return int(m.group(1)) * _UNITS[m.group(2).lower()]
+
+
+class LookbackError(ValueError):
+    """지표/예산 값이 잘못됨. path는 해당 항목 기준 상대 경로 ("params.period")."""
+
+    def __init__(self, path: str, detail: str) -> None:
+        super().__init__(detail)
+        self.path = path
+
+
+def _bar_count(v: Any, path: str) -> int:
+    # 양의 정수 (YAML에서 "20" 같은 문자열 숫자도 허용)
+    try:
+        if isinstance(v, bool):
+            raise TypeError
+        n = int(v)
+    except (TypeError, ValueError, OverflowError):
+        raise LookbackError(path, f"must be a positive integer, got {v!r}") from None
+    if n <= 0:
+        raise LookbackError(path, f"must be a positive integer, got {v!r}")
+    return n
+
+
+@lru_cache(maxsize=1024)
+def _lookback(name: str, values: Tuple[Tuple[str, int], ...]) -> int:
+    _, coefs, const = LOOKBACK_TABLE[name]
+    v = dict(values)
+    return sum(c * v[k] for k, c in coefs.items()) + const
+
+
+def indicator_lookback(name: str, params: Dict[str, Any] | None = None) -> int | None:
+    """
+    지표 하나의 lookback(bar 수). 표에 없는 지표는 None,
+    파라미터가 틀리면 LookbackError.
+    """
+    name = str(name).lower()
+    if name not in LOOKBACK_TABLE:
+        return None
+    if params is None:
+        params = {}
+    elif not isinstance(params, dict):
+        raise LookbackError("params", f"must be a mapping, got {params!r}")
+    defaults, coefs, _ = LOOKBACK_TABLE[name]
+    # lookback에 쓰이는 파라미터만 정수로 바꿔 캐시 키로 쓴다
+    values = tuple(
+        (k, _bar_count(params.get(k, defaults[k]), f"params.{k}")) for k in coefs
+    )
+    return _lookback(name, values)
+
+
+def resolve_indicators(
+    indicators: Any,
+) -> Tuple[List[Tuple[str, str]], List[Tuple[int, Any]]]:
+    """
+    inputs.indicators를 한 번 훑어 (형식 문제 목록, 표에 있는 지표의
+    (lookback, timeframe) 목록)을 돌려준다. 검증과 warm-up 추정이 같이 쓴다.
+    문제 경로는 "" (목록 자체), "[i]", "[i].params.period" 꼴.
+    """
+    if indicators is None:
+        return [], []
+    if not isinstance(indicators, list):
+        return [("", f"must be a list, got {indicators!r}")], []
+    problems: List[Tuple[str, str]] = []
+    resolved: List[Tuple[int, Any]] = []
+    for i, ind in enumerate(indicators):
+        if not isinstance(ind, dict):
+            problems.append((f"[{i}]", f"must be a mapping, got {ind!r}"))
+            continue
+        try:
+            lb = indicator_lookback(ind.get("name", ""), ind.get("params"))
+        except LookbackError as e:
+            problems.append((f"[{i}].{e.path}", str(e)))
+            continue
+        if lb is not None:
+            resolved.append((lb, ind.get("timeframe")))
+    return problems, resolved
+
+
+def check_indicators(indicators: Any) -> List[Tuple[str, str]]:
+    """inputs.indicators의 형식 문제 (상대 경로, 설명) 목록."""
+    return resolve_indicators(indicators)[0]
+
+
+def _max_by_timeframe(
+    resolved: List[Tuple[int, Any]], timeframes: Dict[str, str]
+) -> Dict[str, int]:
+    # 지표에 timeframe(키 이름 또는 "20m" 같은 값)이 없으면 모든 timeframe에 적용
+    out = {k: 0 for k in timeframes}
+    for lb, tf in resolved:
+        for k, v in timeframes.items():
+            if tf in (None, k, v) and lb > out[k]:
+                out[k] = lb
+    return out
+
+
+def max_lookback(
+    indicators: List[Dict[str, Any]], timeframes: Dict[str, str]
+) -> Dict[str, int]:
+    """
+    timeframe 키(primary/confirm/...)별 최대 lookback.
+    형식이 틀린 지표가 있으면 LookbackError (check_indicators가 따로 보고).
+    """
+    if not isinstance(indicators, list):
+        raise LookbackError("", "indicators must be a list")
+    resolved: List[Tuple[int, Any]] = []
+    for ind in indicators:
+        if not isinstance(ind, dict):
+            raise LookbackError("", "indicator must be a mapping")
+        lb = indicator_lookback(ind.get("name", ""), ind.get("params"))
+        if lb is not None:
+            resolved.append((lb, ind.get("timeframe")))
+    return _max_by_timeframe(resolved, timeframes)
+
+
+def estimate_warmup(
+    timeframes: Dict[str, str],
+    indicators: List[Dict[str, Any]],
+    resolved: List[Tuple[int, Any]] | None = None,
+) -> Dict[str, Any]:
+    """
+    timeframe별 bars/bytes/seconds와 합계. 기간은 timeframe 중 가장 긴 값.
+    resolved(resolve_indicators 결과, 문제 없음)가 있으면 지표를 다시 풀지 않는다.
+    """
+    if resolved is None:
+        lookbacks = max_lookback(indicators, timeframes)
+    else:
+        lookbacks = _max_by_timeframe(resolved, timeframes)
+    per_tf: Dict[str, Dict[str, Any]] = {}
+    for k, tf in timeframes.items():
+        bars = lookbacks[k]
+        per_tf[k] = {
+            "timeframe": tf,
+            "bars": bars,
+            "bytes": bars * BAR_BYTES,
+            "seconds": bars * parse_timeframe(tf),
+        }
+    return {
+        "timeframes": per_tf,
+        "bars": sum(v["bars"] for v in per_tf.values()),
+        "bytes": sum(v["bytes"] for v in per_tf.values()),
+        "seconds": max((v["seconds"] for v in per_tf.values()), default=0),
+    }
+
+
+def check_budget(budget: Any) -> List[Tuple[str, str]]:
+    """warmup_budget의 형식 문제 (budget 키 또는 "", 설명) 목록."""
+    if not isinstance(budget, dict):
+        return [("", f"must be a mapping, got {budget!r}")]
+    out: List[Tuple[str, str]] = []
+    for key in ("max_bars", "max_bytes"):
+        v = budget.get(key)
+        if v is not None and (isinstance(v, bool) or not isinstance(v, (int, float))):
+            out.append((key, f"must be a number, got {v!r}"))
+    if budget.get("max_duration") is not None:
+        try:
+            parse_timeframe(budget["max_duration"])
+        except ValueError as e:
+            out.append(("max_duration", str(e)))
+    return out
+
+
+def budget_violations(
+    estimate: Dict[str, Any], budget: Dict[str, Any] | None
+) -> List[Tuple[str, str]]:
+    """
+    (budget 키, 설명) 목록. max_duration은 timeframe 문자열로 받는다.
+    budget은 check_budget을 통과한 것이어야 한다.
+    """
+    if not budget:
+        return []
+    out: List[Tuple[str, str]] = []
+    if budget.get("max_bars") is not None and estimate["bars"] > budget["max_bars"]:
+        out.append(("max_bars", f"{estimate['bars']} bars > {budget['max_bars']}"))
+    if budget.get("max_bytes") is not None and estimate["bytes"] > budget["max_bytes"]:
+        out.append(("max_bytes", f"{estimate['bytes']} bytes > {budget['max_bytes']}"))
+    if budget.get("max_duration") is not None:
+        limit = parse_timeframe(budget["max_duration"])
+        if estimate["seconds"] > limit:
+            out.append(
+                (
+                    "max_duration",
+                    f"{estimate['seconds']}s > {budget['max_duration']}",
+                )
+            )
+    return out
@@ -0,0 +1,294 @@
+"""
+Prometheus 텍스트 형식(node_exporter textfile collector)으로 지표를 기록한다.
+
+- 설정하지 않으면(configure(None)) 모든 기록 함수는 즉시 반환한다.
+- counter/histogram은 실행 간 누적: flush 시 기존 파일 값에 이번 증분을 더한다.
+- gauge는 이번 실행에서 설정한 family만 통째로 교체한다.
+- 파일은 임시 파일 + os.replace로 원자적으로 교체한다.
+"""
+from __future__ import annotations
+import os
+import re
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+ENV_VAR = "POLICYV_METRICS_FILE"
+
+# 증분 flush 최소 간격(초): 장시간 실행 모드의 maybe_flush에서 사용
+FLUSH_INTERVAL = 5.0
+
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# family별 bucket (없으면 BUCKETS)
+FAMILY_BUCKETS: Dict[str, Tuple[float, ...]] = {
+    "policyv_queue_wait_seconds": (1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600),
+}
+
+# family 이름 -> (type, help)
+FAMILIES: Dict[str, Tuple[str, str]] = {
+    "policyv_stage_duration_seconds": (
+        "histogram",
+        "Latency of load/validate/diff/gate/commit stages",
+    ),
+    "policyv_findings_total": ("counter", "Validator findings by rule code"),
+    "policyv_risk_flags_total": ("counter", "Diff risk flags by path and level"),
+    "policyv_gate_decisions_total": ("counter", "Release gate decisions"),
+    "policyv_rollbacks_total": ("counter", "Rollbacks by result"),
+    "policyv_command_runs_total": ("counter", "CLI command runs by result"),
+    "policyv_live_version_info": ("gauge", "Version currently in current.yaml"),
+    "policyv_last_run_timestamp_seconds": ("gauge", "Unix time of the last run"),
+    "policyv_queue_depth": ("gauge", "Pending candidates in the release queue"),
+    "policyv_queue_wait_seconds": (
+        "histogram",
+        "Time from queue submission to processing",
+    ),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+_path: Path | None = None
+_counters: Dict[Tuple[str, Labels], float] = {}
+_gauges: Dict[str, Dict[Labels, float]] = {}
+# (name, labels) -> [bucket counts..., sum, count]
+_hists: Dict[Tuple[str, Labels], List[float]] = {}
+_last_flush = 0.0
+
+
+def configure(path: str | None) -> None:
+    global _path
+    _path = Path(path) if path else None
+    reset()
+
+
+def enabled() -> bool:
+    return _path is not None
+
+
+def reset() -> None:
+    _counters.clear()
+    _gauges.clear()
+    _hists.clear()
+
+
+def _labels(labels: Dict[str, str] | None) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in (labels or {}).items()))
+
+
+def inc(name: str, labels: Dict[str, str] | None = None, value: float = 1.0) -> None:
+    if _path is None:
+        return
+    key = (name, _labels(labels))
+    _counters[key] = _counters.get(key, 0.0) + value
+
+
+def set_gauge(name: str, value: float, labels: Dict[str, str] | None = None) -> None:
+    """gauge family를 이 값 하나로 교체 (info 계열: 이전 라벨은 사라짐)."""
+    if _path is None:
+        return
+    _gauges[name] = {_labels(labels): value}
+
+
+def observe(name: str, value: float, labels: Dict[str, str] | None = None) -> None:
+    if _path is None:
+        return
+    key = (name, _labels(labels))
+    buckets = FAMILY_BUCKETS.get(name, BUCKETS)
+    h = _hists.get(key)
+    if h is None:
+        h = _hists[key] = [0.0] * (len(buckets) + 2)
+    for i, b in enumerate(buckets):
+        if value <= b:
+            h[i] += 1
+    h[-2] += value
+    h[-1] += 1
+
+
+@contextmanager
+def _timer(stage: str) -> Iterator[None]:
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(
+            "policyv_stage_duration_seconds",
+            time.perf_counter() - t0,
+            {"stage": stage},
+        )
+
+
+def timed(stage: str):
+    """with timed("diff"): ...  (비활성 상태면 nullcontext)"""
+    if _path is None:
+        return nullcontext()
+    return _timer(stage)
+
+
+# --- 도메인 기록 헬퍼
+
+
+def record_findings(rep: Dict) -> None:
+    if _path is None:
+        return
+    for f in rep.get("errors", []) + rep.get("warnings", []):
+        inc("policyv_findings_total", {"code": f["code"], "severity": f["severity"]})
+
+
+def record_risk_flags(diff: Dict) -> None:
+    if _path is None:
+        return
+    for rf in diff.get("risk_flags", []):
+        inc("policyv_risk_flags_total", {"path": rf["path"], "level": rf["level"]})
+
+
+def record_gate(gate_result: Dict) -> None:
+    inc("policyv_gate_decisions_total", {"decision": gate_result["decision"]})
+
+
+def record_live_version(version: str | None) -> None:
+    if version is not None:
+        set_gauge("policyv_live_version_info", 1, {"version": version})
+
+
+# --- 직렬화 / flush
+
+_SAMPLE = re.compile(r"^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{.*\})?\s+(\S+)$")
+_LABEL = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)="((?:[^"\\]|\\.)*)"')
+
+
+def _escape(v: str) -> str:
+    return v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _unescape(v: str) -> str:
+    return re.sub(r"\\(.)", lambda m: "\n" if m.group(1) == "n" else m.group(1), v)
+
+
+def _fmt_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels) + "}"
+
+
+def _fmt_num(v: float) -> str:
+    return str(int(v)) if float(v).is_integer() else repr(float(v))
+
+
+def _family_of(sample: str) -> str:
+    if sample in FAMILIES:
+        return sample
+    for suffix in ("_bucket", "_sum", "_count"):
+        if sample.endswith(suffix) and sample[: -len(suffix)] in FAMILIES:
+            return sample[: -len(suffix)]
+    return sample
+
+
+def _read_samples(path: Path) -> Dict[Tuple[str, Labels], float]:
+    samples: Dict[Tuple[str, Labels], float] = {}
+    try:
+        text = path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return samples
+    for line in text.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        m = _SAMPLE.match(line)
+        if not m:
+            continue
+        labels = tuple(
+            (k, _unescape(v)) for k, v in _LABEL.findall(m.group(2) or "")
+        )
+        try:
+            samples[(m.group(1), labels)] = float(m.group(3))
+        except ValueError:
+            continue
+    return samples
+
+
+def _pending_samples() -> Dict[Tuple[str, Labels], float]:
+    out: Dict[Tuple[str, Labels], float] = dict(_counters)
+    for (name, labels), h in _hists.items():
+        for i, b in enumerate(FAMILY_BUCKETS.get(name, BUCKETS)):
+            out[(f"{name}_bucket", labels + (("le", repr(float(b))),))] = h[i]
+        out[(f"{name}_bucket", labels + (("le", "+Inf"),))] = h[-1]
+        out[(f"{name}_sum", labels)] = h[-2]
+        out[(f"{name}_count", labels)] = h[-1]
+    return out
+
+
+@contextmanager
+def _file_lock(path: Path) -> Iterator[None]:
+    # 같은 textfile을 여러 프로세스(queue work, release)가 읽고-합치고-교체하므로
+    # 옆의 잠금 파일로 직렬화한다 (잠금 없이 하면 서로의 증분을 덮어씀)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path.with_name(f".{path.name}.lock"), "a") as f:
+        try:
+            import fcntl
+        except ImportError:
+            yield  # fcntl 없는 플랫폼: 잠금 없이 진행
+            return
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def flush() -> None:
+    """이번 증분을 파일에 합쳐 원자적으로 쓰고, 메모리의 증분은 비운다."""
+    global _last_flush
+    if _path is None:
+        return
+    set_gauge("policyv_last_run_timestamp_seconds", time.time())
+    with _file_lock(_path):
+        _merge_into(_path)
+
+    _counters.clear()
+    _hists.clear()
+    _gauges.clear()
+    _last_flush = time.monotonic()
+
+
+def _merge_into(path: Path) -> None:
+    samples = _read_samples(path)
+    # 이번에 설정한 gauge family는 기존 샘플을 지우고 교체
+    if _gauges:
+        samples = {k: v for k, v in samples.items() if k[0] not in _gauges}
+        for name, series in _gauges.items():
+            for labels, v in series.items():
+                samples[(name, labels)] = v
+    for key, v in _pending_samples().items():
+        samples[key] = samples.get(key, 0.0) + v
+
+    by_family: Dict[str, List[Tuple[str, Labels, float]]] = {}
+    for (name, labels), v in samples.items():
+        by_family.setdefault(_family_of(name), []).append((name, labels, v))
+
+    lines: List[str] = []
+    for family in sorted(by_family):
+        kind, help_text = FAMILIES.get(family, ("untyped", ""))
+        if help_text:
+            lines.append(f"# HELP {family} {help_text}")
+        lines.append(f"# TYPE {family} {kind}")
+        for name, labels, v in sorted(by_family[family], key=_sample_order):
+            lines.append(f"{name}{_fmt_labels(labels)} {_fmt_num(v)}")
+
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _sample_order(s: Tuple[str, Labels, float]):
+    name, labels, _ = s
+    # histogram bucket은 le 숫자 순서로
+    plain = tuple(kv for kv in labels if kv[0] != "le")
+    le = [v for k, v in labels if k == "le"]
+    le_key = float("inf") if not le or le[0] == "+Inf" else float(le[0])
+    return (plain, name, le_key)
+
+
+def maybe_flush() -> None:
+    """장시간 실행 모드용: 마지막 flush 후 FLUSH_INTERVAL이 지났으면 flush."""
+    if _path is not None and time.monotonic() - _last_flush >= FLUSH_INTERVAL:
+        flush()
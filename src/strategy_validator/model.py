@@ -0,0 +1,105 @@
+"""
+컴파일된 정책 모델 (선택 사항).
+
+load_policy가 돌려준 dict를 한 번 훑어 검증·위험 검사·gate가 쓰는 값을
+slot 클래스에 미리 풀어 둔다. validate_report / diff_policies / apply_gate는
+dict 대신 CompiledPolicy를 받아도 같은 결과를 내며, 단계별 계산 결과
+(지표 lookback, warm-up 추정, findings, 병합된 gate)는 모델에 캐시되어
+단계 사이에서 공유된다 (예: 검증에서 푼 지표를 리포트의 warm-up 추정이 재사용).
+
+컴파일 후 raw dict를 수정하면 안 된다 (캐시가 낡는다).
+"""
+from __future__ import annotations
+from typing import Any, Callable, Dict
+
+
+_EMPTY: Dict[str, Any] = {}
+_MISSING = object()
+
+
+def _at(d: Any, *keys: str) -> Any:
+    for k in keys:
+        if not isinstance(d, dict):
+            return None
+        d = d.get(k)
+    return d
+
+
+def _section(d: Any) -> Dict[str, Any]:
+    # mapping이 아니면 빈 dict (뷰 생성자는 .get만 쓴다)
+    return d if isinstance(d, dict) else _EMPTY
+
+
+class RiskView:
+    __slots__ = ("per_trade_loss_pct", "daily_loss_limit_pct")
+
+    def __init__(self, risk: Any) -> None:
+        risk = _section(risk)
+        self.per_trade_loss_pct = risk.get("per_trade_loss_pct")
+        self.daily_loss_limit_pct = risk.get("daily_loss_limit_pct")
+
+
+class CostsView:
+    __slots__ = ("fee_pct", "slippage_pct")
+
+    def __init__(self, costs: Any) -> None:
+        costs = _section(costs)
+        self.fee_pct = costs.get("fee_pct")
+        self.slippage_pct = costs.get("slippage_pct")
+
+
+class ExitView:
+    __slots__ = ("stop_loss_pct",)
+
+    def __init__(self, exit_: Any) -> None:
+        self.stop_loss_pct = _section(exit_).get("stop_loss_pct")
+
+
+class TimeframeView:
+    __slots__ = ("primary", "confirm")
+
+    def __init__(self, tf: Any) -> None:
+        tf = _section(tf)
+        self.primary = tf.get("primary")
+        self.confirm = tf.get("confirm")
+
+
+class CompiledPolicy:
+    __slots__ = (
+        "raw",
+        "version",
+        "risk",
+        "costs",
+        "exit",
+        "timeframe",
+        "gate",
+        "_cache",
+    )
+
+    def __init__(self, policy: Dict[str, Any]) -> None:
+        self.raw = policy
+        self.version = _at(policy, "meta", "policy_version")
+        self.risk = RiskView(policy.get("risk"))
+        self.costs = CostsView(_at(policy, "execution", "costs"))
+        self.exit = ExitView(policy.get("exit"))
+        self.timeframe = TimeframeView(_at(policy, "inputs", "data", "timeframe"))
+        self.gate = _at(policy, "release", "gate")
+        self._cache: Dict[str, Any] = {}
+
+    def cached(self, key: str, fn: Callable[[], Any]) -> Any:
+        """단계별 계산 결과 메모 (예: findings, warm-up 추정, 병합된 gate)."""
+        # 새 모델은 대부분 처음 요청이므로 예외 대신 get으로 확인
+        v = self._cache.get(key, _MISSING)
+        if v is _MISSING:
+            v = self._cache[key] = fn()
+        return v
+
+
+def compile_policy(policy: Dict[str, Any] | CompiledPolicy) -> CompiledPolicy:
+    if isinstance(policy, CompiledPolicy):
+        return policy
+    return CompiledPolicy(policy)
+
+
+def raw_policy(policy: Dict[str, Any] | CompiledPolicy) -> Dict[str, Any]:
+    return policy.raw if isinstance(policy, CompiledPolicy) else policy
@@ -0,0 +1,35 @@
+"""
+정책 저장소 경로와 릴리즈 목록.
+
+cli와 cli가 부르는 모듈(fleet, verify 등)이 함께 쓰므로 cli 밖에 둔다
+(다른 모듈이 cli를 import하면 순환이 생긴다).
+"""
+from __future__ import annotations
+import os
+from pathlib import Path
+
+POLICIES_DIR = "policies"
+RELEASES_DIR = "policies/releases"
+CURRENT_FILE = "policies/current.yaml"
+HISTORY_FILE = "policies/history.log"
+TAGS_FILE = "policies/tags.json"
+ROLLBACK_REPORT = "artifacts/last_rollback.json"
+
+
+def list_versions(releases_dir: str | Path = RELEASES_DIR) -> list[str]:
+    base = Path(releases_dir)
+    if not base.exists():
+        return []
+    # scandir: 디렉터리 엔트리 타입을 stat 없이 읽어 항목이 많아도 빠름
+    with os.scandir(base) as it:
+        versions = [e.name for e in it if e.is_dir()]
+
+    def key(v: str):
+        parts = v.split(".")
+        return (
+            tuple(int(x) for x in parts)
+            if len(parts) == 3 and all(x.isdigit() for x in parts)
+            else (999, 999, 999)
+        )
+
+    return sorted(versions, key=key)
@@ -0,0 +1,176 @@
+"""
+파이프라인 릴리즈 경로 (release --pipelined).
+
+순차 경로는 파일 작업마다 왕복 지연을 그대로 누적한다. 여기서는
+  1) 후보 정책과 current.yaml을 동시에 읽고
+  2) 모든 출력물을 policies/ 아래 staging 디렉터리에 병렬로 쓰고 fsync한 뒤
+     staging 디렉터리 자신도 fsync하고
+  3) rename 두 번(releases/<ver>, current.yaml)으로 확정하고
+  4) 디렉터리 fsync와 history append를 한 번에 처리한다.
+staging은 같은 파일시스템에 두므로 rename은 원자적이다.
+"""
+from __future__ import annotations
+import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+from .adjacent import ADJACENT_FILE, adjacent_json, link_archive_delta
+from .archive import (
+    HASH_FILE,
+    REPORT_FILE,
+    SNAPSHOT_FILE,
+    report_json,
+    write_alias,
+    write_release,
+)
+from .loader import load_composed, load_policy
+
+
+def _write_durable(path: Path, data: bytes) -> None:
+    # 쓰기와 fsync를 같은 fd로 처리 (다시 열지 않음). os.write는 일부만
+    # 쓰고 돌아올 수 있으므로 다 쓸 때까지 반복한다
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view) :]
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _fsync_file(path: Path) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _fsync_dir(path: Path) -> None:
+    # 디렉터리 fsync를 지원하지 않는 플랫폼(Windows)은 건너뜀
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def load_pair(
+    policy_path: str, current_file: str
+) -> Tuple[Dict[str, Any], List[Dict[str, str]], Dict[str, Any] | None]:
+    """
+    후보 정책(합성 조각 목록 포함)과 current.yaml(없으면 None)을 동시에 읽는다.
+    """
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        fut_new = ex.submit(load_composed, policy_path)
+        fut_cur = ex.submit(
+            lambda: load_policy(current_file) if Path(current_file).exists() else None
+        )
+        policy, fragments = fut_new.result()
+        return policy, fragments, fut_cur.result()
+
+
+def _run_parallel(tasks: List[Callable[[], Any]]) -> None:
+    with ThreadPoolExecutor(max_workers=len(tasks)) as ex:
+        for fut in [ex.submit(t) for t in tasks]:
+            fut.result()
+
+
+def commit_staged(
+    policies_dir: str,
+    releases_dir: str,
+    current_file: str,
+    history_file: str,
+    version: str,
+    policy_path: str,
+    policy: Dict[str, Any],
+    rep: Dict[str, Any],
+    content_hash: str,
+    history_line: str,
+    alias_of: str | None = None,
+    compact: bool = False,
+    base: str | None = None,
+    adjacent: Dict[str, Any] | None = None,
+) -> None:
+    """
+    릴리즈 출력물을 staging에 모두 쓴 뒤 최소한의 rename/fsync로 확정한다.
+    실패하면 staging을 지우고 예외를 그대로 올린다 (releases/, current.yaml 불변).
+    """
+    policies = Path(policies_dir)
+    releases = Path(releases_dir)
+    staging = Path(tempfile.mkdtemp(prefix=f".staging-{version}-", dir=policies))
+    cur_tmp = policies / f".current.yaml.{os.getpid()}.tmp"
+
+    # 원본은 한 번만 읽어 릴리즈 사본과 current.yaml에 함께 쓴다
+    with open(policy_path, "rb") as f:
+        source = f.read()
+
+    def stage_policy() -> None:
+        if alias_of is not None:
+            dest = write_alias(
+                releases_dir, version, alias_of, content_hash, dest_dir=staging
+            )
+        elif compact and base is not None:
+            dest = write_release(
+                releases_dir, version, policy, policy_path, base, dest_dir=staging
+            )
+        else:
+            _write_durable(staging / SNAPSHOT_FILE, source)
+            return
+        # delta가 체인 상한에 걸리면 스냅샷 복사가 일어날 수 있음
+        _fsync_file(dest)
+
+    def stage_report() -> None:
+        text = report_json(rep, compact=compact)
+        _write_durable(staging / REPORT_FILE, text.encode("utf-8"))
+
+    def stage_hash() -> None:
+        _write_durable(staging / HASH_FILE, (content_hash + "\n").encode("utf-8"))
+
+    def stage_current() -> None:
+        _write_durable(cur_tmp, source)
+
+    def stage_policy_and_adjacent() -> None:
+        stage_policy()
+        # adjacent는 staging의 delta를 참조할 수 있으므로 정책 파일 다음에 쓴다
+        if adjacent is not None:
+            text = adjacent_json(link_archive_delta(staging, adjacent))
+            _write_durable(staging / ADJACENT_FILE, text.encode("utf-8"))
+
+    try:
+        _run_parallel(
+            [stage_policy_and_adjacent, stage_report, stage_hash, stage_current]
+        )
+        # staging의 엔트리(파일 이름)를 먼저 확정한 뒤 옮긴다
+        _fsync_dir(staging)
+        releases.mkdir(parents=True, exist_ok=True)
+        os.rename(staging, releases / version)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        cur_tmp.unlink(missing_ok=True)
+        raise
+
+    os.replace(cur_tmp, current_file)
+
+    def append_history() -> None:
+        with open(history_file, "a", encoding="utf-8") as f:
+            f.write(history_line)
+            f.flush()
+            os.fsync(f.fileno())
+
+    _run_parallel(
+        [
+            lambda: _fsync_dir(releases),
+            lambda: _fsync_dir(policies),
+            append_history,
+        ]
+    )
@@ -0,0 +1,248 @@
+"""
+파일 기반 로컬 릴리즈 큐.
+
+policies/queue/
+  pending/<id>.json  + <id>.yaml   제출된 후보 (json이 생기면 제출 완료)
+  done/ superseded/ failed/        처리 결과 (json만 이동, 후보 yaml은 함께 이동)
+
+같은 target(저장소 루트)에 대해 대기 중인 후보는 검증을 통과한 가장 최근
+제출만 릴리즈하고, 그보다 먼저 제출된 것은 superseded로 합친다(coalescing).
+후보들은 target별로 묶어 한 번에 검증하고, 통과한 것만 cmd_release로 내보낸다.
+"""
+from __future__ import annotations
+import contextlib
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+from . import metrics
+from .loader import dump_policy, load_composed, load_policy
+from .model import CompiledPolicy, compile_policy
+from .validator import FindingTable, validate_findings
+
+QUEUE_DIR = "policies/queue"
+STATES = ("pending", "done", "superseded", "failed")
+
+
+def _dir(state: str, queue_dir: str = QUEUE_DIR) -> Path:
+    return Path(queue_dir) / state
+
+
+def _write_json_atomic(path: Path, obj: Dict[str, Any]) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(obj, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def submit(policy_path: str, target: str = ".", queue_dir: str = QUEUE_DIR) -> str:
+    """후보 정책을 큐에 복사해 넣고 id를 돌려준다 (원본이 나중에 바뀌어도 무관)."""
+    src = Path(policy_path)
+    if not src.exists():
+        raise FileNotFoundError(f"Policy not found: {policy_path}")
+
+    pending = _dir("pending", queue_dir)
+    pending.mkdir(parents=True, exist_ok=True)
+    entry_id = f"{time.time_ns():020d}-{os.getpid()}"
+    policy, fragments = load_composed(str(src))
+    if fragments:
+        # 조각의 상대 경로는 큐 안에서 깨지므로 풀어낸 정책을 저장
+        (pending / f"{entry_id}.yaml").write_text(dump_policy(policy), encoding="utf-8")
+    else:
+        shutil.copy2(src, pending / f"{entry_id}.yaml")
+    entry: Dict[str, Any] = {
+        "id": entry_id,
+        "target": os.path.abspath(target),
+        "source": str(src),
+        "submitted_at": time.time(),
+    }
+    if fragments:
+        # 큐의 yaml은 풀어낸 정책이라 릴리즈 시 조각 해시를 다시 알 수 없다
+        entry["fragments"] = fragments
+    _write_json_atomic(pending / f"{entry_id}.json", entry)
+    return entry_id
+
+
+def list_pending(queue_dir: str = QUEUE_DIR) -> List[Dict[str, Any]]:
+    pending = _dir("pending", queue_dir)
+    if not pending.exists():
+        return []
+    entries = []
+    for p in sorted(pending.glob("*.json")):
+        try:
+            entries.append(json.loads(p.read_text(encoding="utf-8")))
+        except ValueError:
+            continue  # 쓰는 중인 항목
+    return entries
+
+
+def _finish(
+    entry: Dict[str, Any], state: str, queue_dir: str, **fields: Any
+) -> Dict[str, Any]:
+    pending = _dir("pending", queue_dir)
+    dest = _dir(state, queue_dir)
+    dest.mkdir(parents=True, exist_ok=True)
+    entry = dict(entry, state=state, finished_at=time.time(), **fields)
+    yaml_src = pending / f"{entry['id']}.yaml"
+    if yaml_src.exists():
+        os.replace(yaml_src, dest / yaml_src.name)
+    _write_json_atomic(dest / f"{entry['id']}.json", entry)
+    (pending / f"{entry['id']}.json").unlink(missing_ok=True)
+    return entry
+
+
+def queue_stats(queue_dir: str = QUEUE_DIR, now: float | None = None) -> Dict[str, Any]:
+    entries = list_pending(queue_dir)
+    now = now or time.time()
+    waits = [now - e["submitted_at"] for e in entries]
+    targets: Dict[str, int] = {}
+    for e in entries:
+        targets[e["target"]] = targets.get(e["target"], 0) + 1
+    return {
+        "depth": len(entries),
+        "oldest_wait_seconds": round(max(waits), 3) if waits else 0.0,
+        "targets": targets,
+    }
+
+
+@contextlib.contextmanager
+def _in_root(root: str) -> Iterator[None]:
+    # cmd_release는 작업 디렉터리 기준 경로를 쓰므로 target 루트로 이동
+    prev = os.getcwd()
+    os.chdir(root)
+    try:
+        yield
+    finally:
+        os.chdir(prev)
+
+
+def _validate_batch(
+    entries: List[Dict[str, Any]], pending: Path
+) -> Tuple[List[Dict[str, Any]], List[CompiledPolicy | None]]:
+    """
+    후보를 한 번씩만 읽고 findings를 열 단위 표에 모아 요약을 돌려준다.
+    컴파일한 모델도 함께 돌려준다: findings가 모델에 캐시되어 있어
+    winner를 릴리즈할 때 다시 읽거나 검증하지 않는다.
+    """
+    table = FindingTable()
+    models: List[CompiledPolicy | None] = []
+    for e in entries:
+        path = pending / f"{e['id']}.yaml"
+        try:
+            model = compile_policy(load_policy(str(path)))
+            findings = validate_findings(model)
+            policy = model.raw
+        except Exception as ex:
+            model, policy, findings = None, {}, []
+            e["load_error"] = str(ex)
+        table.add(str(path), policy, findings)
+        models.append(model)
+    return table.policies, models
+
+
+def drain(
+    release_fn,
+    queue_dir: str = QUEUE_DIR,
+    max_batch: int | None = None,
+) -> List[Dict[str, Any]]:
+    """
+    대기 중인 후보를 한 번 처리한다.
+      1) target별 최신 제출을 한 번에 검증 (ERROR 후보는 failed). 실패한
+         target은 그다음으로 최근 후보를 다시 배치 검증한다
+      2) 검증을 통과한 후보(winner)보다 먼저 제출된 후보는 superseded
+      3) winner를 target 루트에서 release_fn으로 릴리즈
+    release_fn(policy_path, fragments, model)는 종료 코드(0=성공)를 돌려준다.
+    fragments는 제출 시 기록한 extends/include 조각 목록 (없으면 빈 리스트),
+    model은 1)에서 검증한 CompiledPolicy (findings 캐시 포함). target 디렉터리가 없거나
+    release_fn이 예외를 던지면 그 후보만 failed로 남기고 계속한다.
+    """
+    queue_dir = os.path.abspath(queue_dir)
+    entries = list_pending(queue_dir)
+    metrics.set_gauge("policyv_queue_depth", len(entries))
+    if not entries:
+        return []
+
+    by_target: Dict[str, List[Dict[str, Any]]] = {}
+    for e in entries:  # id 순서 = 제출 순서
+        by_target.setdefault(e["target"], []).append(e)
+    targets = sorted(by_target, key=lambda t: by_target[t][-1]["id"])
+    if max_batch:
+        targets = targets[:max_batch]
+
+    pending = _dir("pending", queue_dir)
+    results: List[Dict[str, Any]] = []
+    winners: Dict[str, Dict[str, Any]] = {}
+    models: Dict[str, CompiledPolicy] = {}
+    # 남은 후보 중 최신부터: 통과하는 후보가 나올 때까지 target별로 한 단계씩
+    remaining = {t: list(by_target[t]) for t in targets}
+    now = time.time()
+    while remaining:
+        batch = [cands.pop() for cands in remaining.values()]
+        summaries, compiled = _validate_batch(batch, pending)
+        for e, summary, model in zip(batch, summaries, compiled):
+            metrics.observe("policyv_queue_wait_seconds", now - e["submitted_at"])
+            if "load_error" in e:
+                results.append(
+                    _finish(e, "failed", queue_dir, reason=e.pop("load_error"))
+                )
+            elif not summary["ok"]:
+                results.append(
+                    _finish(
+                        e,
+                        "failed",
+                        queue_dir,
+                        reason="validation errors",
+                        summary=summary["summary"],
+                    )
+                )
+            else:
+                e["version"] = summary["version"]
+                winners[e["target"]] = e
+                models[e["target"]] = model
+        remaining = {
+            t: cands for t, cands in remaining.items() if cands and t not in winners
+        }
+
+    for t in targets:
+        winner = winners.get(t)
+        if winner is None:
+            continue
+        for e in by_target[t]:
+            if e["id"] < winner["id"]:
+                results.append(
+                    _finish(e, "superseded", queue_dir, superseded_by=winner["id"])
+                )
+
+        path = str(pending / f"{winner['id']}.yaml")
+        try:
+            with _in_root(winner["target"]):
+                rc = release_fn(path, winner.get("fragments") or [], models[t])
+        except Exception as ex:
+            results.append(
+                _finish(winner, "failed", queue_dir, reason=f"release error: {ex}")
+            )
+            continue
+        state = "done" if rc == 0 else "failed"
+        results.append(_finish(winner, state, queue_dir, rc=rc))
+
+    metrics.set_gauge("policyv_queue_depth", len(list_pending(queue_dir)))
+    return results
+
+
+def acquire_worker_lock(queue_dir: str = QUEUE_DIR):
+    """단일 워커 보장: 잠금 파일 핸들을 돌려주고, 이미 잡혀 있으면 None."""
+    Path(queue_dir).mkdir(parents=True, exist_ok=True)
+    f = open(Path(queue_dir) / ".worker.lock", "a+")
+    try:
+        import fcntl
+
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except ImportError:
+        pass  # fcntl 없는 플랫폼: 잠금 없이 진행
+    except OSError:
+        f.close()
+        return None
+    return f
+
@@ -0,0 +1,135 @@
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import yaml
+
+from . import metrics
+from .adjacent import recorded_risk
+from .archive import load_release
+from .diff import risk_flags_from_values, risk_values
+from .gate import _merge_gate_config, gate_decision, level_counts
+from .model import compile_policy
+
+# 각 후보 정책 자신의 release.gate로 판정하는 기준 열 이름
+POLICY_GATE = "policy"
+
+
+def load_gate_configs(path: str) -> List[Tuple[str, Dict[str, Any] | None]]:
+    """
+    gate 설정 파일 (YAML/JSON):
+      - 리스트: [{mode: hard}, {warn_score_block: 20}, ...]  -> 이름은 cfg0, cfg1, ...
+      - 매핑:   {strict: {mode: hard}, loose: {...}}
+    """
+    p = Path(path)
+    if not p.exists():
+        raise FileNotFoundError(f"Gate config not found: {path}")
+    data = yaml.safe_load(p.read_text(encoding="utf-8"))
+    if isinstance(data, dict):
+        return [(str(k), v) for k, v in data.items()]
+    if isinstance(data, list):
+        return [(f"cfg{i}", v) for i, v in enumerate(data)]
+    raise ValueError(f"Gate config must be a list or mapping: {path}")
+
+
+def _risk_and_gate(releases_dir: str, version: str) -> Tuple[Tuple[Any, ...], Any]:
+    # adjacent.json에 기록된 값이 있으면 정책을 재구성하지 않는다
+    recorded = recorded_risk(releases_dir, version)
+    if recorded is not None:
+        return recorded
+    cp = compile_policy(load_release(releases_dir, version))
+    return risk_values(cp), cp.gate
+
+
+def pair_counts(
+    releases_dir: str, versions: List[str]
+) -> List[Dict[str, Any]]:
+    """
+    인접 릴리즈 쌍마다 위험 flag를 레벨별 개수로 요약.
+    판정에는 flag만 쓰이므로 구조 diff는 하지 않고, 릴리즈마다 위험 검사 값을
+    한 번만 읽어 (adjacent.json 기록 또는 컴파일된 모델) 다음 쌍에서 재사용한다.
+    """
+    pairs: List[Dict[str, Any]] = []
+    prev = _risk_and_gate(releases_dir, versions[0])[0] if versions else None
+    for old_ver, new_ver in zip(versions, versions[1:]):
+        with metrics.timed("load"):
+            values, gate = _risk_and_gate(releases_dir, new_ver)
+        with metrics.timed("diff"):
+            flags = risk_flags_from_values(prev, values)
+        metrics.maybe_flush()
+        pairs.append(
+            {
+                "from": old_ver,
+                "to": new_ver,
+                "counts": level_counts(flags),
+                "policy_gate": gate,
+            }
+        )
+        prev = values
+    return pairs
+
+
+def replay(
+    pairs: List[Dict[str, Any]],
+    configs: List[Tuple[str, Dict[str, Any] | None]],
+) -> Dict[str, Any]:
+    """
+    (쌍 x 설정) 판정 행렬. 같은 flag 개수 조합은 설정마다 한 번만 판정하고
+    결과를 해당 쌍들에 뿌린다 (대부분의 쌍은 flag 조합이 몇 가지뿐).
+    """
+    merged = [(name, _merge_gate_config(g)) for name, g in configs]
+
+    # flag 개수 조합별로 쌍 인덱스 묶기
+    groups: Dict[Tuple[Tuple[str, int], ...], List[int]] = {}
+    for i, pr in enumerate(pairs):
+        key = tuple(sorted(pr["counts"].items()))
+        groups.setdefault(key, []).append(i)
+
+    n = len(pairs)
+    columns = [POLICY_GATE] + [name for name, _ in merged]
+    decisions: List[List[str]] = [[""] * len(columns) for _ in range(n)]
+    scores: List[List[int]] = [[0] * len(columns) for _ in range(n)]
+
+    for key, idxs in groups.items():
+        counts = dict(key)
+        for c, (_, gate) in enumerate(merged, start=1):
+            allowed, score, _ = gate_decision(counts, gate)
+            d = "ALLOW" if allowed else "BLOCK"
+            for i in idxs:
+                decisions[i][c] = d
+                scores[i][c] = score
+        # 기준 열: 각 후보 정책 자신의 gate (쌍마다 다를 수 있음)
+        for i in idxs:
+            allowed, score, _ = gate_decision(
+                counts, _merge_gate_config(pairs[i]["policy_gate"])
+            )
+            decisions[i][0] = "ALLOW" if allowed else "BLOCK"
+            scores[i][0] = score
+
+    blocked = {
+        col: sum(1 for row in decisions if row[c] == "BLOCK")
+        for c, col in enumerate(columns)
+    }
+    return {
+        "pairs": [{"from": p["from"], "to": p["to"]} for p in pairs],
+        "configs": columns,
+        "decisions": decisions,
+        "scores": scores,
+        "blocked": blocked,
+    }
+
+
+def format_matrix(result: Dict[str, Any]) -> str:
+    cols = result["configs"]
+    width = max([len(c) for c in cols] + [11])
+    label_w = max([len(f"{p['from']} -> {p['to']}") for p in result["pairs"]] + [4])
+    lines = ["pair".ljust(label_w) + "  " + "  ".join(c.rjust(width) for c in cols)]
+    for p, ds, ss in zip(result["pairs"], result["decisions"], result["scores"]):
+        cells = [f"{d}({s})".rjust(width) for d, s in zip(ds, ss)]
+        lines.append(f"{p['from']} -> {p['to']}".ljust(label_w) + "  " + "  ".join(cells))
+    lines.append(
+        "blocked".ljust(label_w)
+        + "  "
+        + "  ".join(str(result["blocked"][c]).rjust(width) for c in cols)
+    )
+    return "\n".join(lines)
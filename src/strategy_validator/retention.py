@@ -0,0 +1,80 @@
+from __future__ import annotations
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+# history.log에서 live 버전을 바꾸는 action
+LIVE_ACTIONS = ("release", "rollback", "alias")
+
+Event = Tuple[datetime, str, str]  # (timestamp, action, version)
+
+
+def parse_history(path: str | Path) -> List[Event]:
+    """history.log 한 줄: '<ts>\\t<action>\\t<version>[\\t...]'. 깨진 줄은 건너뛴다."""
+    p = Path(path)
+    if not p.exists():
+        return []
+    events: List[Event] = []
+    with open(p, "r", encoding="utf-8") as f:
+        for line in f:
+            parts = line.rstrip("\n").split("\t")
+            if len(parts) < 3:
+                continue
+            try:
+                ts = datetime.fromisoformat(parts[0])
+            except ValueError:
+                continue
+            events.append((ts, parts[1], parts[2]))
+    return events
+
+
+def live_since(events: List[Event], since: datetime) -> Set[str]:
+    """since 이후 한 번이라도 live(current)였던 버전 집합."""
+    live: Set[str] = set()
+    before: str | None = None
+    for ts, action, version in events:
+        if action not in LIVE_ACTIONS:
+            continue
+        if ts < since:
+            before = version
+        else:
+            live.add(version)
+    # 구간 시작 시점에 live였던 버전
+    if before is not None:
+        live.add(before)
+    return live
+
+
+def load_tags(path: str | Path) -> Dict[str, str]:
+    p = Path(path)
+    if not p.exists():
+        return {}
+    return json.loads(p.read_text(encoding="utf-8"))
+
+
+def select_prunable(
+    versions: List[str],
+    current: str | None,
+    events: List[Event],
+    tags: Dict[str, str],
+    keep_last: int | None = None,
+    keep_days: float | None = None,
+    keep_tagged: bool = False,
+    now: datetime | None = None,
+) -> List[str]:
+    """
+    보존 규칙 중 하나라도 해당하면 유지, 나머지는 삭제 대상 (versions 순서 유지).
+    current 버전은 규칙과 무관하게 항상 유지한다.
+    """
+    keep: Set[str] = set()
+    if current:
+        keep.add(current)
+    if keep_last:
+        keep.update(versions[-keep_last:])
+    if keep_days is not None:
+        since = (now or datetime.now()) - timedelta(days=keep_days)
+        keep.update(live_since(events, since))
+    if keep_tagged:
+        keep.update(tags.values())
+    return [v for v in versions if v not in keep]
@@ -1,18 +1,42 @@
 from __future__ import annotations
+import sys
+from array import array
 from dataclasses import dataclass
 from typing import Any, Dict, List
 
 from .errors import RULES
+from .lookback import (
+    budget_violations,
+    check_budget,
+    check_indicators,
+    estimate_warmup,
+    parse_timeframe,
+    resolve_indicators,
+)
+from .model import CompiledPolicy
 
 
-@dataclass
+@dataclass(slots=True)
 class Finding:
     code: str
     severity: str  # "ERROR" | "WARN"
-    message: str
     path: str = ""
     detail: str = ""
 
+    @property
+    def message(self) -> str:
+        # 메시지는 RULES에 한 번만 두고 참조
+        return RULES[self.code]["message"]
+
+    def as_dict(self) -> Dict[str, str]:
+        return {
+            "code": self.code,
+            "severity": self.severity,
+            "message": self.message,
+            "path": self.path,
+            "detail": self.detail,
+        }
+
 
 def _add(findings: List[Finding], code: str, path: str = "", detail: str = "") -> None:
     r = RULES[code]
@@ -20,14 +44,89 @@ def _add(findings: List[Finding], code: str, path: str = "", detail: str = "") -
         Finding(
             code=code,
             severity=r["severity"],
-            message=r["message"],
-            path=path,
-            detail=detail,
+            path=sys.intern(path),
+            detail=sys.intern(detail),
         )
     )
 
 
-def validate_report(policy: Dict[str, Any]) -> Dict[str, Any]:
+def validate_report(policy: Dict[str, Any] | CompiledPolicy) -> Dict[str, Any]:
+    return build_report(policy, validate_findings(policy))
+
+
+def build_report(
+    policy: Dict[str, Any] | CompiledPolicy, findings: List[Finding]
+) -> Dict[str, Any]:
+    """이미 계산한 findings로 리포트를 만든다 (다시 검증하지 않음)."""
+    if isinstance(policy, CompiledPolicy):
+        version = policy.version
+        warmup = _compiled_warmup(policy)
+    else:
+        version = (policy.get("meta") or {}).get("policy_version")
+        warmup = warmup_estimate(policy)
+
+    errors = [f for f in findings if f.severity == "ERROR"]
+    warnings = [f for f in findings if f.severity == "WARN"]
+
+    rep = {
+        "ok": len(errors) == 0,
+        "version": version,
+        "summary": {"errors": len(errors), "warnings": len(warnings)},
+        "errors": [f.as_dict() for f in errors],
+        "warnings": [f.as_dict() for f in warnings],
+    }
+    if warmup is not None:
+        rep["warmup"] = warmup
+    return rep
+
+
+def _timeframes(policy: Dict[str, Any]) -> Dict[str, Any] | None:
+    try:
+        tf = policy["inputs"]["data"]["timeframe"]
+    except (KeyError, TypeError):
+        return None
+    return tf if isinstance(tf, dict) else None
+
+
+def warmup_estimate(
+    policy: Dict[str, Any], resolved: List[Any] | None = None
+) -> Dict[str, Any] | None:
+    """timeframe이 모두 해석되면 warm-up 추정치, 아니면 None (V004가 따로 보고)."""
+    tf = _timeframes(policy)
+    if not tf:
+        return None
+    indicators = (policy.get("inputs") or {}).get("indicators") or []
+    try:
+        return estimate_warmup(tf, indicators, resolved)
+    except ValueError:
+        return None
+
+
+def _compiled_indicators(cp: CompiledPolicy) -> Any:
+    # (형식 문제, (lookback, timeframe) 목록): 검증과 warm-up 추정이 공유
+    return cp.cached(
+        "indicators",
+        lambda: resolve_indicators((cp.raw.get("inputs") or {}).get("indicators")),
+    )
+
+
+def _compiled_warmup(cp: CompiledPolicy) -> Dict[str, Any] | None:
+    def estimate() -> Dict[str, Any] | None:
+        problems, resolved = _compiled_indicators(cp)
+        return warmup_estimate(cp.raw, None if problems else resolved)
+
+    return cp.cached("warmup", estimate)
+
+
+def validate_findings(policy: Dict[str, Any] | CompiledPolicy) -> List[Finding]:
+    if isinstance(policy, CompiledPolicy):
+        cp = policy
+        return cp.cached("findings", lambda: _validate(cp.raw, cp))
+    return _validate(policy, None)
+
+
+def _validate(policy: Dict[str, Any], cp: CompiledPolicy | None) -> List[Finding]:
+    # cp가 있으면 지표 lookback과 warm-up 추정을 모델에 캐시해 리포트와 공유
     findings: List[Finding] = []
 
     # Rule 1: Completeness
@@ -58,17 +157,18 @@ def validate_report(policy: Dict[str, Any]) -> Dict[str, Any]:
             )
 
     # Rule 4: Timeframe Consistency
-    try:
-        tf = policy["inputs"]["data"]["timeframe"]
-        if "primary" not in tf or "confirm" not in tf:
-            _add(
-                findings,
-                "V004",
-                path="$.inputs.data.timeframe",
-                detail="primary/confirm missing",
-            )
-    except Exception:
+    tf = _timeframes(policy)
+    if tf is None:
         _add(findings, "V004", path="$.inputs.data.timeframe", detail="missing path")
+    elif "primary" not in tf or "confirm" not in tf:
+        _add(
+            findings,
+            "V004",
+            path="$.inputs.data.timeframe",
+            detail="primary/confirm missing",
+        )
+    else:
+        _check_timeframes(findings, policy, tf, cp)
 
     # Rule 5: Execution Realism (WARN by default)
     if "execution" in policy:
@@ -88,19 +188,148 @@ def validate_report(policy: Dict[str, Any]) -> Dict[str, Any]:
                 findings, "V006", path="$.failsafe.on_data_disconnect", detail="missing"
             )
 
-    meta = policy.get("meta") or {}
-    version = meta.get("policy_version")
+    return findings
 
-    errors = [f for f in findings if f.severity == "ERROR"]
-    warnings = [f for f in findings if f.severity == "WARN"]
 
-    return {
-        "ok": len(errors) == 0,
-        "version": version,
-        "summary": {"errors": len(errors), "warnings": len(warnings)},
-        "errors": [f.__dict__ for f in errors],
-        "warnings": [f.__dict__ for f in warnings],
-    }
+def _check_timeframes(
+    findings: List[Finding],
+    policy: Dict[str, Any],
+    tf: Dict[str, Any],
+    cp: CompiledPolicy | None,
+) -> None:
+    # timeframe 해석 / confirm 배수 관계 (V004), 지표·예산 형식 (V008), warm-up 예산 초과 (V007)
+    inputs = policy.get("inputs") or {}
+    budget = (inputs.get("data") or {}).get("warmup_budget")
+    if cp is None:
+        problems = check_indicators(inputs.get("indicators"))
+    else:
+        problems = _compiled_indicators(cp)[0]
+    malformed = [(f"$.inputs.indicators{rel}", detail) for rel, detail in problems]
+    if budget is not None:
+        malformed += [
+            (f"$.inputs.data.warmup_budget{'.' + key if key else ''}", detail)
+            for key, detail in check_budget(budget)
+        ]
+    for path, detail in malformed:
+        _add(findings, "V008", path=path, detail=detail)
+
+    seconds: Dict[str, int] = {}
+    for k, v in tf.items():
+        try:
+            seconds[k] = parse_timeframe(v)
+        except ValueError:
+            _add(
+                findings,
+                "V004",
+                path=f"$.inputs.data.timeframe.{k}",
+                detail=f"invalid: {v}",
+            )
+    if len(seconds) != len(tf):
+        return
+    if seconds["confirm"] % seconds["primary"] != 0:
+        _add(
+            findings,
+            "V004",
+            path="$.inputs.data.timeframe.confirm",
+            detail=f"{tf['confirm']} is not a multiple of primary {tf['primary']}",
+        )
+
+    if malformed or not budget:
+        return
+    est = warmup_estimate(policy) if cp is None else _compiled_warmup(cp)
+    if est is None:
+        return
+    for key, detail in budget_violations(est, budget):
+        _add(
+            findings, "V007", path=f"$.inputs.data.warmup_budget.{key}", detail=detail
+        )
+
+
+class FindingTable:
+    """
+    여러 정책의 findings를 열 단위 배열로 모으는 표 (배치 검증용).
+    code/path는 표에 한 번만 저장하고 행은 인덱스만 가진다.
+    """
+
+    __slots__ = (
+        "policies",
+        "codes",
+        "paths",
+        "details",
+        "_code_idx",
+        "_path_idx",
+        "_detail_idx",
+        "col_policy",
+        "col_code",
+        "col_path",
+        "col_detail",
+    )
+
+    def __init__(self) -> None:
+        self.policies: List[Dict[str, Any]] = []
+        self.codes: List[str] = []
+        self.paths: List[str] = []
+        self.details: List[str] = []
+        self._code_idx: Dict[str, int] = {}
+        self._path_idx: Dict[str, int] = {}
+        self._detail_idx: Dict[str, int] = {}
+        self.col_policy = array("I")
+        self.col_code = array("H")
+        self.col_path = array("I")
+        self.col_detail = array("I")
+
+    @staticmethod
+    def _intern(table: List[str], index: Dict[str, int], value: str) -> int:
+        i = index.get(value)
+        if i is None:
+            i = index[value] = len(table)
+            table.append(value)
+        return i
+
+    def add(self, source: str, policy: Dict[str, Any], findings: List[Finding]) -> None:
+        pi = len(self.policies)
+        errors = warnings = 0
+        for f in findings:
+            self.col_policy.append(pi)
+            self.col_code.append(self._intern(self.codes, self._code_idx, f.code))
+            self.col_path.append(self._intern(self.paths, self._path_idx, f.path))
+            self.col_detail.append(
+                self._intern(self.details, self._detail_idx, f.detail)
+            )
+            if f.severity == "ERROR":
+                errors += 1
+            elif f.severity == "WARN":
+                warnings += 1
+        self.policies.append(
+            {
+                "source": source,
+                "version": (policy.get("meta") or {}).get("policy_version"),
+                "ok": errors == 0,
+                "summary": {"errors": errors, "warnings": warnings},
+            }
+        )
+
+    def __len__(self) -> int:
+        return len(self.col_code)
+
+    def to_columnar(self) -> Dict[str, Any]:
+        return {
+            "format": "columnar/1",
+            "rules": {
+                c: {"severity": RULES[c]["severity"], "message": RULES[c]["message"]}
+                for c in self.codes
+            },
+            "codes": list(self.codes),
+            "paths": list(self.paths),
+            "details": list(self.details),
+            "policies": self.policies,
+            "findings": {
+                "policy": self.col_policy.tolist(),
+                "code": self.col_code.tolist(),
+                "path": self.col_path.tolist(),
+                "detail": self.col_detail.tolist(),
+            },
+        }
 
 
 # 기존 validate() 호환: ERROR 있으면 예외처럼 동작시키고 싶을 때 사용
@@ -0,0 +1,331 @@
+"""
+릴리즈 아카이브 무결성 검사 (verify).
+
+  1) releases/ 아래 모든 파일과 current.yaml을 병렬로 sha256 (큰 파일은 mmap)하고
+     지난 검사의 manifest와 대조: size/mtime이 그대로인데 내용이 다르면 문제
+  2) 릴리즈마다 정책 재구성, report.json 버전, content.sha256 대조
+  3) current.yaml이 알려진 릴리즈와 같은지
+  4) history.log를 처음부터 재생해 릴리즈 목록 / current와 맞는지
+
+상태 파일(manifest)에는 지난 검사에서 통과한 파일의 (size, mtime, sha256)을
+남긴다. incremental 모드는 size/mtime이 바뀐 파일만 다시 해시하고, 파일
+목록이나 내용이 manifest와 다른 릴리즈(와 그 릴리즈를 base로 쓰는 릴리즈)만
+다시 검사한다. current.yaml / history.log 교차 검사는 항상 수행한다.
+"""
+from __future__ import annotations
+import hashlib
+import json
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from .archive import (
+    HASH_FILE,
+    REPORT_FILE,
+    SNAPSHOT_FILE,
+    _read_alias,
+    is_alias,
+    load_release,
+    read_hash,
+    release_base,
+    release_exists,
+)
+from .hashing import canonical_hash
+from .loader import load_policy
+from .paths import (
+    CURRENT_FILE,
+    HISTORY_FILE,
+    POLICIES_DIR,
+    RELEASES_DIR,
+    list_versions,
+)
+from .retention import LIVE_ACTIONS, parse_history
+
+STATE_FILE = f"{POLICIES_DIR}/.verify_state.json"
+
+# 이 크기 이상은 mmap으로 읽어 해시 (큰 파일을 한 번에 메모리로 복사하지 않음)
+MMAP_THRESHOLD = 1 << 20
+READ_CHUNK = 1 << 16
+
+Stat = Tuple[int, int]  # (size, mtime_ns)
+
+
+def sha256_file(path: str | Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                h.update(m)
+        else:
+            for chunk in iter(lambda: f.read(READ_CHUNK), b""):
+                h.update(chunk)
+    return h.hexdigest()
+
+
+def hash_blobs(paths: List[Path], workers: int = 8) -> Dict[Path, str]:
+    """파일 해시를 병렬 계산 (hashlib은 큰 버퍼에서 GIL을 놓는다)."""
+    if not paths:
+        return {}
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(paths)))) as ex:
+        return dict(zip(paths, ex.map(sha256_file, paths)))
+
+
+def _stat(p: Path) -> Stat:
+    st = p.stat()
+    return (st.st_size, st.st_mtime_ns)
+
+
+def _load_state(path: Path) -> Dict[str, Any]:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return {"files": {}}
+
+
+def _save_state(path: Path, state: Dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(state, indent=1, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _check_release(
+    releases_dir: Path, version: str, problems: List[Dict[str, str]]
+) -> str | None:
+    """릴리즈 하나를 검사하고 content hash를 돌려준다 (재구성 실패 시 None)."""
+
+    def bad(check: str, detail: str) -> None:
+        problems.append({"version": version, "check": check, "detail": detail})
+
+    if not release_exists(releases_dir, version):
+        bad("policy", "no policy.yaml / policy.delta.json / alias.json")
+        return None
+    try:
+        policy = load_release(releases_dir, version)
+    except Exception as e:
+        bad("policy", f"cannot reconstruct: {e}")
+        return None
+
+    alias = is_alias(releases_dir, version)
+    content_hash = canonical_hash(policy)
+    if not alias:
+        pv = (policy.get("meta") or {}).get("policy_version")
+        if pv != version:
+            bad("policy", f"meta.policy_version {pv!r} != release {version!r}")
+    elif _read_alias(releases_dir, version).get("content_hash") not in (
+        None,
+        content_hash,
+    ):
+        bad("alias", "alias.json content_hash does not match target")
+
+    d = releases_dir / version
+    stored = read_hash(releases_dir, version)
+    if stored is not None and stored != content_hash:
+        bad("hash", f"{HASH_FILE} does not match policy content")
+
+    try:
+        report = json.loads((d / REPORT_FILE).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        bad("report", f"{REPORT_FILE} missing")
+        return content_hash
+    except ValueError as e:
+        bad("report", f"{REPORT_FILE} unreadable: {e}")
+        return content_hash
+    if report.get("version") != version:
+        bad("report", f"report version {report.get('version')!r} != {version!r}")
+    if report.get("content_hash") not in (None, content_hash):
+        bad("report", "report content_hash does not match policy content")
+    return content_hash
+
+
+def _replay_history(
+    history_file: Path,
+    versions: List[str],
+    current: str | None,
+    problems: List[Dict[str, str]],
+) -> Dict[str, Any]:
+    """history.log를 재생해 릴리즈 목록과 live 버전을 재구성하고 대조."""
+
+    def bad(version: str, detail: str) -> None:
+        problems.append({"version": version, "check": "history", "detail": detail})
+
+    known: set[str] = set()
+    live: str | None = None
+    events = parse_history(history_file)
+    for _, action, v in events:
+        if action in ("release", "alias"):
+            if v in known:
+                bad(v, f"{action} of an existing version")
+            known.add(v)
+        elif action == "rollback" and v not in known:
+            bad(v, "rollback to a version never released")
+        elif action == "gc":
+            if v == live:
+                bad(v, "gc removed the live version")
+            known.discard(v)
+        if action in LIVE_ACTIONS:
+            live = v
+
+    on_disk = set(versions)
+    for v in sorted(known - on_disk):
+        bad(v, "released in history but missing from releases/")
+    for v in sorted(on_disk - known):
+        bad(v, "in releases/ but not in history")
+    if events and live != current:
+        bad(str(current), f"current.yaml is {current!r}, history says {live!r}")
+    return {"events": len(events), "live": live}
+
+
+def verify_archive(
+    root: str | Path = ".",
+    workers: int = 8,
+    incremental: bool = False,
+    state_file: str | Path | None = None,
+) -> Dict[str, Any]:
+    root = Path(root)
+    releases_dir = root / RELEASES_DIR
+    current_file = root / CURRENT_FILE
+    state_path = Path(state_file) if state_file else root / STATE_FILE
+    versions = list_versions(releases_dir)
+
+    files: Dict[str, List[Path]] = {
+        v: sorted(p for p in (releases_dir / v).iterdir() if p.is_file())
+        for v in versions
+    }
+    # 지난 검사에서 통과한 파일의 (size, mtime_ns, sha256) 목록 = 기록된 manifest
+    prev_files = _load_state(state_path)["files"]
+
+    def rel(p: Path) -> str:
+        return p.relative_to(root).as_posix()
+
+    prefix = rel(releases_dir) + "/"
+    prev_sets: Dict[str, set[str]] = {}
+    for r in prev_files:
+        if r.startswith(prefix):
+            v = r[len(prefix) :].partition("/")[0]
+            prev_sets.setdefault(v, set()).add(r)
+
+    # 1) 해시: incremental이면 stat이 바뀌었거나 새 파일만, 아니면 전부
+    stats = {p: _stat(p) for ps in files.values() for p in ps}
+    todo = [
+        p
+        for p, st in stats.items()
+        if not incremental
+        or rel(p) not in prev_files
+        or tuple(prev_files[rel(p)][:2]) != st
+    ]
+    if current_file.exists():
+        todo.append(current_file)
+    blobs = hash_blobs(todo, workers)
+
+    problems: List[Dict[str, str]] = []
+    failed: set[str] = set()
+    # 내용이 manifest와 다른 파일. stat이 그대로인데 내용이 다르면
+    # (mtime을 보존한 수정, 디스크 손상) 그 자체로 문제로 보고한다
+    changed: set[Path] = set()
+    for v in versions:
+        for p in files[v]:
+            if p not in blobs:
+                continue
+            rec = prev_files.get(rel(p))
+            if rec is None or rec[2] != blobs[p]:
+                changed.add(p)
+            if rec is not None and rec[2] != blobs[p] and tuple(rec[:2]) == stats[p]:
+                problems.append(
+                    {
+                        "version": v,
+                        "check": "blob",
+                        "detail": f"{p.name} content changed but size/mtime did not",
+                    }
+                )
+                failed.add(v)
+
+    # 2) 릴리즈 검사: 파일 목록이나 내용이 바뀌었거나 base가 다시 검사된 릴리즈만
+    dirty: set[str] = set()
+    for v in versions:
+        base = None
+        if release_exists(releases_dir, v):
+            base = release_base(releases_dir, v)
+        if (
+            not incremental
+            or not files[v]
+            or {rel(p) for p in files[v]} != prev_sets.get(v, set())
+            or any(p in changed for p in files[v])
+            or (base is not None and base in dirty)
+        ):
+            dirty.add(v)
+
+    hashes: Dict[str, str] = {}
+    for v in versions:
+        if v in dirty:
+            n = len(problems)
+            h = _check_release(releases_dir, v, problems)
+            if len(problems) > n:
+                failed.add(v)
+        else:
+            h = read_hash(releases_dir, v)
+        if h is not None:
+            hashes[v] = h
+
+    # 3) current.yaml: 바이트가 같은 스냅샷이 있으면 바로 통과, 아니면 내용 해시로
+    current = None
+    if current_file.exists():
+        try:
+            cur_policy = load_policy(str(current_file))
+            current = (cur_policy.get("meta") or {}).get("policy_version")
+        except Exception as e:
+            problems.append({"version": "", "check": "current", "detail": str(e)})
+            cur_policy = None
+        snap = releases_dir / str(current) / SNAPSHOT_FILE
+        snap_blob = blobs.get(snap) or prev_files.get(rel(snap), [None] * 3)[2]
+        if current in versions and current not in hashes and current not in failed:
+            # content.sha256가 없는 예전 릴리즈
+            hashes[current] = canonical_hash(load_release(releases_dir, current))
+        if cur_policy is not None and snap_blob != blobs[current_file]:
+            if current not in hashes:
+                problems.append(
+                    {
+                        "version": str(current),
+                        "check": "current",
+                        "detail": "current.yaml version is not a known release",
+                    }
+                )
+            elif hashes[current] != canonical_hash(cur_policy):
+                problems.append(
+                    {
+                        "version": str(current),
+                        "check": "current",
+                        "detail": "current.yaml content differs from its release",
+                    }
+                )
+
+    # 4) history.log 재생
+    history = _replay_history(root / HISTORY_FILE, versions, current, problems)
+
+    # 통과한 릴리즈의 파일만 상태에 남긴다 (실패한 것은 다음에 다시 검사).
+    # 내용이 몰래 바뀐 파일은 기록을 유지해 full 검사에서 계속 보고되게 한다
+    new_state: Dict[str, List[Any]] = {}
+    for v in versions:
+        for p in files[v]:
+            r = rel(p)
+            rec = prev_files.get(r)
+            if rec is not None and tuple(rec[:2]) == stats[p]:
+                if v not in failed or rec[2] != blobs.get(p, rec[2]):
+                    new_state[r] = list(rec)
+            elif v not in failed:
+                new_state[r] = [*stats[p], blobs[p]]
+    _save_state(state_path, {"files": new_state})
+
+    return {
+        "ok": not problems,
+        "releases": len(versions),
+        "checked": sorted(dirty, key=versions.index),
+        "files_hashed": len(blobs),
+        "current": current,
+        "history": history,
+        "problems": problems,
+    }
+
@@ -0,0 +1,117 @@
+import json
+from pathlib import Path
+
+from strategy_validator.archive import (
+    DELTA_FILE,
+    apply_delta,
+    load_release,
+    make_delta,
+)
+from strategy_validator.cli import (
+    RELEASES_DIR,
+    CURRENT_FILE,
+    cmd_compact,
+    cmd_release,
+    cmd_rollback,
+)
+from strategy_validator.loader import load_policy
+from tests.helpers import write_policy
+
+
+def test_delta_roundtrip():
+    old = {"a": {"b": 1, "c": [1, 2]}, "d": "x"}
+    new = {"a": {"b": 2, "c": [1, 2, 3]}, "e": {"f": True}}
+    ops = make_delta(old, new)
+    assert apply_delta(old, ops) == new
+    # base는 변경되지 않아야 함
+    assert old["a"]["b"] == 1
+
+
+def test_delta_release_and_rollback(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    for v in ("0.1.0", "0.2.0", "0.3.0"):
+        p = write_policy(tmp_path, v)
+        assert cmd_release(str(p), False, False, None, archive="delta") == 0
+
+    assert Path(RELEASES_DIR, "0.1.0", "policy.yaml").exists()
+    assert Path(RELEASES_DIR, "0.3.0", DELTA_FILE).exists()
+    assert not Path(RELEASES_DIR, "0.3.0", "policy.yaml").exists()
+
+    rel = load_release(RELEASES_DIR, "0.3.0")
+    assert rel["meta"]["policy_version"] == "0.3.0"
+
+    assert cmd_rollback("0.2.0") == 0
+    assert load_policy(CURRENT_FILE)["meta"]["policy_version"] == "0.2.0"
+
+
+def test_compact_converts_existing_archive(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+
+    for v in ("0.1.0", "0.2.0", "0.3.0"):
+        p = write_policy(tmp_path, v)
+        assert cmd_release(str(p), False, False, None) == 0
+    capsys.readouterr()
+
+    assert cmd_compact(snapshot_every=8, json_out=False) == 0
+    out = capsys.readouterr().out
+    assert "COMPACTED: 2/3 releases" in out
+
+    assert Path(RELEASES_DIR, "0.2.0", DELTA_FILE).exists()
+    assert load_release(RELEASES_DIR, "0.2.0")["meta"]["policy_version"] == "0.2.0"
+
+    assert cmd_rollback(None) == 0
+    assert load_policy(CURRENT_FILE)["meta"]["policy_version"] == "0.2.0"
+
+
+def test_delta_mode_first_report_is_summarized(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    p = Path(__file__).resolve().parents[1] / "policy.yaml"
+    assert cmd_release(str(p), False, False, None, archive="delta") == 0
+
+    d = Path(RELEASES_DIR, "0.1.1")
+    rep = json.loads((d / "report.json").read_text(encoding="utf-8"))
+    assert rep["diff"]["added"]["ref"] == "policy"
+    assert rep["diff"]["added"]["count"] > 20
+    assert (d / "report.json").stat().st_size < (d / "policy.yaml").stat().st_size
+
+
+def _write_sized(tmp_path, version, extra):
+    p = write_policy(tmp_path, version)
+    p.write_text(p.read_text(encoding="utf-8") + extra, encoding="utf-8")
+    return p
+
+
+INT_KEYED = [
+    ("0.1.0", "sizing:\n  1: 0.5\n  2: 0.7\n"),
+    ("0.2.0", "sizing:\n  1: 0.6\n  2: 0.7\n"),
+    ("0.3.0", "sizing:\n  1: 0.6\n  2: 0.7\nlevels:\n  3: {1: tight}\n"),
+]
+
+
+def test_delta_mode_preserves_int_mapping_keys(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for v, extra in INT_KEYED:
+        p = _write_sized(tmp_path, v, extra)
+        assert cmd_release(str(p), False, False, None, archive="delta") == 0
+
+    # 경로의 int 키는 JSON delta로 보존, int 키 mapping 값이 새로 생기면 스냅샷
+    assert Path(RELEASES_DIR, "0.2.0", DELTA_FILE).exists()
+    assert Path(RELEASES_DIR, "0.3.0", "policy.yaml").exists()
+    assert load_release(RELEASES_DIR, "0.2.0")["sizing"] == {1: 0.6, 2: 0.7}
+    assert load_release(RELEASES_DIR, "0.3.0")["levels"] == {3: {1: "tight"}}
+
+    assert cmd_rollback("0.2.0") == 0
+    assert load_policy(CURRENT_FILE)["sizing"] == {1: 0.6, 2: 0.7}
+
+
+def test_compact_preserves_int_mapping_keys(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for v, extra in INT_KEYED:
+        p = _write_sized(tmp_path, v, extra)
+        assert cmd_release(str(p), False, False, None) == 0
+    assert cmd_compact(snapshot_every=8, json_out=False) == 0
+
+    for v, _ in INT_KEYED:
+        expected = load_policy(str(tmp_path / f"policy_{v}.yaml"))
+        assert load_release(RELEASES_DIR, v) == expected
@@ -0,0 +1,153 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from strategy_validator import loader
+from strategy_validator.cli import CURRENT_FILE, RELEASES_DIR, cmd_release
+from strategy_validator.loader import (
+    PolicyCompositionError,
+    deep_merge,
+    load_composed,
+    load_policy,
+)
+from tests.helpers import write_policy
+
+BASE = """\
+risk:
+  per_trade_loss_pct: 1.0
+  daily_loss_limit_pct: 2.0
+execution:
+  order_type: "market"
+  costs: {fee_pct: 0.01, slippage_pct: 0.01}
+failsafe:
+  on_api_error: "close_positions"
+  on_data_disconnect: "halt_trading"
+"""
+
+STRATEGY = """\
+extends: shared/base.yaml
+include: [shared/costs_high.yaml]
+meta:
+  policy_version: "{version}"
+inputs:
+  data:
+    timeframe: {{primary: "5m", confirm: "20m"}}
+entry:
+  trigger: {{description: "x", checklist: ["a"]}}
+exit:
+  stop_loss_pct: 1.0
+risk:
+  per_trade_loss_pct: 0.5
+"""
+
+
+def _fleet(tmp_path, n=3):
+    shared = tmp_path / "shared"
+    shared.mkdir()
+    (shared / "base.yaml").write_text(BASE, encoding="utf-8")
+    (shared / "costs_high.yaml").write_text(
+        "execution:\n  costs:\n    slippage_pct: 0.05\n", encoding="utf-8"
+    )
+    paths = []
+    for i in range(n):
+        p = tmp_path / f"s{i}.yaml"
+        p.write_text(STRATEGY.format(version=f"0.{i + 1}.0"), encoding="utf-8")
+        paths.append(p)
+    return paths
+
+
+def test_deep_merge_is_deterministic():
+    base = {"a": {"x": 1, "y": [1, 2]}, "b": 1}
+    over = {"a": {"y": [3], "z": 0}, "c": None}
+    merged = deep_merge(base, over)
+    assert merged == {"a": {"x": 1, "y": [3], "z": 0}, "b": 1, "c": None}
+    assert list(merged["a"]) == ["x", "y", "z"]
+    assert base == {"a": {"x": 1, "y": [1, 2]}, "b": 1}
+
+
+def test_extends_and_include_resolve(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (p,) = _fleet(tmp_path, 1)
+    policy, fragments = load_composed(str(p))
+
+    assert "extends" not in policy and "include" not in policy
+    assert policy["risk"] == {"per_trade_loss_pct": 0.5, "daily_loss_limit_pct": 2.0}
+    assert policy["execution"]["costs"] == {"fee_pct": 0.01, "slippage_pct": 0.05}
+    assert [f["path"] for f in fragments] == [
+        "shared/base.yaml",
+        "shared/costs_high.yaml",
+    ]
+    assert all(len(f["sha256"]) == 64 for f in fragments)
+
+
+def test_shared_fragments_parsed_once(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    paths = _fleet(tmp_path, 5)
+    loader.clear_fragment_cache()
+
+    calls = []
+    real = loader.yaml.safe_load
+    monkeypatch.setattr(loader.yaml, "safe_load", lambda s: calls.append(1) or real(s))
+    policies = [load_policy(str(p)) for p in paths]
+    # 전략 5개 + 공유 조각 2개
+    assert len(calls) == 7
+    # 캐시된 조각을 공유하지 않는다 (한 정책 수정이 다른 정책에 번지지 않음)
+    policies[0]["failsafe"]["on_api_error"] = "ignore"
+    assert policies[1]["failsafe"]["on_api_error"] == "close_positions"
+
+
+def test_cycle_raises(tmp_path):
+    (tmp_path / "a.yaml").write_text("extends: b.yaml\nx: 1\n", encoding="utf-8")
+    (tmp_path / "b.yaml").write_text("include: [a.yaml]\ny: 2\n", encoding="utf-8")
+    with pytest.raises(PolicyCompositionError, match="cycle"):
+        load_policy(str(tmp_path / "a.yaml"))
+
+
+def test_release_stores_resolved_policy(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (p,) = _fleet(tmp_path, 1)
+    assert cmd_release(str(p), False, False, None) == 0
+
+    snap = Path(RELEASES_DIR, "0.1.0", "policy.yaml")
+    text = snap.read_text(encoding="utf-8")
+    assert "extends" not in text and "include" not in text
+    assert load_policy(str(snap)) == load_composed(str(p))[0]
+    assert Path(CURRENT_FILE).read_text(encoding="utf-8") == text
+    assert not list(Path("policies").glob(".resolved.*"))
+
+    rep = json.loads(Path(RELEASES_DIR, "0.1.0", "report.json").read_text("utf-8"))
+    assert [f["path"] for f in rep["fragments"]] == [
+        "shared/base.yaml",
+        "shared/costs_high.yaml",
+    ]
+
+
+def test_plain_policy_release_unchanged(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    p = write_policy(tmp_path, "0.1.0")
+    assert cmd_release(str(p), False, False, None, pipelined=True) == 0
+    snap = Path(RELEASES_DIR, "0.1.0", "policy.yaml")
+    assert snap.read_bytes() == p.read_bytes()
+    rep = json.loads(Path(RELEASES_DIR, "0.1.0", "report.json").read_text("utf-8"))
+    assert "fragments" not in rep
+
+
+def test_fragment_cache_is_lru_of_fragments_only(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    loader.clear_fragment_cache()
+    load_policy(str(write_policy(tmp_path, "0.1.0")))
+    # 최상위 정책 파일은 캐시하지 않는다
+    assert len(loader._parsed) == 0
+
+    monkeypatch.setattr(loader, "FRAGMENT_CACHE_SIZE", 2)
+    for name in ("a", "b", "c"):
+        (tmp_path / f"{name}.yaml").write_text(f"{name}: 1\n", encoding="utf-8")
+        (tmp_path / f"use_{name}.yaml").write_text(
+            f"extends: {name}.yaml\n", encoding="utf-8"
+        )
+    frags = [load_composed(f"use_{n}.yaml")[1][0]["sha256"] for n in ("a", "b")]
+    load_policy("use_a.yaml")  # a를 최근 사용으로
+    load_policy("use_c.yaml")
+    assert frags[0] in loader._parsed and frags[1] not in loader._parsed
+    assert len(loader._parsed) == 2
@@ -34,3 +34,53 @@ def test_risk_increase_flag():
     d = diff_policies(old, new)
     levels = [f["level"] for f in d["risk_flags"]]
     assert "WARN" in levels
+
+
+def _indicator_policy(periods):
+    return {
+        "inputs": {
+            "indicators": [
+                {"name": "ema", "params": {"period": p}} for p in periods
+            ]
+        }
+    }
+
+
+def test_keyed_list_reports_element_path():
+    d = diff_policies(_indicator_policy([20, 60]), _indicator_policy([20, 50]))
+    assert d["changed"] == [("$.inputs.indicators[1].params.period", 60, 50)]
+    assert d["added"] == [] and d["removed"] == []
+
+
+def test_keyed_list_added_and_removed_elements():
+    old = _indicator_policy([20, 60])
+    new = _indicator_policy([20, 60])
+    new["inputs"]["indicators"].insert(0, {"name": "rsi", "params": {"period": 14}})
+    d = diff_policies(old, new)
+    # 순서가 바뀌어도 키로 매칭되므로 기존 ema는 변경 없음
+    assert d["changed"] == []
+    assert ("$.inputs.indicators[0].name", "rsi") in d["added"]
+
+    d = diff_policies(new, old)
+    assert ("$.inputs.indicators[0].params.period", 14) in d["removed"]
+
+
+def test_unkeyed_list_lcs_insert():
+    old = {"entry": {"trigger": {"checklist": ["a", "b", "c"]}}}
+    new = {"entry": {"trigger": {"checklist": ["a", "x", "b", "c"]}}}
+    d = diff_policies(old, new)
+    assert d["added"] == [("$.entry.trigger.checklist[1]", "x")]
+    assert d["removed"] == [] and d["changed"] == []
+
+
+def test_large_list_diff_is_element_level():
+    n = 30000
+    old = {"xs": list(range(n)), "rows": [{"v": i} for i in range(n)]}
+    new = {"xs": list(range(n)), "rows": [{"v": i} for i in range(n)]}
+    new["xs"].insert(10, -1)
+    del new["xs"][n - 5]
+    new["rows"][n // 2]["v"] = -1
+    d = diff_policies(old, new)
+    assert d["added"] == [("$.xs[10]", -1)]
+    assert d["removed"] == [(f"$.xs[{n - 6}]", n - 6)]
+    assert d["changed"] == [(f"$.rows[{n // 2}].v", n // 2, -1)]
@@ -0,0 +1,50 @@
+import time
+
+from strategy_validator import fleet
+from strategy_validator.cli import CURRENT_FILE, cmd_release
+from tests.helpers import write_policy
+
+
+def _make_repo(base, monkeypatch, versions):
+    base.mkdir()
+    monkeypatch.chdir(base)
+    for v in versions:
+        assert cmd_release(str(write_policy(base, v)), False, False, None) == 0
+    return base
+
+
+def test_fleet_status_rows(tmp_path, monkeypatch):
+    a = _make_repo(tmp_path / "a", monkeypatch, ["0.1.0", "0.2.0"])
+    b = _make_repo(tmp_path / "b", monkeypatch, ["1.0.0"])
+    # b의 current.yaml을 수동 수정 -> drift
+    cur = b / CURRENT_FILE
+    cur.write_text(
+        cur.read_text(encoding="utf-8").replace("fee_pct: 0.01", "fee_pct: 0.02"),
+        encoding="utf-8",
+    )
+
+    rows = fleet.fleet_status([str(a), str(b), str(tmp_path / "missing")], workers=2)
+    assert [r["status"] for r in rows] == ["ok", "ok", "error"]
+    assert rows[0]["current"] == "0.2.0" and rows[0]["latest"] == "0.2.0"
+    assert rows[0]["drift"] == "none"
+    assert "\trelease\t0.2.0\t" in rows[0]["last_event"]
+    assert rows[1]["drift"] == "modified"
+
+
+def test_fleet_status_timeout_does_not_stall(tmp_path, monkeypatch):
+    real = fleet.repo_status
+
+    def slow(root):
+        if str(root).endswith("slow"):
+            time.sleep(3)
+        return real(root)
+
+    monkeypatch.setattr(fleet, "repo_status", slow)
+    ok = _make_repo(tmp_path / "ok", monkeypatch, ["0.1.0"])
+    (tmp_path / "slow").mkdir()
+
+    t0 = time.monotonic()
+    rows = fleet.fleet_status([str(tmp_path / "slow"), str(ok)], workers=1, timeout=0.3)
+    assert time.monotonic() - t0 < 2
+    assert rows[0]["status"] == "timeout"
+    assert rows[1]["status"] == "ok"
@@ -0,0 +1,88 @@
+from pathlib import Path
+
+from strategy_validator.archive import ADJACENT_FILE, clear_cache, load_release
+from strategy_validator.cli import RELEASES_DIR, cmd_gate_replay, cmd_release
+from strategy_validator.diff import diff_policies
+from strategy_validator.gate import apply_gate, level_counts
+from strategy_validator.paths import list_versions
+from strategy_validator.replay import pair_counts, replay
+from tests.helpers import write_policy
+
+
+def test_replay_matches_apply_gate():
+    warn = {"level": "WARN", "path": "x", "reason": "t"}
+    err = {"level": "ERROR", "path": "y", "reason": "t"}
+    flag_sets = [[], [warn], [warn] * 3, [err]]
+    pairs = [
+        {
+            "from": str(i),
+            "to": str(i + 1),
+            "counts": level_counts(fs),
+            "policy_gate": None,
+        }
+        for i, fs in enumerate(flag_sets)
+    ]
+    configs = [
+        ("hard", {"mode": "hard"}),
+        ("soft20", {"mode": "soft", "warn_score_block": 20}),
+        ("noerr", {"error_block": False, "weights": {"ERROR": 0}}),
+    ]
+    result = replay(pairs, configs)
+
+    assert result["configs"] == ["policy", "hard", "soft20", "noerr"]
+    for i, fs in enumerate(flag_sets):
+        for c, (_, g) in enumerate(configs, start=1):
+            expect = apply_gate({"risk_flags": fs}, g)
+            assert result["decisions"][i][c] == expect["decision"]
+            assert result["scores"][i][c] == expect["risk_score"]
+    assert result["blocked"]["hard"] == 3
+    # ERROR 무시 설정에서도 WARN 3개(30점)는 soft 임계값에 걸림
+    assert result["blocked"]["noerr"] == 1
+
+
+def test_gate_replay_command(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    p1 = write_policy(tmp_path, "0.1.0")
+    assert cmd_release(str(p1), False, False, None) == 0
+
+    p2 = write_policy(tmp_path, "0.2.0")
+    text = p2.read_text(encoding="utf-8")
+    p2.write_text(
+        text.replace("per_trade_loss_pct: 1.0", "per_trade_loss_pct: 1.5"),
+        encoding="utf-8",
+    )
+    assert cmd_release(str(p2), False, False, None) == 0
+
+    cfg = tmp_path / "gates.yaml"
+    cfg.write_text("hard: {mode: hard}\nsoft: {mode: soft}\n", encoding="utf-8")
+    capsys.readouterr()
+    assert cmd_gate_replay(str(cfg), json_out=False, out_path="artifacts/replay.json") == 0
+    out = capsys.readouterr().out
+    assert "0.1.0 -> 0.2.0" in out
+    assert "BLOCK(10)" in out and "ALLOW(10)" in out
+
+
+def test_pair_counts_match_full_diff_with_or_without_adjacent(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for version, ptl in (("0.1.0", "1.0"), ("0.2.0", "1.5"), ("0.3.0", "1.2")):
+        p = write_policy(tmp_path, version)
+        text = p.read_text(encoding="utf-8")
+        p.write_text(
+            text.replace("per_trade_loss_pct: 1.0", f"per_trade_loss_pct: {ptl}"),
+            encoding="utf-8",
+        )
+        assert cmd_release(str(p), False, False, None) == 0
+
+    versions = list_versions(RELEASES_DIR)
+    expected = []
+    for old, new in zip(versions, versions[1:]):
+        diff = diff_policies(load_release(RELEASES_DIR, old), load_release(RELEASES_DIR, new))
+        expected.append(level_counts(diff["risk_flags"]))
+    assert expected[0] == {"WARN": 1}
+
+    # adjacent.json에 기록된 값으로, 그리고 기록이 없으면 재구성한 정책으로
+    assert [p["counts"] for p in pair_counts(RELEASES_DIR, versions)] == expected
+    for v in versions:
+        Path(RELEASES_DIR, v, ADJACENT_FILE).unlink()
+    clear_cache()
+    assert [p["counts"] for p in pair_counts(RELEASES_DIR, versions)] == expected
@@ -0,0 +1,64 @@
+from datetime import datetime
+from pathlib import Path
+
+from strategy_validator.archive import DELTA_FILE, load_release
+from strategy_validator.cli import (
+    HISTORY_FILE,
+    RELEASES_DIR,
+    cmd_gc,
+    cmd_release,
+    cmd_rollback,
+    cmd_tag,
+)
+from strategy_validator.retention import select_prunable
+from tests.helpers import write_policy
+
+
+def test_select_prunable_rules():
+    versions = ["0.1.0", "0.2.0", "0.3.0", "0.4.0", "0.5.0"]
+    events = [
+        (datetime(2026, 1, 1), "release", "0.1.0"),
+        (datetime(2026, 1, 2), "release", "0.2.0"),
+        (datetime(2026, 3, 1), "release", "0.3.0"),
+        (datetime(2026, 3, 9), "rollback", "0.2.0"),
+    ]
+    now = datetime(2026, 3, 10)
+
+    pr = select_prunable(versions, "0.2.0", events, {}, keep_last=1)
+    assert pr == ["0.1.0", "0.3.0", "0.4.0"]
+
+    # 3/5 이후 live: 3/5 시점의 0.3.0 + 3/9 rollback 0.2.0
+    pr = select_prunable(versions, None, events, {}, keep_days=5, now=now)
+    assert pr == ["0.1.0", "0.4.0", "0.5.0"]
+
+    pr = select_prunable(versions, None, [], {"prod": "0.1.0"}, keep_tagged=True)
+    assert pr == ["0.2.0", "0.3.0", "0.4.0", "0.5.0"]
+
+
+def test_gc_keeps_current_and_rebases_deltas(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    for v in ("0.1.0", "0.2.0", "0.3.0", "0.4.0"):
+        p = write_policy(tmp_path, v)
+        assert cmd_release(str(p), False, False, None, archive="delta") == 0
+    assert cmd_rollback("0.1.0") == 0
+    assert cmd_tag("0.2.0", "audit", delete=False) == 0
+
+    assert cmd_gc(keep_last=1, keep_days=None, keep_tagged=True, dry_run=True) == 0
+    assert Path(RELEASES_DIR, "0.3.0").exists()
+
+    assert cmd_gc(keep_last=1, keep_days=None, keep_tagged=True, dry_run=False) == 0
+    assert Path(RELEASES_DIR, "0.1.0").exists()  # current
+    assert Path(RELEASES_DIR, "0.2.0").exists()  # tagged
+    assert not Path(RELEASES_DIR, "0.3.0").exists()
+    # 0.4.0의 base(0.3.0)가 삭제되었으므로 스냅샷으로 전환되어야 함
+    assert not Path(RELEASES_DIR, "0.4.0", DELTA_FILE).exists()
+    assert load_release(RELEASES_DIR, "0.4.0")["meta"]["policy_version"] == "0.4.0"
+    # last_rollback.json은 살아있는 버전을 가리키므로 유지
+    assert Path("artifacts/last_rollback.json").exists()
+    assert "\tgc\t0.3.0" in Path(HISTORY_FILE).read_text(encoding="utf-8")
+
+
+def test_gc_requires_rule(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert cmd_gc(keep_last=None, keep_days=None, keep_tagged=False, dry_run=False) == 2
@@ -0,0 +1,85 @@
+from pathlib import Path
+
+from strategy_validator.archive import ALIAS_FILE, load_release
+from strategy_validator.cli import (
+    CURRENT_FILE,
+    RELEASES_DIR,
+    cmd_release,
+    cmd_rollback,
+    cmd_status,
+)
+from strategy_validator.hashing import canonical_hash
+from strategy_validator.loader import load_policy
+from tests.helpers import write_policy
+
+
+def test_canonical_hash_ignores_key_order_and_bookkeeping():
+    a = {"meta": {"policy_version": "1", "market": "KRX"}, "risk": {"x": 1, "y": 2}}
+    b = {"risk": {"y": 2, "x": 1}, "meta": {"market": "KRX", "policy_version": "2"}}
+    assert canonical_hash(a) == canonical_hash(b)
+    b["risk"]["x"] = 3
+    assert canonical_hash(a) != canonical_hash(b)
+
+
+def test_identical_release_skip(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    assert cmd_release(str(write_policy(tmp_path, "0.1.0")), False, False, None) == 0
+
+    p = write_policy(tmp_path, "0.1.1")
+    assert cmd_release(str(p), False, False, None, if_identical="skip") == 0
+    assert "RELEASE SKIPPED: content identical to 0.1.0" in capsys.readouterr().out
+    assert not Path(RELEASES_DIR, "0.1.1").exists()
+
+
+def test_identical_release_alias(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    assert cmd_release(str(write_policy(tmp_path, "0.1.0")), False, False, None) == 0
+
+    p = write_policy(tmp_path, "0.1.1")
+    assert cmd_release(str(p), False, False, None, if_identical="alias") == 0
+    assert Path(RELEASES_DIR, "0.1.1", ALIAS_FILE).exists()
+    assert not Path(RELEASES_DIR, "0.1.1", "policy.yaml").exists()
+    assert load_policy(CURRENT_FILE)["meta"]["policy_version"] == "0.1.1"
+    assert load_release(RELEASES_DIR, "0.1.1")["meta"]["policy_version"] == "0.1.1"
+
+    capsys.readouterr()
+    assert cmd_status(identical=True) == 0
+    assert "identical: 0.1.0 = 0.1.1" in capsys.readouterr().out
+
+    assert cmd_rollback("0.1.0") == 0
+    assert cmd_rollback("0.1.1") == 0
+    assert load_policy(CURRENT_FILE)["meta"]["policy_version"] == "0.1.1"
+
+
+def test_mixed_key_types_hash_and_release(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    a = {"levels": {1: "a", "x": "b"}}
+    b = {"levels": {"x": "b", 1: "a"}}
+    assert canonical_hash(a) == canonical_hash(b)
+    assert canonical_hash(a) != canonical_hash({"levels": {"1": "a", "x": "b"}})
+    assert canonical_hash({"levels": {1: "a"}}) != canonical_hash({"levels": {"1": "a"}})
+
+    for v in ("0.1.0", "0.1.1"):
+        p = write_policy(tmp_path, v)
+        p.write_text(
+            p.read_text(encoding="utf-8") + "sizing:\n  1: 0.5\n  step: 0.25\n",
+            encoding="utf-8",
+        )
+        assert cmd_release(str(p), False, False, None, archive="delta") == 0
+    assert load_release(RELEASES_DIR, "0.1.1")["sizing"] == {1: 0.5, "step": 0.25}
+
+
+def test_identical_check_uses_live_current_file(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    assert cmd_release(str(write_policy(tmp_path, "0.1.0")), False, False, None) == 0
+
+    # current.yaml 수동 수정: 0.1.0 내용을 다시 릴리즈하면 no-op이 아니다
+    cur = Path(CURRENT_FILE)
+    cur.write_text(
+        cur.read_text(encoding="utf-8").replace("fee_pct: 0.01", "fee_pct: 0.5"),
+        encoding="utf-8",
+    )
+    p = write_policy(tmp_path, "0.1.1")
+    assert cmd_release(str(p), False, False, None, if_identical="skip") == 0
+    assert "RELEASE SKIPPED" not in capsys.readouterr().out
+    assert load_policy(CURRENT_FILE)["execution"]["costs"]["fee_pct"] == 0.01
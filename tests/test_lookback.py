@@ -0,0 +1,134 @@
+import pytest
+
+from strategy_validator.errors import RULES
+from strategy_validator.loader import load_policy
+from strategy_validator.lookback import (
+    estimate_warmup,
+    indicator_lookback,
+    max_lookback,
+    parse_timeframe,
+)
+from strategy_validator.validator import validate_report
+
+
+def _codes(rep):
+    return [(e["code"], e["path"]) for e in rep["errors"]]
+
+
+def test_parse_timeframe():
+    assert parse_timeframe("30s") == 30
+    assert parse_timeframe("5m") == 300
+    assert parse_timeframe("1h") == 3600
+    assert parse_timeframe("1D") == 86400
+    for bad in ("5", "m", "0m", "5x", None):
+        with pytest.raises(ValueError):
+            parse_timeframe(bad)
+
+
+def test_lookback_tables():
+    assert indicator_lookback("sma", {"period": 50}) == 50
+    assert indicator_lookback("EMA", {"period": 60}) == 180
+    assert indicator_lookback("macd") == 26 * 3 + 9
+    assert indicator_lookback("rsi", {"period": 14}) == 43
+    assert indicator_lookback("vwap") is None
+
+
+def test_max_lookback_per_timeframe():
+    tf = {"primary": "5m", "confirm": "20m"}
+    inds = [
+        {"name": "ema", "params": {"period": 20}},
+        {"name": "sma", "params": {"period": 200}, "timeframe": "confirm"},
+        {"name": "atr", "params": {"period": 14}, "timeframe": "5m"},
+    ]
+    assert max_lookback(inds, tf) == {"primary": 60, "confirm": 200}
+
+    est = estimate_warmup(tf, inds)
+    assert est["bars"] == 260
+    assert est["seconds"] == 200 * 1200
+    assert est["timeframes"]["primary"]["bytes"] == 60 * 48
+
+
+def test_report_includes_warmup_estimate():
+    rep = validate_report(load_policy("policy.yaml"))
+    assert rep["ok"]
+    assert rep["warmup"]["timeframes"]["confirm"]["bars"] == 180
+
+
+def test_confirm_must_be_multiple_of_primary():
+    policy = load_policy("policy.yaml")
+    policy["inputs"]["data"]["timeframe"]["confirm"] = "7m"
+    assert _codes(validate_report(policy)) == [
+        ("V004", "$.inputs.data.timeframe.confirm")
+    ]
+
+    policy["inputs"]["data"]["timeframe"]["confirm"] = "soon"
+    rep = validate_report(policy)
+    assert _codes(rep) == [("V004", "$.inputs.data.timeframe.confirm")]
+    assert "warmup" not in rep
+
+
+def test_warmup_budget_exceeded():
+    policy = load_policy("policy.yaml")
+    policy["inputs"]["data"]["warmup_budget"] = {
+        "max_bars": 1000,
+        "max_duration": "3d",
+    }
+    assert validate_report(policy)["ok"]
+
+    policy["inputs"]["data"]["warmup_budget"] = {"max_bars": 300, "max_duration": "1d"}
+    rep = validate_report(policy)
+    assert _codes(rep) == [
+        ("V007", "$.inputs.data.warmup_budget.max_bars"),
+        ("V007", "$.inputs.data.warmup_budget.max_duration"),
+    ]
+
+
+@pytest.mark.parametrize(
+    "params, path",
+    [
+        ({"period": None}, "$.inputs.indicators[1].params.period"),
+        ([20], "$.inputs.indicators[1].params"),
+        ({"period": [20]}, "$.inputs.indicators[1].params.period"),
+        ({"period": "abc"}, "$.inputs.indicators[1].params.period"),
+        ({"period": 0}, "$.inputs.indicators[1].params.period"),
+    ],
+)
+def test_malformed_indicator_params_are_findings(params, path):
+    policy = load_policy("policy.yaml")
+    policy["inputs"]["indicators"][1]["params"] = params
+    rep = validate_report(policy)
+    assert _codes(rep) == [("V008", path)]
+    assert "warmup" not in rep
+
+
+@pytest.mark.parametrize(
+    "budget, path",
+    [
+        (5, "$.inputs.data.warmup_budget"),
+        ({"max_bars": "100"}, "$.inputs.data.warmup_budget.max_bars"),
+        ({"max_bytes": [1]}, "$.inputs.data.warmup_budget.max_bytes"),
+        ({"max_duration": "soon"}, "$.inputs.data.warmup_budget.max_duration"),
+    ],
+)
+def test_malformed_warmup_budget_is_finding(budget, path):
+    policy = load_policy("policy.yaml")
+    policy["inputs"]["data"]["warmup_budget"] = budget
+    assert _codes(validate_report(policy)) == [("V008", path)]
+
+
+def test_malformed_params_without_budget_are_not_budget_overruns():
+    policy = load_policy("policy.yaml")
+    policy["inputs"]["data"].pop("warmup_budget", None)
+    policy["inputs"]["indicators"][1]["params"] = {"period": "abc"}
+    (err,) = validate_report(policy)["errors"]
+    assert err["code"] == "V008"
+    assert err["message"] == RULES["V008"]["message"]
+
+
+def test_indicators_must_be_list_of_mappings():
+    policy = load_policy("policy.yaml")
+    policy["inputs"]["indicators"] = ["ema", {"name": "sma"}]
+    assert _codes(validate_report(policy)) == [("V008", "$.inputs.indicators[0]")]
+
+    policy["inputs"]["indicators"] = {"name": "ema"}
+    assert _codes(validate_report(policy)) == [("V008", "$.inputs.indicators")]
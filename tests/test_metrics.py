@@ -0,0 +1,72 @@
+import pytest
+
+from strategy_validator import metrics
+from strategy_validator.cli import cmd_release, cmd_rollback
+
+
+@pytest.fixture
+def metrics_file(tmp_path):
+    path = tmp_path / "textfile" / "policyv.prom"
+    metrics.configure(str(path))
+    yield path
+    metrics.configure(None)
+
+
+def _samples(path):
+    out = {}
+    for line in path.read_text(encoding="utf-8").splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            out[name] = float(value)
+    return out
+
+
+def test_disabled_metrics_are_noop(tmp_path):
+    metrics.configure(None)
+    metrics.inc("policyv_rollbacks_total", {"result": "ok"})
+    metrics.flush()
+    assert not list(tmp_path.iterdir())
+
+
+def test_release_metrics_accumulate_across_flushes(tmp_path, monkeypatch, metrics_file):
+    from tests.helpers import write_policy
+
+    monkeypatch.chdir(tmp_path)
+    assert cmd_release(str(write_policy(tmp_path, "0.1.0")), False, False, None) == 0
+    metrics.flush()
+    assert cmd_release(str(write_policy(tmp_path, "0.2.0")), False, False, None) == 0
+    assert cmd_rollback(None) == 0
+    metrics.flush()
+
+    s = _samples(metrics_file)
+    assert s['policyv_gate_decisions_total{decision="ALLOW"}'] == 2
+    assert s['policyv_stage_duration_seconds_count{stage="commit"}'] == 2
+    assert s['policyv_stage_duration_seconds_bucket{stage="diff",le="+Inf"}'] == 2
+    assert s['policyv_rollbacks_total{result="ok"}'] == 1
+    # live version gauge는 교체되어 하나만 남아야 함
+    live = [k for k in s if k.startswith("policyv_live_version_info")]
+    assert live == ['policyv_live_version_info{version="0.1.0"}']
+    assert "# TYPE policyv_stage_duration_seconds histogram" in metrics_file.read_text(
+        encoding="utf-8"
+    )
+
+
+def _flush_many(path, n):
+    metrics.configure(path)
+    for _ in range(n):
+        metrics.inc("policyv_rollbacks_total", {"result": "ok"})
+        metrics.flush()
+
+
+def test_concurrent_flushes_keep_all_increments(tmp_path):
+    import multiprocessing
+
+    path = str(tmp_path / "policyv.prom")
+    ctx = multiprocessing.get_context("spawn")
+    procs = [ctx.Process(target=_flush_many, args=(path, 25)) for _ in range(4)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+    assert all(p.exitcode == 0 for p in procs)
+    assert _samples(tmp_path / "policyv.prom")['policyv_rollbacks_total{result="ok"}'] == 100
@@ -0,0 +1,59 @@
+import copy
+
+from strategy_validator.diff import diff_policies
+from strategy_validator.gate import apply_gate
+from strategy_validator.loader import load_policy
+from strategy_validator.model import compile_policy
+from strategy_validator.validator import validate_report
+
+
+def _pair():
+    old = load_policy("policy.yaml")
+    new = copy.deepcopy(old)
+    new["meta"]["policy_version"] = "0.2.0"
+    new["risk"]["per_trade_loss_pct"] = 3.0
+    new["execution"]["costs"]["fee_pct"] = 0
+    new["inputs"]["indicators"].append({"name": "rsi", "params": {"period": 14}})
+    del new["release"]
+    return old, new
+
+
+def test_compiled_fields_preresolved():
+    cp = compile_policy(load_policy("policy.yaml"))
+    assert cp.version == "0.1.1"
+    assert cp.risk.per_trade_loss_pct == 2.0
+    assert cp.costs.slippage_pct == 0.05
+    assert cp.exit.stop_loss_pct == 2.0
+    assert cp.timeframe.confirm == "20m"
+    assert cp.gate["mode"] == "soft"
+    assert compile_policy(cp) is cp
+
+
+def test_stages_match_dict_results():
+    old, new = _pair()
+    c_old, c_new = compile_policy(old), compile_policy(new)
+
+    assert validate_report(c_new) == validate_report(new)
+    assert diff_policies(c_old, c_new) == diff_policies(old, new)
+    assert diff_policies(None, c_new) == diff_policies(None, new)
+
+    diff = diff_policies(old, new)
+    assert apply_gate(diff, c_new) == apply_gate(diff, None)
+    assert apply_gate(diff, c_old) == apply_gate(diff, old["release"]["gate"])
+
+
+def test_indicators_resolved_once_for_validate_and_report(monkeypatch):
+    from strategy_validator import validator
+
+    policy = load_policy("policy.yaml")
+    policy["inputs"]["data"]["warmup_budget"] = {"max_bars": 300, "max_duration": "1d"}
+    expected = validate_report(policy)
+
+    calls = []
+    inner = validator.resolve_indicators
+    monkeypatch.setattr(
+        validator, "resolve_indicators", lambda ind: calls.append(ind) or inner(ind)
+    )
+    # 검증(예산 초과 판정)과 리포트의 warm-up 추정이 같은 지표 풀이를 공유
+    assert validate_report(compile_policy(policy)) == expected
+    assert len(calls) == 1
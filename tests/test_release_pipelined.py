@@ -0,0 +1,55 @@
+import os
+from pathlib import Path
+
+from strategy_validator.cli import (
+    CURRENT_FILE,
+    HISTORY_FILE,
+    POLICIES_DIR,
+    RELEASES_DIR,
+    cmd_release,
+    cmd_rollback,
+)
+from strategy_validator.loader import load_policy
+from tests.helpers import write_policy
+
+
+def test_pipelined_release_matches_sequential_layout(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    for v in ("0.1.0", "0.2.0"):
+        p = write_policy(tmp_path, v)
+        assert cmd_release(str(p), False, False, None, pipelined=True) == 0
+
+    for name in ("policy.yaml", "report.json", "content.sha256"):
+        assert Path(RELEASES_DIR, "0.2.0", name).exists()
+    assert load_policy(CURRENT_FILE)["meta"]["policy_version"] == "0.2.0"
+    assert Path(HISTORY_FILE).read_text(encoding="utf-8").count("\trelease\t") == 2
+
+    # staging / 임시 파일이 남지 않아야 함
+    assert not [p.name for p in Path(POLICIES_DIR).iterdir() if p.name.startswith(".")]
+
+    assert cmd_rollback(None) == 0
+    assert load_policy(CURRENT_FILE)["meta"]["policy_version"] == "0.1.0"
+
+
+def test_pipelined_release_delta_mode(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    for v in ("0.1.0", "0.2.0"):
+        p = write_policy(tmp_path, v)
+        rc = cmd_release(str(p), False, False, None, archive="delta", pipelined=True)
+        assert rc == 0
+
+    assert Path(RELEASES_DIR, "0.2.0", "policy.delta.json").exists()
+
+
+def test_pipelined_release_handles_short_writes(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    real_write = os.write
+    # 한 번에 최대 7바이트만 쓰는 파일시스템 흉내
+    monkeypatch.setattr(os, "write", lambda fd, data: real_write(fd, data[:7]))
+
+    p = write_policy(tmp_path, "0.1.0")
+    assert cmd_release(str(p), False, False, None, pipelined=True) == 0
+    assert Path(CURRENT_FILE).read_bytes() == p.read_bytes()
+    assert Path(RELEASES_DIR, "0.1.0", "policy.yaml").read_bytes() == p.read_bytes()
@@ -0,0 +1,124 @@
+import json
+from pathlib import Path
+
+from strategy_validator.cli import CURRENT_FILE, RELEASES_DIR, cmd_queue_work
+from strategy_validator.loader import load_policy
+from strategy_validator.release_queue import QUEUE_DIR, drain, queue_stats, submit
+from tests.helpers import write_policy
+
+
+def test_newest_submission_supersedes_older(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    ids = [submit(str(write_policy(tmp_path, v))) for v in ("0.1.0", "0.2.0", "0.3.0")]
+    assert queue_stats()["depth"] == 3
+
+    assert cmd_queue_work(once=True, poll=0, max_batch=None, strict=False,
+                          archive="full", pipelined=False) == 0
+
+    assert queue_stats()["depth"] == 0
+    assert load_policy(CURRENT_FILE)["meta"]["policy_version"] == "0.3.0"
+    assert not Path(RELEASES_DIR, "0.1.0").exists()
+    assert Path(QUEUE_DIR, "superseded", f"{ids[0]}.json").exists()
+    assert Path(QUEUE_DIR, "done", f"{ids[2]}.json").exists()
+
+
+def test_invalid_candidate_fails_without_release(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    p = write_policy(tmp_path, "0.1.0")
+    p.write_text(p.read_text(encoding="utf-8").replace("risk:", "riskx:"), encoding="utf-8")
+    submit(str(p))
+
+    calls = []
+    results = drain(lambda path, fragments, model: calls.append(path) or 0)
+    assert calls == []
+    assert results[0]["state"] == "failed"
+    assert results[0]["summary"]["errors"] >= 1
+
+
+def test_targets_are_coalesced_separately(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    submit(str(write_policy(tmp_path, "0.1.0")), target="a")
+    submit(str(write_policy(tmp_path, "0.2.0")), target="b")
+    submit(str(write_policy(tmp_path, "0.3.0")), target="a")
+
+    released = []
+    results = drain(lambda path, fragments, model: released.append(Path.cwd().name) or 0)
+    assert sorted(released) == ["a", "b"]
+    assert [r["state"] for r in results].count("superseded") == 1
+
+
+def test_invalid_newest_keeps_older_valid_candidate(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    old_id = submit(str(write_policy(tmp_path, "0.1.0")))
+    p = write_policy(tmp_path, "0.2.0")
+    p.write_text(p.read_text(encoding="utf-8").replace("risk:", "riskx:"), encoding="utf-8")
+    new_id = submit(str(p))
+
+    released = []
+    results = {r["id"]: r for r in drain(lambda path, fragments, model: released.append(path) or 0)}
+    assert results[new_id]["state"] == "failed"
+    assert results[old_id]["state"] == "done"
+    assert results[old_id]["version"] == "0.1.0"
+    assert len(released) == 1
+
+
+def test_missing_target_fails_entry_without_crashing(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "ok").mkdir()
+    gone = submit(str(write_policy(tmp_path, "0.1.0")), target="gone")
+    ok = submit(str(write_policy(tmp_path, "0.2.0")), target="ok")
+
+    def boom(path, fragments, model):
+        if Path.cwd().name == "ok":
+            raise RuntimeError("disk full")
+        return 0
+
+    results = {r["id"]: r for r in drain(boom)}
+    assert results[gone]["state"] == "failed"
+    assert "release error" in results[gone]["reason"]
+    assert results[ok]["state"] == "failed"
+    assert "disk full" in results[ok]["reason"]
+    assert queue_stats()["depth"] == 0
+    assert Path.cwd() == tmp_path
+
+
+def test_composed_submission_keeps_fragment_hashes(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    shared = tmp_path / "shared"
+    shared.mkdir()
+    p = write_policy(tmp_path, "0.1.0")
+    text = p.read_text(encoding="utf-8")
+    cut = text.index("failsafe:")
+    (shared / "failsafe.yaml").write_text(text[cut:], encoding="utf-8")
+    p.write_text("extends: shared/failsafe.yaml\n" + text[:cut], encoding="utf-8")
+
+    entry_id = submit(str(p))
+    entry = json.loads(Path(QUEUE_DIR, "pending", f"{entry_id}.json").read_text())
+    assert [f["path"] for f in entry["fragments"]] == ["shared/failsafe.yaml"]
+
+    assert cmd_queue_work(once=True, poll=0, max_batch=None, strict=False,
+                          archive="full", pipelined=False) == 0
+    rep = json.loads(Path(RELEASES_DIR, "0.1.0", "report.json").read_text())
+    assert rep["fragments"] == entry["fragments"]
+
+
+def test_winner_is_validated_once(tmp_path, monkeypatch):
+    from strategy_validator import validator
+
+    monkeypatch.chdir(tmp_path)
+    submit(str(write_policy(tmp_path, "0.1.0")))
+
+    inner = validator._validate
+    calls = []
+
+    def counting(policy, cp):
+        calls.append(policy)
+        return inner(policy, cp)
+
+    monkeypatch.setattr(validator, "_validate", counting)
+    assert cmd_queue_work(once=True, poll=0, max_batch=None, strict=False,
+                          archive="full", pipelined=False) == 0
+    assert load_policy(CURRENT_FILE)["meta"]["policy_version"] == "0.1.0"
+    assert len(calls) == 1
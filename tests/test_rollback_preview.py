@@ -0,0 +1,159 @@
+import json
+from pathlib import Path
+
+from strategy_validator.adjacent import compose_ops, preview_rollback, read_adjacent
+from strategy_validator.archive import apply_delta, load_release, snapshot_release
+from strategy_validator.cli import (
+    CURRENT_FILE,
+    RELEASES_DIR,
+    ROLLBACK_REPORT,
+    cmd_release,
+    cmd_rollback,
+)
+from strategy_validator.diff import diff_policies
+from strategy_validator.loader import load_policy
+from tests.helpers import write_policy
+
+
+def _release(tmp_path, version, edits=None):
+    p = write_policy(tmp_path, version)
+    text = p.read_text(encoding="utf-8")
+    for old, new in (edits or {}).items():
+        text = text.replace(old, new)
+    p.write_text(text, encoding="utf-8")
+    assert cmd_release(str(p), False, False, None) == 0
+
+
+def test_compose_ops_matches_sequential_apply():
+    base = {"a": {"x": 1, "y": 2}, "b": [1, 2], "c": 3}
+    steps = [
+        [["set", ["a", "x"], 5], ["del", ["c"]]],
+        [["del", ["a"]], ["set", ["d"], {"k": 1}]],
+        [["set", ["d", "k"], 2], ["set", ["a"], {"z": 0}], ["set", ["a", "w"], 1]],
+    ]
+    seq = base
+    for ops in steps:
+        seq = apply_delta(seq, ops)
+    assert apply_delta(base, compose_ops(steps)) == seq
+
+
+def test_adjacent_stored_at_release(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    _release(tmp_path, "0.1.0")
+    _release(tmp_path, "0.2.0", {"trade_loss_pct: 1.0": "trade_loss_pct: 1.5"})
+
+    first = read_adjacent(RELEASES_DIR, "0.1.0")
+    assert first["base"] is None and "forward" not in first
+    adj = read_adjacent(RELEASES_DIR, "0.2.0")
+    assert adj["base"] == "0.1.0"
+    old, new = load_release(RELEASES_DIR, "0.1.0"), load_release(RELEASES_DIR, "0.2.0")
+    assert apply_delta(old, adj["forward"]) == new
+    assert apply_delta(new, adj["reverse"]) == old
+
+
+def test_preview_composes_without_rediff(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    _release(tmp_path, "0.1.0")
+    _release(tmp_path, "0.2.0", {"stop_loss_pct: 1.0": "stop_loss_pct: 0.8"})
+    _release(tmp_path, "0.3.0", {"trade_loss_pct: 1.0": "trade_loss_pct: 0.5"})
+    assert cmd_rollback("0.2.0") == 0
+    _release(tmp_path, "0.4.0", {"stop_loss_pct: 1.0": "stop_loss_pct: 0.9"})
+
+    # current 0.4.0 -> 0.3.0: 0.4.0의 base는 0.2.0, 거기서 0.3.0으로 forward
+    pv = preview_rollback(RELEASES_DIR, "0.4.0", "0.3.0")
+    assert pv["method"] == "adjacent"
+    assert pv["path"] == ["0.4.0", "0.2.0", "0.3.0"]
+    cur = load_policy(CURRENT_FILE)
+    tgt = load_release(RELEASES_DIR, "0.3.0")
+    ops = [
+        [c["op"], c["path"][2:].split(".")] + ([c["value"]] if "value" in c else [])
+        for c in pv["changes"]
+    ]
+    assert apply_delta(cur, ops) == tgt
+    # 위험 플래그는 재diff 결과와 같아야 한다
+    assert pv["risk_flags"] == diff_policies(cur, tgt)["risk_flags"]
+    assert pv["gate"]["decision"] == "ALLOW"
+
+
+def test_rollback_gate_blocks(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    _release(tmp_path, "0.1.0", {"trade_loss_pct: 1.0": "trade_loss_pct: 3.0"})
+    _release(tmp_path, "0.2.0")
+    # 0.1.0으로 돌아가면 per_trade_loss 상승 WARN; hard gate면 차단
+    target = Path(RELEASES_DIR, "0.1.0", "adjacent.json")
+    adj = json.loads(target.read_text(encoding="utf-8"))
+    adj["gate"] = {"mode": "hard"}
+    target.write_text(json.dumps(adj), encoding="utf-8")
+
+    assert cmd_rollback("0.1.0", preview=True) == 0
+    out = capsys.readouterr().out
+    assert "set $.risk.per_trade_loss_pct = 3.0" in out
+    assert "GATE: BLOCK" in out
+
+    assert cmd_rollback("0.1.0", gate=True) == 2
+    assert load_policy(CURRENT_FILE)["meta"]["policy_version"] == "0.2.0"
+    rep = json.loads(Path(ROLLBACK_REPORT).read_text(encoding="utf-8"))
+    assert rep["ok"] is False and rep["gate"]["decision"] == "BLOCK"
+
+    # gate 없이 하는 롤백은 기존 동작 그대로
+    assert cmd_rollback("0.1.0") == 0
+
+
+def test_gate_with_unknown_current_rediffs(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    hard = {
+        "trade_loss_pct: 1.0": "trade_loss_pct: 3.0",
+        "failsafe:": 'release:\n  gate:\n    mode: "hard"\n\nfailsafe:',
+    }
+    _release(tmp_path, "0.1.0", hard)
+    _release(tmp_path, "0.2.0")
+
+    # current.yaml을 수동으로 바꿔 알려지지 않은 버전이 됨
+    cur = Path(CURRENT_FILE)
+    cur.write_text(
+        cur.read_text(encoding="utf-8").replace('"0.2.0"', '"0.2.0-hotfix"'),
+        encoding="utf-8",
+    )
+    pv = preview_rollback(RELEASES_DIR, "0.2.0-hotfix", "0.1.0", load_policy(cur))
+    assert pv["method"] == "rediff"
+    assert pv["gate"]["decision"] == "BLOCK"
+
+    assert cmd_rollback("0.1.0", gate=True) == 2
+    assert "ROLLBACK BLOCKED BY GATE" in capsys.readouterr().out
+    assert load_policy(CURRENT_FILE)["meta"]["policy_version"] == "0.2.0-hotfix"
+
+    # current.yaml이 없으면 gate를 판정할 수 없으므로 막는다
+    cur.unlink()
+    assert cmd_rollback("0.1.0", gate=True) == 2
+    assert "no current.yaml" in capsys.readouterr().out
+    assert not cur.exists()
+
+
+def test_delta_archive_adjacent_references_delta(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for v, edits in (
+        ("0.1.0", None),
+        ("0.2.0", {"stop_loss_pct: 1.0": "stop_loss_pct: 0.8"}),
+        ("0.3.0", {"trade_loss_pct: 1.0": "trade_loss_pct: 0.5"}),
+    ):
+        p = write_policy(tmp_path, v)
+        text = p.read_text(encoding="utf-8")
+        for old, new in (edits or {}).items():
+            text = text.replace(old, new)
+        p.write_text(text, encoding="utf-8")
+        assert cmd_release(str(p), False, False, None, archive="delta") == 0
+
+    raw = json.loads(Path(RELEASES_DIR, "0.3.0", "adjacent.json").read_text())
+    assert raw["forward_ref"] == "policy.delta.json" and "forward" not in raw
+    adj = read_adjacent(RELEASES_DIR, "0.3.0")
+    old, new = load_release(RELEASES_DIR, "0.2.0"), load_release(RELEASES_DIR, "0.3.0")
+    assert apply_delta(old, adj["forward"]) == new
+
+    assert cmd_rollback("0.1.0") == 0
+    assert preview_rollback(RELEASES_DIR, "0.1.0", "0.3.0")["method"] == "adjacent"
+
+    # delta를 스냅샷으로 바꿔도 forward는 adjacent.json 안으로 옮겨져 유지
+    snapshot_release(RELEASES_DIR, "0.3.0")
+    raw = json.loads(Path(RELEASES_DIR, "0.3.0", "adjacent.json").read_text())
+    assert "forward_ref" not in raw and raw["forward"] == adj["forward"]
+    assert preview_rollback(RELEASES_DIR, "0.1.0", "0.3.0")["method"] == "adjacent"
@@ -0,0 +1,69 @@
+import json
+
+from strategy_validator.cli import cmd_validate_batch
+from strategy_validator.loader import load_policy
+from strategy_validator.validator import FindingTable, validate_findings, validate_report
+
+
+def test_report_shape_unchanged():
+    policy = load_policy("policy.yaml")
+    del policy["exit"]["stop_loss_pct"]
+    rep = validate_report(policy)
+    assert rep["errors"] == [
+        {
+            "code": "V006",
+            "severity": "ERROR",
+            "message": "Exit or failsafe rule missing",
+            "path": "$.exit.stop_loss_pct",
+            "detail": "missing",
+        }
+    ]
+
+
+def test_finding_table_columns_reference_shared_tables():
+    ok = load_policy("policy.yaml")
+    bad = load_policy("policy.yaml")
+    del bad["risk"]
+    del bad["execution"]["costs"]
+
+    table = FindingTable()
+    for i in range(3):
+        table.add(f"bad{i}.yaml", bad, validate_findings(bad))
+    table.add("ok.yaml", ok, validate_findings(ok))
+
+    out = table.to_columnar()
+    assert out["codes"] == ["V001", "V005"]
+    assert set(out["rules"]) == {"V001", "V005"}
+    assert len(table) == 6
+    assert out["findings"]["policy"] == [0, 0, 1, 1, 2, 2]
+    assert [p["ok"] for p in out["policies"]] == [False, False, False, True]
+    assert out["policies"][0]["summary"] == {"errors": 1, "warnings": 1}
+
+
+def test_validate_batch_command(tmp_path, capsys):
+    out = tmp_path / "batch.json"
+    rc = cmd_validate_batch(["policy.yaml", "policy.yaml"], True, False, str(out))
+    assert rc == 0
+    data = json.loads(out.read_text(encoding="utf-8"))
+    assert data["format"] == "columnar/1"
+    assert "validated: 2, failed: 0" in capsys.readouterr().out
+
+
+def test_validate_batch_validates_each_policy_once(tmp_path, monkeypatch):
+    import strategy_validator.validator as validator
+
+    calls = []
+    real = validator.validate_findings
+
+    def counting(policy):
+        calls.append(1)
+        return real(policy)
+
+    monkeypatch.setattr(validator, "validate_findings", counting)
+    out = tmp_path / "batch.json"
+    rc = cmd_validate_batch(["policy.yaml", "policy.yaml"], False, True, str(out))
+    assert rc == 0
+    assert len(calls) == 2
+    reports = json.loads(out.read_text(encoding="utf-8"))["reports"]
+    expected = validate_report(load_policy("policy.yaml"))
+    assert reports[0] == dict(expected, source="policy.yaml")